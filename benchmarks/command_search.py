@@ -0,0 +1,109 @@
+"""
+Saved-command search at scale.
+
+Builds a library of COMMANDS varied commands (a fifth of them tagged) and
+times the command panel's model, as the GUI drives it:
+
+  index    building the search index, and warming every per-character
+           array (done in idle slices after loading)
+  first    set_filter() until the first matches are shown (target: under
+           TARGET_MS)
+  all      until every match is in, scanning in the model's time slices
+  edit     keeping the index in step with one added, updated and deleted
+           command
+
+Runs with QT_QPA_PLATFORM=offscreen unless a platform is already set.
+
+Usage: python benchmarks/command_search.py [commands]
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+COMMANDS = 100_000
+TARGET_MS = 5
+EDITS = 200
+QUERIES = [("rst pwr", None), ("a", None), ("flash9999", None), ("temp 123", None),
+           ("xyzq", None), ("", "rf"), ("led", "boot")]
+WORDS = ("get set read write reset status temp volt current gpio uart spi i2c adc dac pwm "
+         "flash erase boot mode power sleep wake led fan motor").split()
+TAGS = ["power", "rf", "debug", "boot"]
+
+
+def make_commands(count):
+    rng = random.Random(1)
+    commands = []
+    for i in range(count):
+        words = rng.sample(WORDS, 3)
+        cmd = {"name": f"{' '.join(words).title()} {i}",
+               "command": f"AT+{words[0].upper()}={i % 997},{rng.randint(0, 255):02X}",
+               "is_hex": False}
+        if i % 5 == 0:
+            cmd["tags"] = rng.sample(TAGS, 2)
+        commands.append(cmd)
+    return commands
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COMMANDS
+    home = tempfile.mkdtemp(prefix="sparkserial-bench-")
+    os.environ["HOME"] = home
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from sparkserial.core.command_manager import CommandManager
+    from sparkserial.gui.command_model import CommandListModel
+
+    app = QApplication(sys.argv)
+    try:
+        manager = CommandManager()
+        manager.replace_commands(make_commands(count))
+
+        start = time.perf_counter()
+        model = CommandListModel(manager)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        while model.search_index.warm_up():
+            pass
+        warm = time.perf_counter() - start
+
+        print(f"{count:,} commands")
+        print(f"  build index               {build * 1000:8.1f} ms")
+        print(f"  warm character arrays     {warm * 1000:8.1f} ms  (in idle slices)")
+        print(f"  {'query':<20} {'tag':<6} {'matches':>8} {'first ms':>9} {'all ms':>8}")
+        for query, tag in QUERIES:
+            model.set_filter()
+            start = time.perf_counter()
+            model.set_filter(query, tag)
+            first = time.perf_counter() - start
+            while model.searching:
+                app.processEvents()
+            finished = time.perf_counter() - start
+            print(f"  {query!r:<20} {tag or '-':<6} {model.rowCount():>8} {first * 1000:9.2f} "
+                  f"{finished * 1000:8.1f}  {'ok' if first * 1000 <= TARGET_MS else 'OVER'}")
+
+        index = model.search_index
+        commands = manager.get_commands()
+        costs = {"add": [], "update": [], "delete": []}
+        for i in range(EDITS):
+            start = time.perf_counter()
+            index.insert(len(index), commands[i])
+            costs["add"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            index.update(i, commands[i])
+            costs["update"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            index.remove(len(index) - 1)
+            costs["delete"].append(time.perf_counter() - start)
+        for op, samples in costs.items():
+            print(f"  index {op:<7} per edit    {statistics.mean(samples) * 1000:8.3f} ms")
+        manager.close()
+    finally:
+        shutil.rmtree(home)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Command library persistence at scale.
+
+Builds a library of COMMANDS commands in a scratch home directory and
+times, for the journaled CommandManager and for the previous behaviour of
+rewriting the whole JSON file (indent=4) on every edit:
+
+  load     CommandManager() on a compacted library, on a legacy indented
+           JSON file (which includes migrating it), and with EDITS edits
+           left in the journal as after a crash
+  edit     mean wall time of add/update/delete/bulk replace, each fsynced
+  compact  one full snapshot rewrite (runs every max(1000, n/2) edits)
+
+Usage: python benchmarks/command_store.py [commands] [edits]
+"""
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+COMMANDS = 100_000
+EDITS = 1000
+
+
+def make_commands(count):
+    return [{"name": f"Command {i}", "command": f"AT+REG={i:06d},{i % 251:02X}", "is_hex": False}
+            for i in range(count)]
+
+
+def legacy_save_commands(path, commands):
+    """What every edit used to cost: rewriting the whole file, indented."""
+    with open(path, 'w') as f:
+        json.dump(commands, f, indent=4)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COMMANDS
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else EDITS
+    home = tempfile.mkdtemp(prefix="sparkserial-bench-")
+    os.environ["HOME"] = home
+    from sparkserial.core.command_manager import CommandManager
+
+    data_dir = os.path.join(home, ".sparkserial")
+    os.makedirs(data_dir)
+    path = os.path.join(data_dir, "saved_commands.json")
+    commands = make_commands(count)
+    try:
+        legacy_save, _ = timed(legacy_save_commands, path, commands)
+        legacy_size = os.path.getsize(path)
+        migrate, manager = timed(CommandManager)
+        manager.close()
+        load, manager = timed(CommandManager)
+        assert len(manager.commands) == count
+
+        costs = {"add": [], "update": [], "delete": [], "replace": []}
+        for i in range(edits):
+            costs["add"].append(timed(manager.add_command, f"New {i}", f"AT+NEW={i}")[0])
+            costs["update"].append(timed(manager.update_command, i, f"Edited {i}", f"AT+EDIT={i}")[0])
+            costs["delete"].append(timed(manager.delete_command, count - i)[0])
+        for i in range(min(edits, 50)):
+            costs["replace"].append(timed(manager.bulk_replace, f"AT+REG={i:06d}", f"AT+SET={i:06d}")[0])
+        expected = list(manager.commands)
+        manager._close_journal()  # Leave the journal as a crash would
+        replay, manager = timed(CommandManager)
+        assert manager.commands == expected
+        compact, _ = timed(manager.save_commands)
+        manager.close()
+
+        print(f"{count:,} commands, snapshot {os.path.getsize(path) / 1e6:.1f} MB "
+              f"(legacy indented file {legacy_size / 1e6:.1f} MB)")
+        print(f"  load compacted            {load * 1000:8.1f} ms")
+        print(f"  load legacy + migrate     {migrate * 1000:8.1f} ms")
+        print(f"  load + replay journal     {replay * 1000:8.1f} ms  ({edits * 3 + len(costs['replace'])} records)")
+        for op, samples in costs.items():
+            print(f"  {op:<7} per edit          {statistics.mean(samples) * 1000:8.3f} ms  "
+                  f"(max {max(samples) * 1000:.1f} ms)")
+        print(f"  compact                   {compact * 1000:8.1f} ms")
+        print(f"  legacy save per edit      {legacy_save * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(home)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Hex formatting throughput over a 1 MB buffer.
+
+Compares the per-byte f-string join the terminal used to do with the
+helpers in sparkserial.core.hexfmt.
+
+Usage: python benchmarks/hex_format.py [size_bytes]
+"""
+import os
+import sys
+import timeit
+
+from sparkserial.core.hexfmt import to_hex, hex_rows, hexdump
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024 * 1024
+    data = os.urandom(size)
+    cases = [
+        ("f-string join (legacy)", lambda: " ".join([f"{b:02X}" for b in data]) + " "),
+        ("to_hex", lambda: to_hex(data)),
+        ("hex_rows", lambda: hex_rows(data, 5)),
+        ("hexdump", lambda: hexdump(data)),
+    ]
+    print(f"{size / 1024 / 1024:.1f} MB buffer")
+    for label, func in cases:
+        runs = 5
+        elapsed = timeit.timeit(func, number=runs) / runs
+        print(f"{label:24s} {elapsed * 1e3:8.2f} ms  {size / elapsed / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Aggregate RX throughput and CPU cost with many ports open at once.
+
+Opens PORTS pty pairs, connects a SerialManager to every slave end and has
+a child process write into the master ends, so the writer's CPU time is not
+counted. A drain thread empties the RX buffers every 25 ms like the GUI
+tick does. Two loads are run for both the thread-per-port backend and the
+shared selector reactor:
+
+  paced  every port receives 115200 baud worth of data (11.5 kB/s) in small
+         bursts; the figure of interest is CPU per second of wall time
+  flood  the writer pushes as fast as the ptys accept; the figure of
+         interest is aggregate MB/s
+
+Usage: python benchmarks/multi_port.py [ports] [seconds]   (Linux only)
+"""
+import os
+import pty
+import resource
+import sys
+import threading
+import time
+
+from sparkserial.core.serial_manager import SerialManager
+
+PACED_RATE = 11520  # Bytes/s per port, i.e. 115200 baud 8N1
+PACED_BURST = 64
+FLOOD_CHUNK = 4096
+
+
+def writer(masters, paced, seconds, start_fd):
+    """Child process: waits for the go byte, then writes into every master."""
+    os.read(start_fd, 1)
+    for fd in masters:
+        os.set_blocking(fd, False)
+    chunk = b"0123456789abcdef" * ((PACED_BURST if paced else FLOOD_CHUNK) // 16)
+    interval = PACED_BURST / PACED_RATE
+    deadline = time.monotonic() + seconds
+    next_tick = time.monotonic()
+    while time.monotonic() < deadline:
+        for fd in masters:
+            try:
+                os.write(fd, chunk)
+            except BlockingIOError:
+                pass  # The reader is behind on this port; move on
+        if paced:
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    os._exit(0)
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure(backend, ports, paced, seconds):
+    pairs = [pty.openpty() for _ in range(ports)]
+    start_read, start_write = os.pipe()
+    child = os.fork()
+    if child == 0:
+        writer([master for master, _slave in pairs], paced, seconds, start_read)
+
+    manager = SerialManager(backend)
+    workers = [manager.connect({'port': os.ttyname(slave), 'baudrate': 921600, 'bytesize': 8,
+                                'parity': 'N', 'stopbits': 1, 'flowcontrol': "None"})
+               for _master, slave in pairs]
+    while not all(worker.running for worker in workers):
+        time.sleep(0.01)
+
+    received = 0
+    draining = True
+
+    def drain():
+        nonlocal received
+        while draining:
+            for worker in workers:
+                received += len(worker.rx_buffer.read())
+            time.sleep(0.025)
+
+    drain_thread = threading.Thread(target=drain)
+    drain_thread.start()
+    threads = len(os.listdir("/proc/self/task"))
+
+    cpu_start = cpu_seconds()
+    wall_start = time.monotonic()
+    os.write(start_write, b"x")
+    os.waitpid(child, 0)
+    elapsed = time.monotonic() - wall_start
+    cpu = cpu_seconds() - cpu_start
+
+    draining = False
+    drain_thread.join()
+    manager.close()
+    for master, slave in pairs:
+        os.close(master)
+        os.close(slave)
+    os.close(start_read)
+    os.close(start_write)
+    return received / elapsed, cpu / elapsed, threads
+
+
+def main():
+    ports = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    print(f"{ports} ports, {seconds:.0f} s per run")
+    for load, paced in (("paced", True), ("flood", False)):
+        for backend in ("threads", "reactor"):
+            rate, cpu, threads = measure(backend, ports, paced, seconds)
+            print(f"{load:5s} {backend:8s} {rate / 1e6:8.2f} MB/s  "
+                  f"CPU={cpu * 100:6.1f} % of a core  threads={threads}")
+
+
+if __name__ == "__main__":
+    main()
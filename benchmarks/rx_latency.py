@@ -0,0 +1,87 @@
+"""
+Byte-to-buffer latency of the SerialWorker RX loop.
+
+Opens a pty pair, points a SerialWorker at the slave end and writes single
+bytes into the master end at irregular intervals. The time between the
+write and the byte becoming visible in the worker's RX buffer is reported
+as p50/p99 for both the legacy polling loop (in_waiting + sleep(0.01)) and
+the current blocking read loop.
+
+Usage: python benchmarks/rx_latency.py [samples]   (POSIX only)
+"""
+import os
+import pty
+import random
+import sys
+import threading
+import time
+
+from sparkserial.core.serial_manager import SerialWorker
+
+
+class LegacyPollingWorker(SerialWorker):
+    """The RX loop as it was before the blocking read."""
+
+    def run(self):
+        try:
+            self.serial_port = self._open_port()
+            self.running = True
+            while self.running:
+                if self.serial_port.in_waiting > 0:
+                    data = self.serial_port.read(self.serial_port.in_waiting)
+                    if data:
+                        self.rx_buffer.write(data)
+                time.sleep(0.01)
+        finally:
+            if self.serial_port and self.serial_port.is_open:
+                self.serial_port.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(worker_cls, samples):
+    master, slave = pty.openpty()
+    worker = worker_cls(os.ttyname(slave), 921600, 8, 'N', 1, "None")
+    latencies = []
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    while not worker.running:
+        time.sleep(0.01)
+
+    for _ in range(samples):
+        # Random gaps so writes do not phase-lock with a polling interval
+        time.sleep(random.uniform(0.001, 0.02))
+        sent_at = time.perf_counter()
+        os.write(master, b"x")
+        # Spin like a consumer with an infinitely fast tick would, yielding
+        # the GIL so the worker thread is not starved
+        while not len(worker.rx_buffer) and time.perf_counter() - sent_at < 1.0:
+            time.sleep(0)
+        latencies.append(time.perf_counter() - sent_at)
+        worker.rx_buffer.read()
+
+    cpu_start = time.process_time()
+    time.sleep(1.0)
+    idle_cpu = time.process_time() - cpu_start
+
+    worker.stop()
+    thread.join()
+    os.close(master)
+    os.close(slave)
+    return latencies, idle_cpu
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for label, cls in (("polling (legacy)", LegacyPollingWorker), ("blocking read", SerialWorker)):
+        latencies, idle_cpu = measure(cls, samples)
+        print(f"{label:18s} p50={percentile(latencies, 50) * 1e3:7.3f} ms  "
+              f"p99={percentile(latencies, 99) * 1e3:7.3f} ms  "
+              f"idle CPU={idle_cpu * 1e3:6.1f} ms/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Resident memory of the terminal over a simulated long-running stream.
+
+Pushes a time-compressed 24-hour stream (one 48-byte line every 100 ms by
+default) through the default (virtualized) terminal of an offscreen
+MainWindow with the default scrollback cap and prints RSS once per
+simulated hour. With a cap, RSS should level off after the first hours;
+with "Unlimited (in memory)" it grows linearly.
+
+Usage: python benchmarks/scrollback_rss.py [hours] [lines_per_second] [scrollback_label]   (Linux)
+"""
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Keep the benchmark away from the user's saved commands
+os.environ["HOME"] = tempfile.mkdtemp()
+
+from PyQt6.QtWidgets import QApplication
+
+from sparkserial.gui.main_window import MainWindow
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def main():
+    hours = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    lines_per_second = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    if len(sys.argv) > 3:
+        window.scrollback_combo.setCurrentText(sys.argv[3])
+    window.timestamp_check.setChecked(True)
+
+    # Deliver the stream in 25 ms batches, as the RX drain tick would
+    lines_per_batch = max(1, lines_per_second // 40)
+    batches_per_hour = 3600 * lines_per_second // lines_per_batch
+    print(f"scrollback: {window.scrollback_combo.currentText()}")
+    print(f"{'hour':>5s} {'lines':>10s} {'RSS MB':>8s}")
+    line_no = 0
+    for hour in range(1, hours + 1):
+        for _ in range(batches_per_hour):
+            chunk = b"".join(b"t=%010d adc=0x0FA3 temp=23.5C\n" % (line_no + i) for i in range(lines_per_batch))
+            line_no += lines_per_batch
+            window.handle_data(chunk)
+        app.processEvents()
+        print(f"{hour:5d} {line_no:10d} {rss_mb():8.1f}")
+
+
+if __name__ == "__main__":
+    main()
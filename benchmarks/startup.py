@@ -0,0 +1,103 @@
+"""
+Cold-launch time, from starting the interpreter to the main window's first
+paint, and the time the headless CLI takes to answer.
+
+Each figure is the median of RUNS fresh processes. The child reports the
+CLOCK_MONOTONIC time of the first Paint event on the main window, which is
+comparable with the parent's clock on Linux and macOS. The slowest imports
+on the GUI path are then listed from `python -X importtime` so regressions
+can be traced to a module.
+
+Runs with QT_QPA_PLATFORM=offscreen unless a platform is already set.
+Target: first paint within TARGET_MS.
+
+Usage: python benchmarks/startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 10
+TARGET_MS = 250
+SLOWEST = 12
+
+FIRST_PAINT = """
+import sys, time
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication
+from sparkserial.gui.main_window import MainWindow
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            print(time.monotonic(), flush=True)
+            app.quit()
+        return False
+
+app = QApplication(sys.argv)
+window = MainWindow()
+probe = FirstPaint()
+window.installEventFilter(probe)
+window.show()
+app.exec()
+"""
+
+
+def environment():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    return env
+
+
+def first_paint_ms(env):
+    start = time.monotonic()
+    out = subprocess.run([sys.executable, "-c", FIRST_PAINT], env=env, capture_output=True,
+                         text=True, check=True).stdout
+    return (float(out.split()[-1]) - start) * 1000
+
+
+def wall_ms(env, args):
+    start = time.monotonic()
+    subprocess.run([sys.executable, *args], env=env, capture_output=True, check=True)
+    return (time.monotonic() - start) * 1000
+
+
+def slowest_imports(env, module):
+    """[(self_us, cumulative_us, name)] for module's imports, slowest first by self time."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=env,
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS
+    env = environment()
+    first_paint_ms(env)  # Warm the OS file cache; "cold" means a new process, not a cold disk
+
+    bare = statistics.median(wall_ms(env, ["-c", "pass"]) for _ in range(runs))
+    paint = statistics.median(first_paint_ms(env) for _ in range(runs))
+    ports = statistics.median(wall_ms(env, ["-m", "sparkserial.main", "ports"]) for _ in range(runs))
+
+    print(f"{runs} runs each, platform {env['QT_QPA_PLATFORM']}, median")
+    print(f"  bare interpreter          {bare:7.1f} ms")
+    print(f"  GUI launch to first paint {paint:7.1f} ms  (target {TARGET_MS} ms: "
+          f"{'ok' if paint <= TARGET_MS else 'OVER'})")
+    print(f"  sparkserial ports         {ports:7.1f} ms")
+
+    print("\nSlowest imports for the GUI (self / cumulative ms):")
+    for self_us, cumulative_us, name in slowest_imports(env, "sparkserial.gui.main_window")[:SLOWEST]:
+        print(f"  {self_us / 1000:7.1f} {cumulative_us / 1000:7.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
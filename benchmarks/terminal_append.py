@@ -0,0 +1,49 @@
+"""
+Per-chunk cost of MainWindow.handle_data as the terminal grows.
+
+Feeds timestamped 64-line chunks into an offscreen MainWindow and prints the
+average handle_data time at each checkpoint. The per-chunk cost should stay
+flat as the terminal grows; a cost that scales with the line count means
+something is re-reading the whole document.
+
+Usage: python benchmarks/terminal_append.py [total_lines]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Keep the benchmark away from the user's saved commands
+os.environ["HOME"] = tempfile.mkdtemp()
+
+from PyQt6.QtWidgets import QApplication
+
+from sparkserial.gui.main_window import MainWindow
+
+LINES_PER_CHUNK = 64
+
+
+def main():
+    total_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.timestamp_check.setChecked(True)
+    chunk = b"".join(b"sensor=%06d value=0x1F3A status=OK\n" % i for i in range(LINES_PER_CHUNK))
+
+    checkpoints = 10
+    chunks_per_checkpoint = max(1, total_lines // LINES_PER_CHUNK // checkpoints)
+    print(f"{'lines':>12s} {'us/chunk':>10s}")
+    lines = 0
+    for _ in range(checkpoints):
+        start = time.perf_counter()
+        for _ in range(chunks_per_checkpoint):
+            window.handle_data(chunk)
+        elapsed = time.perf_counter() - start
+        lines += chunks_per_checkpoint * LINES_PER_CHUNK
+        app.processEvents()
+        print(f"{lines:12d} {elapsed / chunks_per_checkpoint * 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
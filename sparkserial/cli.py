@@ -0,0 +1,265 @@
+"""
+Headless command line: capture and scripted sequences without Qt.
+
+    sparkserial ports [-v]
+    sparkserial capture PORT [-b BAUD] [-o FILE.sscap] [-d SECONDS] [--reconnect] [--hex | --quiet]
+    sparkserial run-sequence PORT SEQUENCE.json [-b BAUD] [--eol CR+LF] [--json]
+
+Only the Qt-free core is imported, so these start in a fraction of the
+time the GUI takes and run on machines without a display. main.py imports
+this module on every launch to check for a command, so argparse and the
+core are only imported once a command actually runs.
+"""
+import signal
+import sys
+import threading
+import time
+
+COMMANDS = ["ports", "capture", "run-sequence"]
+
+LINE_ENDINGS = {"None": b'', "CR": b'\r', "LF": b'\n', "CR+LF": b'\r\n'}
+
+# How often capture copies received data to stdout
+DRAIN_INTERVAL = 0.05
+
+
+def is_cli(argv):
+    """True when argv (without the program name) asks for a headless command."""
+    return bool(argv) and argv[0] in COMMANDS
+
+
+def _add_port_arguments(parser):
+    parser.add_argument("port", help="Serial port, e.g. /dev/ttyUSB0 or COM3")
+    parser.add_argument("-b", "--baudrate", type=int, default=115200)
+    parser.add_argument("--bytesize", type=int, choices=[5, 6, 7, 8], default=8)
+    parser.add_argument("--parity", choices=["N", "E", "O", "M", "S"], default="N")
+    parser.add_argument("--stopbits", type=float, choices=[1, 1.5, 2], default=1)
+    parser.add_argument("--flow", choices=["None", "RTS/CTS", "XON/XOFF"], default="None")
+
+
+def _settings(args):
+    return {
+        'port': args.port,
+        'baudrate': args.baudrate,
+        'bytesize': args.bytesize,
+        'parity': args.parity,
+        'stopbits': int(args.stopbits) if args.stopbits != 1.5 else 1.5,
+        'flowcontrol': args.flow,
+    }
+
+
+def _open(manager, args, setup=None, reconnect=False):
+    """
+    Connects and waits until the port is open. Returns the worker, or None
+    after printing the error.
+    """
+    opened = threading.Event()
+    errors = []
+
+    def wire(worker):
+        worker.error_occurred.connect(errors.append)
+        worker.connection_status.connect(lambda connected: opened.set())
+        if setup:
+            setup(worker)
+
+    worker = manager.connect(_settings(args), setup=wire, reconnect=reconnect)
+    opened.wait()
+    if not worker.running:
+        print(f"Error: {errors[0] if errors else 'could not open ' + args.port}", file=sys.stderr)
+        return None
+    return worker
+
+
+def cmd_ports(args):
+    from sparkserial.core.port_monitor import scan_ports
+
+    for port in scan_ports():
+        if args.verbose:
+            print(f"{port['device']}\t{port['description']}\t{port['hwid']}")
+        else:
+            print(port['device'])
+    return 0
+
+
+def cmd_capture(args):
+    """Prints received data (raw, or as hex rows) and optionally records a .sscap capture."""
+    from sparkserial.core.capture_file import CaptureWriter, EVENT
+    from sparkserial.core.hexfmt import hex_rows
+    from sparkserial.core.port_monitor import PortMonitor
+    from sparkserial.core.serial_manager import SerialManager
+
+    monitor = None
+    if args.reconnect:
+        # Lets the adapter be found again by serial number or VID:PID
+        monitor = PortMonitor()
+        monitor.start()
+        monitor.ready.wait(5)
+    manager = SerialManager(port_monitor=monitor)
+    writer = CaptureWriter(args.output) if args.output else None
+    closed = threading.Event()
+    errors = []
+    workers = []  # The latest is the one open now
+    reconnect_times = []
+
+    def setup(worker):
+        # Runs on the reconnect thread for reopened connections
+        if writer:
+            worker.set_tap("capture", writer.tap(0, args.port))
+        worker.error_occurred.connect(errors.append)
+        worker.connection_status.connect(
+            lambda connected: connected or manager.is_reconnecting(args.port) or closed.set())
+
+    def mark_gap(note):
+        print(f"-- {note}", file=sys.stderr, flush=True)
+        if writer:
+            writer.record(time.monotonic_ns(), EVENT, 0, note.encode('utf-8'))
+
+    def reconnecting(name, attempt):
+        if attempt == 0:
+            mark_gap(f"Connection lost ({errors[-1] if errors else 'closed'}); reconnecting")
+
+    def reconnected(name, worker, gap_seconds):
+        workers.append(worker)
+        errors.clear()  # Recovered from
+        reconnect_times.append(gap_seconds)
+        mark_gap(f"Reconnected{' as ' + worker.port_name if worker.port_name != name else ''} after {gap_seconds:.2f} s")
+
+    manager.reconnecting.connect(reconnecting)
+    manager.reconnected.connect(reconnected)
+
+    worker = _open(manager, args, setup, args.reconnect)
+    workers.append(worker)
+    if not worker:
+        if writer:
+            writer.close()
+        if monitor:
+            monitor.stop()
+        return 1
+
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    deadline = time.monotonic() + args.duration if args.duration else None
+    out = sys.stdout.buffer
+    offset = 0
+    try:
+        while not stop.is_set():
+            data = worker.rx_buffer.read()
+            if data and not args.quiet:
+                if args.hex:
+                    out.write(hex_rows(data, offset).encode('ascii'))
+                else:
+                    out.write(data)
+                out.flush()
+            offset += len(data)
+            if closed.is_set():
+                # Keep whatever arrived before the port went away
+                if not len(worker.rx_buffer):
+                    break
+                continue
+            if deadline and time.monotonic() >= deadline:
+                break
+            stop.wait(DRAIN_INTERVAL)
+    finally:
+        manager.close()
+        if writer:
+            writer.close()
+        if monitor:
+            monitor.stop()
+
+    if args.hex and offset % 16 and not args.quiet:
+        out.write(b"\n")
+    worker = workers[-1]
+    dropped = worker.rx_buffer.overflow_bytes + (writer.dropped_bytes if writer else 0)
+    summary = f"{worker.rx_bytes} bytes received" + (f", {dropped} dropped" if dropped else "")
+    if reconnect_times:
+        summary += f", {len(reconnect_times)} reconnects (longest {max(reconnect_times):.2f} s)"
+    print(summary, file=sys.stderr)
+    if errors:
+        print(f"Error: {errors[-1]}", file=sys.stderr)
+    return 1 if errors or dropped else 0
+
+
+def cmd_run_sequence(args):
+    """Runs a saved sequence, prints a line (or JSON object) per step and exits 1 if any failed."""
+    import json
+    from sparkserial.core.sequence import SequenceRunner, load_sequence
+    from sparkserial.core.serial_manager import SerialManager
+
+    try:
+        steps = load_sequence(args.sequence)
+    except (OSError, ValueError) as e:
+        print(f"Error: failed to load sequence: {e}", file=sys.stderr)
+        return 2
+
+    manager = SerialManager()
+    worker = _open(manager, args)
+    if not worker:
+        return 1
+    try:
+        runner = SequenceRunner(worker, steps, LINE_ENDINGS[args.eol])
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        manager.close()
+        return 2
+
+    def report(result):
+        if args.json:
+            print(json.dumps(dict(result, response=result['response'].decode('utf-8', 'replace'))), flush=True)
+            return
+        latency = f"{result['latency_ms']:.3f} ms" if result['latency_ms'] is not None else ""
+        status = "PASS" if result['passed'] else f"FAIL {result['error']}"
+        print(f"{result['step'] + 1:>4}.{result['iteration'] + 1:<5} {result['name'] or '-':<24} {status:<14} {latency}",
+              flush=True)
+
+    runner.step_finished.connect(report)
+    signal.signal(signal.SIGINT, lambda signum, frame: runner.stop())
+    runner.start()
+    while runner.running:
+        time.sleep(0.05)
+    manager.close()
+
+    results = runner.results
+    passed = sum(1 for result in results if result['passed'])
+    latencies = sorted(result['latency_ms'] for result in results if result['latency_ms'] is not None)
+    summary = f"{passed} of {len(results)} steps passed"
+    if latencies:
+        summary += f", round trip p50 {latencies[len(latencies) // 2]:.3f} ms, max {latencies[-1]:.3f} ms"
+    print(summary, file=sys.stderr)
+    return 0 if results and passed == len(results) else 1
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="sparkserial", description="SparkSerial headless mode.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ports = commands.add_parser("ports", help="List available serial ports")
+    ports.add_argument("-v", "--verbose", action="store_true", help="Also print description and hardware ID")
+
+    capture = commands.add_parser("capture", help="Print received data and optionally record it")
+    _add_port_arguments(capture)
+    capture.add_argument("-o", "--output", help="Record every byte to this .sscap capture")
+    capture.add_argument("-d", "--duration", type=float, help="Stop after this many seconds")
+    capture.add_argument("--reconnect", action="store_true",
+                         help="Reopen the same adapter after it drops, with a gap marker in the capture")
+    view = capture.add_mutually_exclusive_group()
+    view.add_argument("--hex", action="store_true", help="Print hex rows instead of raw bytes")
+    view.add_argument("-q", "--quiet", action="store_true", help="Print nothing but the summary")
+
+    run = commands.add_parser("run-sequence", help="Run a saved sequence and report each step")
+    _add_port_arguments(run)
+    run.add_argument("sequence", help="Sequence JSON file saved from the Sequence Runner")
+    run.add_argument("--eol", choices=list(LINE_ENDINGS), default="CR+LF", help="Line ending added to each command")
+    run.add_argument("--json", action="store_true", help="Print one JSON object per step")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    handler = {"ports": cmd_ports, "capture": cmd_capture, "run-sequence": cmd_run_sequence}[args.command]
+    return handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
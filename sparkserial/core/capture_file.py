@@ -0,0 +1,354 @@
+"""
+Lossless binary session capture (.sscap).
+
+Layout (all integers little-endian):
+
+    header   magic "SSCAP\\r\\n\\x1a", version u16, flags u16,
+             wall-clock ns at start i64, monotonic ns at start i64
+    records  timestamp (monotonic ns) i64, direction u8, port id u8,
+             payload length u32, payload
+    index    one (timestamp i64, file offset u64, record number u64) entry
+             roughly every INDEX_INTERVAL_BYTES of records
+    metadata JSON: {"ports": {"<port id>": "<port name>"}}
+    footer   magic "SSCAPEND", index offset u64, index entries u64,
+             record count u64, metadata offset u64, metadata length u64
+
+The index and footer are written on close. A file without them (e.g.
+after a crash) is still readable: CaptureReader rebuilds the index with
+one scan over the record headers.
+"""
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+MAGIC = b"SSCAP\r\n\x1a"
+FOOTER_MAGIC = b"SSCAPEND"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHHqq")
+RECORD = struct.Struct("<qBBI")
+INDEX_ENTRY = struct.Struct("<qQQ")
+FOOTER = struct.Struct("<8sQQQQQ")
+
+# Record directions
+RX = 0
+TX = 1
+EVENT = 2  # Payload is a UTF-8 note, e.g. a reconnect marker
+
+_STOP = object()
+
+
+class CaptureWriter:
+    """
+    Appends records to a .sscap file from a background thread.
+
+    record() is safe to call from any thread (the serial thread for RX,
+    the GUI thread for TX) and only enqueues. The writer thread packs
+    records into large batched writes and flushes at least every
+    FLUSH_INTERVAL seconds. Anything beyond MAX_BACKLOG_BYTES is counted in
+    dropped_bytes instead of being queued.
+    """
+
+    FLUSH_INTERVAL = 0.25
+    INDEX_INTERVAL_BYTES = 256 * 1024
+    MAX_BACKLOG_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        # Open here so a bad path fails in the caller, not on the thread
+        self._file = open(path, 'wb', buffering=1024 * 1024)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, time.time_ns(), time.monotonic_ns()))
+        self._offset = HEADER.size
+        self._ports = {}
+
+        self._index = bytearray()
+        self._index_count = 0
+        self._last_indexed = -self.INDEX_INTERVAL_BYTES
+        self.record_count = 0
+        self.written_bytes = 0
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._queued_bytes = 0
+        self._dequeued_bytes = 0
+        self.dropped_bytes = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="CaptureWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def backlog_bytes(self):
+        return self._queued_bytes - self._dequeued_bytes
+
+    def record(self, timestamp_ns, direction, port_id, data):
+        size = len(data)
+        with self._lock:
+            if self.error or self.backlog_bytes + size > self.MAX_BACKLOG_BYTES:
+                self.dropped_bytes += size
+                return
+            self._queued_bytes += size
+        self._queue.put((timestamp_ns, direction, port_id, bytes(data)))
+
+    def set_port_name(self, port_id, name):
+        """Names port_id in the capture's metadata."""
+        self._ports[str(port_id)] = name
+
+    def tap(self, port_id, name):
+        """Returns a SerialWorker tap that records into this capture as port_id."""
+        self.set_port_name(port_id, name)
+        record = self.record
+        return lambda timestamp_ns, direction, data: record(timestamp_ns, direction, port_id, data)
+
+    def close(self):
+        """Writes out everything queued plus the index and footer, then fsyncs."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        stopping = False
+        while not stopping:
+            timeout = max(0.0, last_flush + self.FLUSH_INTERVAL - time.monotonic())
+            try:
+                items = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = bytearray()
+            batch_payload = 0
+            for item in items:
+                if item is _STOP:
+                    stopping = True
+                    continue
+                timestamp_ns, direction, port_id, data = item
+                offset = self._offset + len(batch)
+                if offset - self._last_indexed >= self.INDEX_INTERVAL_BYTES:
+                    self._index += INDEX_ENTRY.pack(timestamp_ns, offset, self.record_count)
+                    self._index_count += 1
+                    self._last_indexed = offset
+                batch += RECORD.pack(timestamp_ns, direction, port_id, len(data))
+                batch += data
+                batch_payload += len(data)
+                self.record_count += 1
+
+            try:
+                if batch:
+                    self._file.write(batch)
+                    self._offset += len(batch)
+                    self.written_bytes += batch_payload
+                if stopping or time.monotonic() - last_flush >= self.FLUSH_INTERVAL:
+                    self._file.flush()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                self.error = str(e)
+            self._dequeued_bytes += batch_payload
+
+        self._finish()
+
+    def _finish(self):
+        try:
+            index_offset = self._offset
+            self._file.write(self._index)
+            metadata = json.dumps({"ports": self._ports}).encode('utf-8')
+            metadata_offset = index_offset + len(self._index)
+            self._file.write(metadata)
+            self._file.write(FOOTER.pack(FOOTER_MAGIC, index_offset, self._index_count,
+                                         self.record_count, metadata_offset, len(metadata)))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+        except Exception as e:
+            self.error = str(e)
+
+
+class CaptureReader:
+    """
+    Memory-mapped reader for .sscap files.
+
+    Opening only parses the header and footer; records are read straight
+    from the mapping when asked for, so multi-GB captures open instantly.
+    seek_time() and record_offset() bisect the seek index and then walk at
+    most one index interval of records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("Capture file is empty")
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError("Not a SparkSerial capture file")
+        magic, self.version, _flags, self.start_wall_ns, self.start_monotonic_ns = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Not a SparkSerial capture file")
+
+        self.ports = {}
+        if not self._load_footer():
+            self._rebuild_index()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.record_count
+
+    @property
+    def data_start(self):
+        return HEADER.size
+
+    def wall_ns(self, timestamp_ns):
+        """Converts a record timestamp to wall-clock ns."""
+        return timestamp_ns - self.start_monotonic_ns + self.start_wall_ns
+
+    def _load_footer(self):
+        if len(self._map) < HEADER.size + FOOTER.size:
+            return False
+        magic, index_offset, index_count, record_count, metadata_offset, metadata_length = \
+            FOOTER.unpack_from(self._map, len(self._map) - FOOTER.size)
+        if magic != FOOTER_MAGIC:
+            return False
+
+        self._index_times = array('q')
+        self._index_offsets = array('Q')
+        self._index_records = array('Q')
+        for timestamp_ns, offset, record_number in INDEX_ENTRY.iter_unpack(
+                self._map[index_offset:index_offset + index_count * INDEX_ENTRY.size]):
+            self._index_times.append(timestamp_ns)
+            self._index_offsets.append(offset)
+            self._index_records.append(record_number)
+        self.record_count = record_count
+        self.data_end = index_offset
+        try:
+            metadata = json.loads(self._map[metadata_offset:metadata_offset + metadata_length])
+            self.ports = {int(k): v for k, v in metadata.get("ports", {}).items()}
+        except ValueError:
+            pass
+        return True
+
+    def _rebuild_index(self):
+        """Scans record headers of an unterminated capture, keeping whole records only."""
+        self._index_times = array('q')
+        self._index_offsets = array('Q')
+        self._index_records = array('Q')
+        offset = HEADER.size
+        end = len(self._map)
+        count = 0
+        last_indexed = -CaptureWriter.INDEX_INTERVAL_BYTES
+        while offset + RECORD.size <= end:
+            timestamp_ns, direction, _port_id, length = RECORD.unpack_from(self._map, offset)
+            if direction > EVENT or offset + RECORD.size + length > end:
+                break
+            if offset - last_indexed >= CaptureWriter.INDEX_INTERVAL_BYTES:
+                self._index_times.append(timestamp_ns)
+                self._index_offsets.append(offset)
+                self._index_records.append(count)
+                last_indexed = offset
+            offset += RECORD.size + length
+            count += 1
+        self.record_count = count
+        self.data_end = offset
+
+    def read(self, offset):
+        """
+        Returns (timestamp_ns, direction, port_id, payload, next_offset) for
+        the record at offset. payload is a zero-copy memoryview.
+        """
+        timestamp_ns, direction, port_id, length = RECORD.unpack_from(self._map, offset)
+        start = offset + RECORD.size
+        return timestamp_ns, direction, port_id, memoryview(self._map)[start:start + length], start + length
+
+    def records(self, offset=None):
+        """Iterates records from offset (default: the first one)."""
+        offset = self.data_start if offset is None else offset
+        while offset < self.data_end:
+            record = self.read(offset)
+            yield record
+            offset = record[4]
+
+    def record_offset(self, number):
+        """File offset of record number (0-based), or data_end past the last record."""
+        if number >= self.record_count:
+            return self.data_end
+        entry = bisect_right(self._index_records, number) - 1
+        offset, current = self.data_start, 0
+        if entry >= 0:
+            offset, current = self._index_offsets[entry], self._index_records[entry]
+        while current < number:
+            _timestamp, _direction, _port_id, length = RECORD.unpack_from(self._map, offset)
+            offset += RECORD.size + length
+            current += 1
+        return offset
+
+    def seek_time(self, timestamp_ns):
+        """
+        Returns (record number, file offset) of the first record at or after
+        timestamp_ns, or (len(self), data_end) if there is none.
+        """
+        entry = max(0, bisect_left(self._index_times, timestamp_ns) - 1)
+        offset, number = self.data_start, 0
+        if self._index_offsets:
+            offset, number = self._index_offsets[entry], self._index_records[entry]
+        while offset < self.data_end:
+            record_time, _direction, _port_id, length = RECORD.unpack_from(self._map, offset)
+            if record_time >= timestamp_ns:
+                break
+            offset += RECORD.size + length
+            number += 1
+        return number, offset
+
+
+class CaptureReplay:
+    """
+    Paces records out of a CaptureReader at speed times their recorded rate.
+
+    Call due() periodically; it returns the records whose turn has come
+    since the last call as (timestamp_ns, direction, port_id, bytes). A
+    speed of 0 replays as fast as the caller drains it.
+    """
+
+    def __init__(self, reader, speed=1.0, start_record=0):
+        self.reader = reader
+        self.speed = speed
+        self.offset = reader.record_offset(start_record)
+        self.position = start_record
+        self._origin = None  # (capture ns, monotonic ns) of the first record
+
+    @property
+    def finished(self):
+        return self.offset >= self.reader.data_end
+
+    def due(self, max_records=10000):
+        records = []
+        now_ns = time.monotonic_ns()
+        while not self.finished and len(records) < max_records:
+            timestamp_ns, direction, port_id, payload, next_offset = self.reader.read(self.offset)
+            if self._origin is None:
+                self._origin = (timestamp_ns, now_ns)
+            elif self.speed:
+                release_ns = self._origin[1] + (timestamp_ns - self._origin[0]) / self.speed
+                if release_ns > now_ns:
+                    break
+            records.append((timestamp_ns, direction, port_id, bytes(payload)))
+            payload.release()
+            self.offset = next_offset
+            self.position += 1
+        return records
@@ -0,0 +1,231 @@
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from itertools import compress
+from sparkserial.core.line_store import LineStore
+from sparkserial.core.hexfmt import to_hex
+
+
+def format_timestamp(wall_ns):
+    """Formats a wall-clock time in ns as the terminal's [HH:MM:SS.ffff] prefix."""
+    return datetime.fromtimestamp(wall_ns / 1e9).strftime("[%H:%M:%S.%f")[:-2] + "] "
+
+
+class CaptureStore(LineStore):
+    """
+    Raw received bytes plus the arrival time of every chunk.
+
+    Nothing is formatted at capture time: chunk start offsets and monotonic
+    ns timestamps are kept in parallel arrays so any view (text, hex,
+    timestamps) can be rendered from the same bytes later.
+    """
+
+    def __init__(self, wrap_bytes=1024):
+        # Converts monotonic ns to wall-clock ns for display
+        self.wall_offset_ns = time.time_ns() - time.monotonic_ns()
+        super().__init__(wrap_bytes)
+
+    def clear(self):
+        super().clear()
+        self._chunk_offsets = array('Q')
+        self._chunk_times = array('q')
+
+    def append(self, data, timestamp_ns=None):
+        if not data:
+            return
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        self._chunk_offsets.append(self.end_offset)
+        self._chunk_times.append(timestamp_ns)
+        super().append(data)
+
+    def time_at(self, offset):
+        """Monotonic ns arrival time of the byte at absolute offset."""
+        if not self._chunk_times:
+            return time.monotonic_ns()
+        index = max(0, bisect_right(self._chunk_offsets, offset) - 1)
+        return self._chunk_times[index]
+
+    def wall_time_at(self, offset):
+        return self.time_at(offset) + self.wall_offset_ns
+
+    def trim(self, max_lines=None, max_bytes=None):
+        dropped = super().trim(max_lines, max_bytes)
+        if dropped:
+            # Keep the chunk that the new first byte belongs to
+            keep = max(0, bisect_right(self._chunk_offsets, self.base_offset) - 1)
+            del self._chunk_offsets[:keep]
+            del self._chunk_times[:keep]
+        return dropped
+
+
+class CaptureView:
+    """
+    Renders a CaptureStore as display rows on demand.
+
+    Only the rows that are asked for get formatted, so switching between
+    text and hex or toggling timestamps costs nothing up front regardless
+    of how much has been captured. Exposes the same row interface as
+    LineStore (len(), text(), max_line_length) for TerminalView.
+    """
+
+    HEX_ROW_BYTES = 16
+
+    def __init__(self, store, hex_view=False, timestamps=False):
+        self.store = store
+        self.hex_view = hex_view
+        self.timestamps = timestamps
+
+    def _first_hex_row(self):
+        return self.store.base_offset // self.HEX_ROW_BYTES
+
+    def __len__(self):
+        if not self.hex_view:
+            return len(self.store)
+        # Rows are aligned to absolute offsets; count the (possibly empty) row being written
+        return self.store.end_offset // self.HEX_ROW_BYTES - self._first_hex_row() + 1
+
+    @property
+    def max_line_length(self):
+        prefix = len(format_timestamp(0)) if self.timestamps else 0
+        if self.hex_view:
+            return prefix + self.HEX_ROW_BYTES * 3
+        return prefix + self.store.max_line_length
+
+    def row_offset(self, index):
+        """Absolute offset of the first byte shown in row index."""
+        if not self.hex_view:
+            return self.store.line_offset(index)
+        return max(self.store.base_offset, (self._first_hex_row() + index) * self.HEX_ROW_BYTES)
+
+    def row_index(self, offset):
+        """Row that shows the byte at absolute offset."""
+        if not self.hex_view:
+            return self.store.line_index(offset)
+        return offset // self.HEX_ROW_BYTES - self._first_hex_row()
+
+    def text(self, index):
+        if self.hex_view:
+            start = self.row_offset(index)
+            end = min(self.store.end_offset, (self._first_hex_row() + index + 1) * self.HEX_ROW_BYTES)
+            row = to_hex(self.store.slice(start, end))
+        else:
+            row = self.store.text(index)
+        if self.timestamps and (row or index + 1 < len(self)):
+            row = format_timestamp(self.store.wall_time_at(self.row_offset(index))) + row
+        return row
+
+    def tail_text(self, max_lines):
+        """Renders the last max_lines rows as one string, as the terminal shows them."""
+        first = max(0, len(self) - max_lines)
+        text = "\n".join(self.text(i) for i in range(first, len(self)))
+        if self.hex_view and not self.at_line_start():
+            # Streamed hex leaves a separator after the last byte of a partial row
+            text += " "
+        return text
+
+    def at_line_start(self):
+        """Whether the next received byte starts a new row."""
+        if self.hex_view:
+            return self.store.end_offset % self.HEX_ROW_BYTES == 0
+        return self.store.end_offset == self.store.line_offset(len(self.store) - 1)
+
+
+class InterleavedView:
+    """
+    Completed lines of several CaptureStores merged into one view in order
+    of arrival, each tagged with its source's name:
+
+        [12:00:01.2345] [/dev/ttyUSB0] OK
+
+    update() merges lines completed since the previous call, so each line
+    is indexed once; rows themselves are rendered from the stores on
+    demand, which keeps Hex View and Timestamps retroactive here too. A
+    line still being received is only merged once it ends.
+    """
+
+    MAX_ROWS = 1_000_000
+
+    def __init__(self, hex_view=False, timestamps=False):
+        self.hex_view = hex_view
+        self.timestamps = timestamps
+        self.sources = []  # [name, store, absolute number of the next line to merge]
+        self._times = array('q')
+        self._sources = array('H')
+        self._lines = array('Q')
+
+    def add_source(self, name, store):
+        self.sources.append([name, store, store.first_line])
+
+    def remove_source(self, name):
+        """Drops a source and its rows."""
+        self.remove_sources([name])
+
+    def remove_sources(self, names):
+        """Drops several sources and their rows in a single pass over the rows."""
+        names = set(names)
+        removed = [source[0] in names for source in self.sources]
+        if all(removed):
+            self._times = array('q')
+            self._sources = array('H')
+            self._lines = array('Q')
+        elif any(removed):
+            # New index of each kept source
+            remap = [0] * len(removed)
+            for new, old in enumerate(i for i, r in enumerate(removed) if not r):
+                remap[old] = new
+            keep = [not removed[index] for index in self._sources]
+            self._times = array('q', compress(self._times, keep))
+            self._lines = array('Q', compress(self._lines, keep))
+            self._sources = array('H', map(remap.__getitem__, compress(self._sources, keep)))
+        self.sources = [source for source, r in zip(self.sources, removed) if not r]
+
+    def __len__(self):
+        return len(self._lines)
+
+    @property
+    def max_line_length(self):
+        prefix = len(format_timestamp(0)) if self.timestamps else 0
+        widths = [len(name) + 3 + store.max_line_length * (3 if self.hex_view else 1)
+                  for name, store, _next in self.sources]
+        return prefix + max(widths, default=0)
+
+    def update(self):
+        """Merges newly completed lines; returns how many rows were added."""
+        new_rows = []
+        for index, source in enumerate(self.sources):
+            _name, store, next_line = source
+            # The store's last line is still open
+            complete = store.first_line + len(store) - 1
+            for number in range(max(next_line, store.first_line), complete):
+                offset = store.line_offset(number - store.first_line)
+                new_rows.append((store.time_at(offset), index, number))
+            source[2] = max(next_line, complete)
+        if not new_rows:
+            return 0
+        new_rows.sort()
+        for timestamp_ns, index, number in new_rows:
+            self._times.append(timestamp_ns)
+            self._sources.append(index)
+            self._lines.append(number)
+        if len(self._lines) > self.MAX_ROWS * 1.1:
+            drop = len(self._lines) - self.MAX_ROWS
+            del self._times[:drop]
+            del self._sources[:drop]
+            del self._lines[:drop]
+        return len(new_rows)
+
+    def text(self, index):
+        name, store, _next = self.sources[self._sources[index]]
+        local = self._lines[index] - store.first_line
+        if local < 0:
+            body = "(discarded by scrollback)"
+        elif self.hex_view:
+            body = to_hex(store.line(local))
+        else:
+            body = store.text(local)
+        row = f"[{name}] {body}"
+        if self.timestamps:
+            row = format_timestamp(self._times[index] + store.wall_offset_ns) + row
+        return row
@@ -0,0 +1,195 @@
+"""
+Fuzzy search over the saved command library.
+
+A command matches when every whitespace-separated term of the query
+appears in its name, command or tags as a subsequence (in order, not
+necessarily adjacent), ignoring case: "rst pwr" finds "Reset Power".
+
+Running a regex per command costs about a microsecond, too much to do for
+100k commands on every keystroke. So the index keeps, per character, one
+byte per command with the number of times the character occurs in it
+(capped at 255), and one presence byte per command for each tag. A query
+turns those arrays into big integers and ANDs them, which drops every
+command that lacks one of the query's characters (or enough of a repeated
+one) without a Python loop; the regex only runs on what is left. Only the
+MAX_FILTERS rarest characters of a query are ANDed, as the regex checks
+the rest anyway. Arrays are built the first time a character or tag is
+searched for, or ahead of time by warm_up(), and are kept up to date as
+commands change.
+"""
+import operator
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import compress, repeat
+
+# Commands covered by the first step of CommandIndex.search(), doubling up to SEARCH_CHUNK
+FIRST_CHUNK = 256
+SEARCH_CHUNK = 4096
+MAX_COUNT = 255
+MAX_FILTERS = 4
+# Characters warm_up() builds arrays for, most common in commands first
+WARM_CHARS = "etaoirsnlcdhmpuvgfbwykxjqz 0123456789+=_-.,?"
+_RANK = {ch: rank for rank, ch in enumerate(WARM_CHARS)}
+# _AT_LEAST[k] translates a count byte into 1 if it is at least k, else 0
+_AT_LEAST = [bytes(int(count >= k) for count in range(256)) for k in range(MAX_COUNT + 1)]
+
+
+def command_tags(cmd):
+    return cmd.get('tags') or []
+
+
+def command_text(cmd):
+    """What a query is matched against: name, command and tags, lower-cased."""
+    return "\x1f".join([cmd['name'], cmd['command'], " ".join(command_tags(cmd))]).lower()
+
+
+@lru_cache(maxsize=64)
+def _pattern(query):
+    """Regex matching a text that contains every term of query as a subsequence."""
+    terms = []
+    for term in query.lower().split():
+        # Possessive runs find each character's first occurrence without backtracking
+        terms.append("".join(f"[^{re.escape(ch)}]*+{re.escape(ch)}" for ch in term))
+    if len(terms) == 1:
+        return re.compile(terms[0], re.DOTALL)
+    return re.compile("".join(f"(?={term})" for term in terms), re.DOTALL)
+
+
+class CommandIndex:
+    """
+    Search index over a list of command dicts. Keep it in step with the
+    list through insert(), update() and remove(), or reset() after bulk
+    changes.
+    """
+
+    def __init__(self, commands=()):
+        self.reset(commands)
+
+    def reset(self, commands):
+        self._texts = [command_text(cmd) for cmd in commands]
+        self._tags = [tuple(command_tags(cmd)) for cmd in commands]
+        self._tag_counts = Counter(tag for tags in self._tags for tag in tags)
+        self._counts = {}  # char -> bytearray, occurrences per command
+        self._tag_arrays = {}  # tag -> bytearray, 1 per command that has it
+
+    def __len__(self):
+        return len(self._texts)
+
+    def tags(self):
+        """Every tag in use, sorted."""
+        return sorted(tag for tag, count in self._tag_counts.items() if count > 0)
+
+    def insert(self, index, cmd):
+        text = command_text(cmd)
+        tags = tuple(command_tags(cmd))
+        self._texts.insert(index, text)
+        self._tags.insert(index, tags)
+        self._tag_counts.update(tags)
+        for ch, counts in self._counts.items():
+            counts.insert(index, min(text.count(ch), MAX_COUNT))
+        for tag, present in self._tag_arrays.items():
+            present.insert(index, tag in tags)
+
+    def update(self, index, cmd):
+        text = command_text(cmd)
+        tags = tuple(command_tags(cmd))
+        self._texts[index] = text
+        self._tag_counts.subtract(self._tags[index])
+        self._tag_counts.update(tags)
+        self._tags[index] = tags
+        for ch, counts in self._counts.items():
+            counts[index] = min(text.count(ch), MAX_COUNT)
+        for tag, present in self._tag_arrays.items():
+            present[index] = tag in tags
+
+    def remove(self, index):
+        del self._texts[index]
+        self._tag_counts.subtract(self._tags.pop(index))
+        for counts in self._counts.values():
+            del counts[index]
+        for present in self._tag_arrays.values():
+            del present[index]
+
+    def warm_up(self):
+        """
+        Builds the array of one more of WARM_CHARS or of the tags in use
+        (about 10 ms each at 100k commands) so the first search for it is
+        fast. Returns False once all are built.
+        """
+        for ch in WARM_CHARS:
+            if ch not in self._counts:
+                self._char_counts(ch)
+                return True
+        for tag in self.tags():
+            if tag not in self._tag_arrays:
+                self._tag_array(tag)
+                return True
+        return False
+
+    def matches(self, index, query="", tag=None):
+        """Whether the command at index passes the query and tag filter."""
+        if tag and tag not in self._tags[index]:
+            return False
+        return not query.split() or _pattern(query).match(self._texts[index]) is not None
+
+    def search(self, query="", tag=None):
+        """
+        Generator of lists of the indices of matching commands, in library
+        order, one list per window of the library that has any; a caller
+        can stop between lists to keep a long scan from blocking. The first
+        window is small, so the first matches come quickly. Start a new
+        search after changing the index.
+        """
+        count = len(self._texts)
+        needed = {}
+        for term in query.lower().split():
+            for ch, times in Counter(term).items():
+                needed[ch] = max(needed.get(ch, 0), min(times, MAX_COUNT))
+        rarest = sorted(needed, key=lambda ch: -_RANK.get(ch, len(WARM_CHARS)))[:MAX_FILTERS]
+        filters = [self._char_counts(ch).translate(_AT_LEAST[needed[ch]]) for ch in rarest]
+        if tag:
+            filters.append(self._tag_array(tag))
+        mask = None
+        if filters:
+            candidates = int.from_bytes(filters[0], 'little')
+            for present in filters[1:]:
+                candidates &= int.from_bytes(present, 'little')
+            mask = candidates.to_bytes(count, 'little')
+
+        match = _pattern(query).match if needed else None
+        texts = self._texts
+        start = 0
+        size = FIRST_CHUNK
+        while start < count:
+            window = range(start, min(start + size, count))
+            start = window.stop
+            size = min(size * 2, SEARCH_CHUNK)
+            if mask is None:
+                chunk = list(window)
+            else:
+                part = mask[window.start:window.stop]
+                if 1 not in part:  # memchr, so windows without candidates cost next to nothing
+                    continue
+                chunk = list(compress(window, part))
+            if match:
+                chunk = list(compress(chunk, map(match, map(texts.__getitem__, chunk))))
+            if chunk:
+                yield chunk
+
+    def _char_counts(self, ch):
+        counts = self._counts.get(ch)
+        if counts is None:
+            try:
+                counts = bytearray(map(str.count, self._texts, repeat(ch)))
+            except ValueError:  # A count above 255
+                counts = bytearray(map(min, map(str.count, self._texts, repeat(ch)), repeat(MAX_COUNT)))
+            self._counts[ch] = counts
+        return counts
+
+    def _tag_array(self, tag):
+        present = self._tag_arrays.get(tag)
+        if present is None:
+            present = bytearray(map(operator.contains, self._tags, repeat(tag)))
+            self._tag_arrays[tag] = present
+        return present
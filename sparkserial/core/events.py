@@ -0,0 +1,33 @@
+import threading
+import traceback
+
+
+class Signal:
+    """
+    Callback list standing in for a Qt signal, so the core runs without Qt.
+
+    emit() calls every connected callback synchronously on the emitting
+    thread, which is often a serial I/O thread: callbacks must be quick and
+    thread-safe. The GUI hands them over to its own thread with
+    gui.qt_bridge.QtRelay. An exception in one callback is printed and does
+    not stop the others or the emitting thread.
+    """
+
+    def __init__(self):
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def connect(self, callback):
+        with self._lock:
+            self._callbacks = self._callbacks + [callback]
+
+    def disconnect(self, callback):
+        with self._lock:
+            self._callbacks = [c for c in self._callbacks if c != callback]
+
+    def emit(self, *args):
+        for callback in self._callbacks:
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
@@ -0,0 +1,178 @@
+"""
+Row sources that browse files on disk through TerminalView.
+
+Both views memory-map their file and format only the rows that are
+painted, so opening a multi-GB capture or log costs next to nothing and
+the pages the OS keeps resident are the ones being looked at.
+"""
+import mmap
+import threading
+from array import array
+from bisect import bisect_left
+from sparkserial.core.capture_file import RX, TX, EVENT
+from sparkserial.core.capture_store import format_timestamp
+from sparkserial.core.hexfmt import to_hex
+
+# Control characters shown as escapes (or '.') in single-row text payloads
+_ESCAPES = {0x09: "\\t", 0x0A: "\\n", 0x0D: "\\r"}
+_ESCAPES.update({c: "." for c in list(range(0x20)) + [0x7F] if c not in _ESCAPES})
+
+
+class CaptureFileView:
+    """
+    One row per .sscap record:
+
+        [12:00:01.2345] RX  hello\\r\\n
+
+    Payloads are shown as text with control characters escaped, or as hex,
+    and cut at MAX_ROW_BYTES. Consecutive rows are read by walking forward
+    from the previously read record, so painting a screenful touches only
+    those records.
+    """
+
+    MAX_ROW_BYTES = 256
+    DIRECTIONS = {RX: "RX", TX: "TX", EVENT: "--"}
+
+    def __init__(self, reader, hex_view=False, timestamps=True):
+        self.reader = reader
+        self.hex_view = hex_view
+        self.timestamps = timestamps
+        self._cursor = (0, reader.data_start)
+
+    def __len__(self):
+        return len(self.reader)
+
+    @property
+    def max_line_length(self):
+        prefix = len(format_timestamp(0)) if self.timestamps else 0
+        prefix += 4 + (max(map(len, self.reader.ports.values())) + 2 if len(self.reader.ports) > 1 else 0)
+        return prefix + self.MAX_ROW_BYTES * (3 if self.hex_view else 2) + 1
+
+    def _record_offset(self, index):
+        number, offset = self._cursor
+        if not number <= index < number + 64:
+            return self.reader.record_offset(index)
+        while number < index:
+            offset = self.reader.read(offset)[4]
+            number += 1
+        return offset
+
+    def text(self, index):
+        offset = self._record_offset(index)
+        timestamp_ns, direction, port_id, payload, next_offset = self.reader.read(offset)
+        self._cursor = (index + 1, next_offset)
+        data = bytes(payload[:self.MAX_ROW_BYTES])
+        truncated = len(payload) > self.MAX_ROW_BYTES
+        payload.release()
+
+        if self.hex_view and direction != EVENT:
+            body = to_hex(data)
+        else:
+            body = data.decode('utf-8', errors='replace').translate(_ESCAPES)
+        row = f"{self.DIRECTIONS.get(direction, '??'):<4}"
+        if len(self.reader.ports) > 1:
+            row = f"{self.reader.ports.get(port_id, port_id)}: " + row
+        if self.timestamps:
+            row = format_timestamp(self.reader.wall_ns(timestamp_ns)) + row
+        return row + body + ("…" if truncated else "")
+
+    def row_at_time(self, wall_ns):
+        """Row of the first record at or after wall-clock time wall_ns."""
+        timestamp_ns = wall_ns - self.reader.start_wall_ns + self.reader.start_monotonic_ns
+        return min(self.reader.seek_time(timestamp_ns)[0], max(0, len(self) - 1))
+
+
+class TextFileView:
+    """
+    Lines of a (possibly huge) text log.
+
+    A background thread counts newlines per BLOCK_BYTES block, so rows
+    become available while the file is still being indexed; len() grows
+    until indexing is done. Finding a line bisects the per-block counts and
+    then searches within one block.
+    """
+
+    BLOCK_BYTES = 64 * 1024
+    MAX_ROW_BYTES = 4096
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._map = b""  # Empty file
+        self.size = len(self._map)
+        # Newlines counted up to the end of each indexed block
+        self._block_lines = array('Q')
+        self._lines = 0
+        self.indexing = True
+        self.max_line_length = 80
+        self._cursor = (0, 0)
+        self._closed = False
+        self._thread = threading.Thread(target=self._build_index, name="TextFileIndex", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._closed = True
+        self._thread.join()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    @property
+    def indexed_bytes(self):
+        return min(self.size, len(self._block_lines) * self.BLOCK_BYTES)
+
+    def _build_index(self):
+        # Read through a separate handle rather than the mapping, so indexing
+        # does not leave the whole file resident in this process
+        total = 0
+        with open(self.path, 'rb', buffering=0) as f:
+            for _start in range(0, self.size, self.BLOCK_BYTES):
+                if self._closed:
+                    return
+                total += f.read(self.BLOCK_BYTES).count(b'\n')
+                self._block_lines.append(total)
+                self._lines = total
+        self.indexing = False
+
+    def __len__(self):
+        if self.indexing:
+            return self._lines
+        # Count a last line without a trailing newline
+        return self._lines + (1 if self.size and self._map[-1:] != b'\n' else 0)
+
+    def line_offset(self, index):
+        """File offset where line index starts."""
+        if index == 0:
+            return 0
+        number, offset = self._cursor
+        if number <= index < number + 64:
+            while number < index:
+                offset = self._map.find(b'\n', offset) + 1
+                number += 1
+            return offset
+        # Block holding the index-th newline, then walk to it
+        block = bisect_left(self._block_lines, index)
+        number = self._block_lines[block - 1] if block else 0
+        offset = block * self.BLOCK_BYTES
+        while number < index:
+            offset = self._map.find(b'\n', offset) + 1
+            number += 1
+        return offset
+
+    def text(self, index):
+        start = self.line_offset(index)
+        end = self._map.find(b'\n', start, start + self.MAX_ROW_BYTES)
+        if end == -1:
+            end = min(self.size, start + self.MAX_ROW_BYTES)
+            self._cursor = (index, start)
+        else:
+            self._cursor = (index + 1, end + 1)
+        line = self._map[start:end]
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        text = line.decode('utf-8', errors='replace')
+        self.max_line_length = max(self.max_line_length, len(text))
+        return text
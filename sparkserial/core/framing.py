@@ -0,0 +1,311 @@
+"""
+Streaming frame decoders for framed binary protocols.
+
+A framer is fed raw chunks as they are read and returns the frames they
+complete. Each keeps only the unfinished tail of the stream and resumes
+scanning where the previous chunk left off, so no byte is examined twice.
+Searches for delimiters use bytes.find(), which runs in C.
+
+Frames can carry a trailing CRC, which is checked and stripped. Frames that
+fail the CRC are counted in crc_errors, frames that cannot be decoded or
+exceed max_length in bad_frames; neither is returned.
+"""
+import binascii
+import zlib
+
+
+def _crc8(data):
+    # CRC-8/SMBUS: poly 0x07, init 0
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def _crc16_modbus(data):
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ _MODBUS_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def _make_crc8_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return table
+
+
+def _make_modbus_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC8_TABLE = _make_crc8_table()
+_MODBUS_TABLE = _make_modbus_table()
+
+# name: (size in bytes, byte order on the wire, function)
+CRC_TYPES = {
+    "CRC-8": (1, "big", _crc8),
+    "CRC-16/CCITT": (2, "big", lambda data: binascii.crc_hqx(data, 0xFFFF)),
+    "CRC-16/MODBUS": (2, "little", _crc16_modbus),
+    "CRC-32": (4, "little", zlib.crc32),
+}
+
+FRAMING_TYPES = ["Delimiter", "Fixed Length", "Length Prefix", "SLIP", "COBS"]
+
+
+class Framer:
+    """Base class: counters, CRC checking and max_length handling."""
+
+    def __init__(self, crc=None, max_length=64 * 1024):
+        if crc and crc not in CRC_TYPES:
+            raise ValueError(f"Unknown CRC: {crc}")
+        self.crc = crc
+        self.max_length = max_length
+        self.frames = 0
+        self.bad_frames = 0
+        self.crc_errors = 0
+        self._buffer = bytearray()
+
+    def reset(self):
+        """Drops any partial frame, e.g. after a reconnect."""
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Consumes a chunk and returns the list of frames it completed."""
+        raise NotImplementedError
+
+    def _emit(self, frames, frame):
+        if len(frame) > self.max_length:
+            self.bad_frames += 1
+            return
+        if self.crc:
+            size, byteorder, crc_function = CRC_TYPES[self.crc]
+            if len(frame) < size or crc_function(frame[:-size]) != int.from_bytes(frame[-size:], byteorder):
+                self.crc_errors += 1
+                return
+            frame = frame[:-size]
+        self.frames += 1
+        frames.append(bytes(frame))
+
+
+class DelimiterFramer(Framer):
+    """Frames end with delimiter (not included in the frame)."""
+
+    def __init__(self, delimiter=b"\n", **kwargs):
+        super().__init__(**kwargs)
+        if not delimiter:
+            raise ValueError("Delimiter must not be empty")
+        self.delimiter = bytes(delimiter)
+        self._scan = 0  # Where the next delimiter search starts in _buffer
+
+    def reset(self):
+        super().reset()
+        self._scan = 0
+
+    def feed(self, data):
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        start = 0
+        delimiter = self.delimiter
+        while True:
+            end = buffer.find(delimiter, max(start, self._scan))
+            if end == -1:
+                break
+            self._emit(frames, buffer[start:end])
+            start = end + len(delimiter)
+        del buffer[:start]
+        # A delimiter split across chunks starts at most len - 1 bytes back
+        self._scan = max(0, len(buffer) - len(delimiter) + 1)
+        if len(buffer) > self.max_length + len(delimiter):
+            # Runaway frame: drop it and resynchronise on the next delimiter
+            self.bad_frames += 1
+            self.reset()
+        return frames
+
+
+class FixedLengthFramer(Framer):
+    """Every frame is exactly length bytes (including any CRC)."""
+
+    def __init__(self, length, **kwargs):
+        super().__init__(**kwargs)
+        if length < 1:
+            raise ValueError("Frame length must be positive")
+        self.length = length
+
+    def feed(self, data):
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        whole = len(buffer) // self.length * self.length
+        for start in range(0, whole, self.length):
+            self._emit(frames, buffer[start:start + self.length])
+        del buffer[:whole]
+        return frames
+
+
+class LengthPrefixFramer(Framer):
+    """
+    Frames start with a header_bytes length field in byteorder. The length
+    counts the bytes after the header (including any CRC) unless
+    includes_header is set.
+    """
+
+    def __init__(self, header_bytes=2, byteorder="big", includes_header=False, **kwargs):
+        super().__init__(**kwargs)
+        if header_bytes not in (1, 2, 4):
+            raise ValueError("Length prefix must be 1, 2 or 4 bytes")
+        self.header_bytes = header_bytes
+        self.byteorder = byteorder
+        self.includes_header = includes_header
+
+    def feed(self, data):
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        start = 0
+        header = self.header_bytes
+        while len(buffer) - start >= header:
+            length = int.from_bytes(buffer[start:start + header], self.byteorder)
+            if self.includes_header:
+                length -= header
+            if length < 0 or length > self.max_length:
+                # The length field is garbage; skip a byte and try to resynchronise
+                self.bad_frames += 1
+                start += 1
+                continue
+            if len(buffer) - start - header < length:
+                break
+            self._emit(frames, buffer[start + header:start + header + length])
+            start += header + length
+        del buffer[:start]
+        return frames
+
+
+class SlipFramer(Framer):
+    """SLIP (RFC 1055): frames end with 0xC0, with 0xDB escapes."""
+
+    END = 0xC0
+    ESC = 0xDB
+    ESC_END = 0xDC
+    ESC_ESC = 0xDD
+
+    def feed(self, data):
+        buffer = self._buffer
+        # Only the new bytes can contain the next END
+        scan = len(buffer)
+        buffer += data
+        frames = []
+        start = 0
+        while True:
+            end = buffer.find(b"\xC0", scan)
+            if end == -1:
+                break
+            frame = buffer[start:end]
+            if frame:  # Back-to-back ENDs delimit nothing
+                self._emit_escaped(frames, frame)
+            start = scan = end + 1
+        del buffer[:start]
+        if len(buffer) > self.max_length * 2:
+            self.bad_frames += 1
+            self.reset()
+        return frames
+
+    def _emit_escaped(self, frames, frame):
+        if self.ESC in frame:
+            # Every ESC must be followed by ESC_END or ESC_ESC
+            if frame.count(b"\xDB") != frame.count(b"\xDB\xDC") + frame.count(b"\xDB\xDD"):
+                self.bad_frames += 1
+                return
+            frame = frame.replace(b"\xDB\xDC", b"\xC0").replace(b"\xDB\xDD", b"\xDB")
+        self._emit(frames, frame)
+
+
+class CobsFramer(Framer):
+    """COBS: frames are COBS-encoded and end with a zero byte."""
+
+    def feed(self, data):
+        buffer = self._buffer
+        scan = len(buffer)
+        buffer += data
+        frames = []
+        start = 0
+        while True:
+            end = buffer.find(b"\x00", scan)
+            if end == -1:
+                break
+            if end > start:
+                decoded = cobs_decode(buffer[start:end])
+                if decoded is None:
+                    self.bad_frames += 1
+                else:
+                    self._emit(frames, decoded)
+            start = scan = end + 1
+        del buffer[:start]
+        if len(buffer) > self.max_length + self.max_length // 254 + 2:
+            self.bad_frames += 1
+            self.reset()
+        return frames
+
+
+def cobs_decode(encoded):
+    """Decodes one COBS block (without its trailing zero), or returns None if it is malformed."""
+    out = bytearray()
+    index = 0
+    size = len(encoded)
+    while index < size:
+        code = encoded[index]
+        if code == 0 or index + code > size:
+            return None
+        out += encoded[index + 1:index + code]
+        index += code
+        if code != 0xFF and index < size:
+            out.append(0)
+    return bytes(out)
+
+
+def cobs_encode(data):
+    """COBS-encodes data (without the trailing zero delimiter)."""
+    out = bytearray()
+    for block in bytes(data).split(b"\x00"):
+        while len(block) >= 254:
+            out.append(0xFF)
+            out += block[:254]
+            block = block[254:]
+        out.append(len(block) + 1)
+        out += block
+    return bytes(out)
+
+
+def make_framer(settings):
+    """
+    Builds a framer from saved settings, e.g.
+    {"type": "Length Prefix", "header_bytes": 2, "byteorder": "big", "crc": "CRC-16/MODBUS"}.
+    Returns None when settings is empty or its type is "Off".
+    """
+    if not settings or settings.get("type", "Off") == "Off":
+        return None
+    kind = settings["type"]
+    common = {"crc": settings.get("crc") or None, "max_length": settings.get("max_length", 64 * 1024)}
+    if kind == "Delimiter":
+        return DelimiterFramer(bytes.fromhex(settings.get("delimiter", "0A")), **common)
+    if kind == "Fixed Length":
+        return FixedLengthFramer(settings.get("length", 8), **common)
+    if kind == "Length Prefix":
+        return LengthPrefixFramer(settings.get("header_bytes", 2), settings.get("byteorder", "big"),
+                                  settings.get("includes_header", False), **common)
+    if kind == "SLIP":
+        return SlipFramer(**common)
+    if kind == "COBS":
+        return CobsFramer(**common)
+    raise ValueError(f"Unknown framing: {kind}")
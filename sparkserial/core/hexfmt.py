@@ -0,0 +1,111 @@
+"""
+Hex formatting shared by the terminal, the log writer and exports.
+
+Everything here leans on bytes.hex() and bytes.translate(), which run in C,
+instead of formatting one byte at a time in Python.
+"""
+
+import sys
+from array import array
+
+# Printable ASCII maps to itself, everything else to '.'
+_ASCII_TABLE = bytes(b if 0x20 <= b < 0x7F else 0x2E for b in range(256))
+
+
+def to_hex(data, sep=" "):
+    """Upper-case hex of data with sep between bytes, e.g. b'AB' -> '41 42'."""
+    return bytes(data).hex(sep).upper() if data else ""
+
+
+def to_ascii(data):
+    """Printable ASCII view of data, with '.' for everything else."""
+    return bytes(data).translate(_ASCII_TABLE).decode('ascii')
+
+
+def hex_rows(data, offset=0, row_bytes=16):
+    """
+    Formats data as rows of row_bytes hex bytes, where offset is the
+    absolute position of data[0] in the stream. Rows are aligned to
+    absolute offsets, so chunks formatted one after another join up into
+    the same rows as formatting everything at once. Every byte is followed
+    by a separator: a space, or a newline when it completes a row.
+    """
+    data = bytes(data)
+    if not data:
+        return ""
+    parts = []
+
+    # Finish the partial row the stream is currently in
+    head = min(len(data), (-offset) % row_bytes)
+    if head:
+        parts.append(data[:head].hex(" ").upper())
+        parts.append("\n" if (offset + head) % row_bytes == 0 else " ")
+
+    # Whole rows: hex everything in one go, then turn every row's last
+    # separator into a newline with a single strided slice assignment
+    full_end = head + (len(data) - head) // row_bytes * row_bytes
+    if full_end > head:
+        rows = (full_end - head) // row_bytes
+        block = bytearray(data[head:full_end].hex(" ").upper() + " ", 'ascii')
+        block[row_bytes * 3 - 1::row_bytes * 3] = b"\n" * rows
+        parts.append(block.decode('ascii'))
+
+    # Start of the next row
+    if full_end < len(data):
+        parts.append(data[full_end:].hex(" ").upper() + " ")
+    return "".join(parts)
+
+
+def hexdump(data, offset=0, row_bytes=16):
+    """
+    Classic hexdump layout, one row per row_bytes bytes:
+
+        00000010  48 65 6C 6C 6F 0A 77 6F 72 6C 64 0A 01 02 61 62  |Hello.world...ab|
+
+    offset is the address printed for data[0].
+    """
+    data = bytes(data)
+    if not data:
+        return ""
+    full = len(data) // row_bytes * row_bytes
+    if offset + len(data) > 0xFFFFFFFF:
+        # Addresses wider than 8 digits break the fixed column layout below
+        full = 0
+    text = _hexdump_full_rows(data[:full], offset, row_bytes) if full else ""
+
+    # Remaining rows one at a time, padding the hex column so the ASCII gutter lines up
+    hex_width = row_bytes * 3 - 1
+    for row_start in range(full, len(data), row_bytes):
+        row = data[row_start:row_start + row_bytes]
+        text += f"{offset + row_start:08X}  {to_hex(row):<{hex_width}}  |{to_ascii(row)}|\n"
+    return text
+
+
+def _hexdump_full_rows(data, offset, row_bytes):
+    # Lay every column out with strided slice assignments, so the work per
+    # row happens in C rather than in a Python loop
+    rows = len(data) // row_bytes
+    hex_width = row_bytes * 3
+    ascii_start = 10 + hex_width + 2
+    row_len = ascii_start + row_bytes + 2
+    out = bytearray(b" ") * (rows * row_len)
+
+    # Big-endian 32-bit addresses hex-encode straight into 8 digits each
+    packed = array('I', range(offset, offset + rows * row_bytes, row_bytes))
+    if sys.byteorder == 'little':
+        packed.byteswap()
+    addresses = packed.tobytes().hex().upper().encode('ascii')
+    for column in range(8):
+        out[column::row_len] = addresses[column::8]
+
+    hex_text = (data.hex(" ").upper() + " ").encode('ascii')
+    for column in range(hex_width - 1):
+        out[10 + column::row_len] = hex_text[column::hex_width]
+
+    ascii_text = data.translate(_ASCII_TABLE)
+    out[ascii_start - 1::row_len] = b"|" * rows
+    for column in range(row_bytes):
+        out[ascii_start + column::row_len] = ascii_text[column::row_bytes]
+    out[row_len - 2::row_len] = b"|" * rows
+    out[row_len - 1::row_len] = b"\n" * rows
+    return out.decode('ascii')
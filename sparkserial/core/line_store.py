@@ -0,0 +1,132 @@
+import threading
+from array import array
+from bisect import bisect_right
+
+
+class LineStore:
+    """
+    Append-only text store indexed by line.
+
+    All bytes live in one bytearray and line_starts holds the offset where
+    each line begins, so fetching any line is an O(1) slice and each line
+    costs 8 bytes of index. Lines longer than wrap_bytes are split into
+    several index entries so that no single row ever has to be decoded in
+    full (e.g. a hex stream without newlines).
+
+    Offsets are absolute from the start of the session. trim() drops old
+    lines from the front; base_offset and first_line then tell how much
+    has been discarded.
+
+    Only one thread may append, but slice() can be called from others (e.g.
+    a background search): a lock keeps it consistent with trim() and
+    clear(), the only operations that move existing bytes.
+    """
+
+    def __init__(self, wrap_bytes=1024):
+        self.wrap_bytes = wrap_bytes
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._data = bytearray()
+            self._line_starts = array('Q', [0])
+            self.base_offset = 0
+            self.first_line = 0
+            self.max_line_length = 0
+
+    def __len__(self):
+        # The last entry is the (possibly empty) line still being written
+        return len(self._line_starts)
+
+    @property
+    def size(self):
+        return len(self._data)
+
+    @property
+    def end_offset(self):
+        return self.base_offset + len(self._data)
+
+    def append(self, data):
+        """Appends UTF-8 bytes and indexes any lines they complete."""
+        data_buf = self._data
+        starts = self._line_starts
+        base = self.base_offset
+        search_from = len(data_buf)
+        data_buf += data
+        end = len(data_buf)
+
+        while True:
+            line_start = starts[-1] - base
+            # A newline right at the wrap point still ends the line
+            newline = data_buf.find(b'\n', search_from, min(end, line_start + self.wrap_bytes + 1))
+            if newline != -1:
+                next_start = newline + 1
+            elif end - line_start > self.wrap_bytes:
+                # Wrap long lines, backing off so a UTF-8 sequence is not split
+                next_start = line_start + self.wrap_bytes
+                while next_start > line_start + 1 and (data_buf[next_start] & 0xC0) == 0x80:
+                    next_start -= 1
+            else:
+                break
+            self.max_line_length = max(self.max_line_length, next_start - line_start)
+            starts.append(base + next_start)
+            search_from = next_start
+
+        self.max_line_length = max(self.max_line_length, end - (starts[-1] - base))
+
+    def line_offset(self, index):
+        """Absolute offset of the first byte of line index."""
+        return self._line_starts[index]
+
+    def line_index(self, offset):
+        """Index of the line that contains absolute offset."""
+        return max(0, bisect_right(self._line_starts, offset) - 1)
+
+    def slice(self, start, end):
+        """Returns the bytes between two absolute offsets that are still held."""
+        with self._lock:
+            start = max(start, self.base_offset)
+            return bytes(self._data[start - self.base_offset:max(start, end) - self.base_offset])
+
+    def line(self, index):
+        """Returns line index as bytes, without its trailing newline."""
+        start = self._line_starts[index]
+        if index + 1 < len(self._line_starts):
+            end = self._line_starts[index + 1]
+        else:
+            end = self.end_offset
+        line = self.slice(start, end)
+        if line.endswith(b'\n'):
+            line = line[:-1]
+        if line.endswith(b'\r'):
+            line = line[:-1]
+        return line
+
+    def text(self, index):
+        return self.line(index).decode('utf-8', errors='replace')
+
+    def to_text(self):
+        return self._data.decode('utf-8', errors='replace')
+
+    def trim(self, max_lines=None, max_bytes=None):
+        """
+        Drops whole lines from the front once either limit is exceeded by
+        more than 10%, so the cost of shifting the buffer is amortised.
+        """
+        drop = 0
+        if max_lines and len(self) > max_lines * 1.1:
+            drop = len(self) - max_lines
+        if max_bytes and self.size > max_bytes * 1.1:
+            drop = max(drop, self.line_index(self.end_offset - max_bytes) + 1)
+        drop = min(drop, len(self) - 1)
+        if drop <= 0:
+            return 0
+
+        with self._lock:
+            new_base = self._line_starts[drop]
+            del self._data[:new_base - self.base_offset]
+            del self._line_starts[:drop]
+            self.base_offset = new_base
+            self.first_line += drop
+        return drop
@@ -0,0 +1,325 @@
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+from bisect import bisect_left
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Markers passed through the queue alongside log text
+_SYNC = object()
+_STOP = object()
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def load_manifest(manifest_path):
+    """Reads a rotation manifest written by LogWriter."""
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def find_segment(manifest_path, timestamp):
+    """
+    Returns the path of the log segment holding the data logged at
+    timestamp (seconds since the epoch), or the first segment logged after
+    it when timestamp falls between two segments; None if it is before the
+    first or after the last. Only the small manifest is read, so no segment
+    has to be opened or decompressed to find the right one.
+    """
+    # Segments that have not received any data yet have no start
+    segments = [segment for segment in load_manifest(manifest_path)["segments"] if segment["start"] is not None]
+    if not segments or timestamp < segments[0]["start"]:
+        return None
+    ends = [segment["end"] if segment["end"] is not None else float("inf") for segment in segments]
+    index = bisect_left(ends, timestamp)
+    if index == len(segments):
+        return None
+    return os.path.join(os.path.dirname(manifest_path), segments[index]["file"])
+
+
+class LogWriter:
+    """
+    Appends text to a log file from a background thread.
+
+    write() only enqueues, so a slow disk never stalls the caller. The
+    writer thread batches queued text and flushes once FLUSH_BYTES have
+    accumulated or FLUSH_INTERVAL seconds have passed, which bounds how
+    much a crash can lose. sync() and close() additionally fsync.
+
+    If more than MAX_BACKLOG_BYTES are waiting, further writes are dropped
+    and counted in dropped_bytes rather than growing without limit. Sizes
+    are counted in characters, which for serial logs is close to bytes.
+
+    With max_bytes or max_seconds set, the log is split into numbered
+    segments next to path (log.0001.txt, log.0002.txt, ...). Closed segments
+    are optionally compressed ("gzip" or "zstd") and only the newest
+    retention of them are kept (0 keeps all). Every segment is listed in
+    <path stem>.manifest.json with the arrival times of the first and last
+    data it holds, as passed to write().
+    """
+
+    FLUSH_INTERVAL = 0.25
+    FLUSH_BYTES = 64 * 1024
+    MAX_BACKLOG_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, path, encoding="utf-8", max_bytes=0, max_seconds=0, compress=None, retention=0):
+        if compress and compress not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression: {compress}")
+        if compress == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+
+        self.path = path
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.compress = compress
+        self.retention = retention
+        self.rotating = bool(max_bytes or max_seconds)
+
+        if self.rotating:
+            root, self._segment_ext = os.path.splitext(path)
+            self._segment_root = root
+            self.manifest_path = root + ".manifest.json"
+            self._manifest_lock = threading.Lock()
+            self._compressors = []
+            self._manifest = {"segments": []}
+            if os.path.exists(self.manifest_path):
+                # Continue numbering after the segments of an earlier run
+                self._manifest = load_manifest(self.manifest_path)
+            self._segment_number = len(self._manifest["segments"])
+            if self._manifest["segments"]:
+                last = self._manifest["segments"][-1]["file"]
+                self._segment_number = int(last[len(os.path.basename(root)) + 1:].split(".")[0])
+            # Open here so a bad path fails in the caller, not on the thread
+            self._open_segment()
+        else:
+            self.manifest_path = None
+            # Open here so a bad path fails in the caller, not on the thread
+            self._file = open(path, "a", encoding=encoding)
+
+        self._queue = queue.SimpleQueue()
+        # Each counter is only ever advanced by one thread
+        self._queued_bytes = 0
+        self._written_bytes = 0
+        self._rejected_bytes = 0
+        self._failed_bytes = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped_bytes(self):
+        """Text that was rejected because of the backlog limit or lost to a write error."""
+        return self._rejected_bytes + self._failed_bytes
+
+    @property
+    def backlog_bytes(self):
+        """Bytes accepted by write() that have not reached the OS yet."""
+        return self._queued_bytes - self._written_bytes
+
+    def write(self, text, timestamp=None):
+        """Queues text; timestamp is when its data arrived, in seconds since the epoch (default: now)."""
+        if not text:
+            return
+        size = len(text)
+        if self.error or self.backlog_bytes + size > self.MAX_BACKLOG_BYTES:
+            self._rejected_bytes += size
+            return
+        self._queued_bytes += size
+        self._queue.put((text, time.time() if timestamp is None else timestamp))
+
+    def sync(self):
+        """Asks the writer to flush and fsync everything queued so far."""
+        self._queue.put(_SYNC)
+
+    def close(self):
+        """Writes out everything queued, fsyncs and closes the file."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if self.rotating:
+            for compressor in self._compressors:
+                compressor.join()
+
+    def _run(self):
+        pending = []
+        pending_size = 0
+        last_flush = time.monotonic()
+        stopping = False
+
+        while not stopping:
+            timeout = max(0.0, last_flush + self.FLUSH_INTERVAL - time.monotonic()) if pending else None
+            try:
+                items = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            # Take whatever else is already queued in the same batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            fsync = False
+            for item in items:
+                if item is _STOP:
+                    stopping = fsync = True
+                elif item is _SYNC:
+                    fsync = True
+                else:
+                    pending.append(item)
+                    pending_size += len(item[0])
+
+            due = time.monotonic() - last_flush >= self.FLUSH_INTERVAL
+            if pending and (fsync or due or pending_size >= self.FLUSH_BYTES):
+                self._flush(pending, pending_size, fsync)
+                pending = []
+                pending_size = 0
+                last_flush = time.monotonic()
+            elif fsync:
+                self._flush([], 0, True)
+
+        try:
+            if self.rotating:
+                self._close_segment()
+            else:
+                self._file.close()
+        except Exception as e:
+            self.error = str(e)
+
+    def _flush(self, pending, size, fsync):
+        try:
+            if self.rotating and pending and self._segment_due(size):
+                self._close_segment()
+                self._open_segment()
+            if pending:
+                self._file.write("".join(text for text, _timestamp in pending))
+                if self.rotating:
+                    self._segment_bytes += size
+                    self._add_times(min(timestamp for _text, timestamp in pending),
+                                    max(timestamp for _text, timestamp in pending))
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+        except Exception as e:
+            self.error = str(e)
+            self._failed_bytes += size
+        finally:
+            self._written_bytes += size
+
+    # Rotation (writer thread only, apart from the initial _open_segment)
+
+    def _segment_due(self, incoming):
+        if not self._segment_bytes:
+            return False
+        if self.max_bytes and self._segment_bytes + incoming > self.max_bytes:
+            return True
+        return bool(self.max_seconds) and time.time() - self._segment_entry["start"] >= self.max_seconds
+
+    def _add_times(self, first, last):
+        """
+        Widens the open segment's time range to cover data that arrived
+        between first and last. The manifest shows its end as None (still
+        being written) until the segment is closed.
+        """
+        entry = self._segment_entry
+        self._segment_last = last if self._segment_last is None else max(self._segment_last, last)
+        if entry["start"] is None or first < entry["start"]:
+            entry["start"] = first
+            with self._manifest_lock:
+                self._write_manifest()
+
+    def _open_segment(self):
+        self._segment_number += 1
+        segment_path = f"{self._segment_root}.{self._segment_number:04d}{self._segment_ext}"
+        self._file = open(segment_path, "a", encoding=self.encoding)
+        self._segment_path = segment_path
+        self._segment_bytes = 0
+        self._segment_last = None
+        self._segment_entry = {
+            "file": os.path.basename(segment_path),
+            "start": None,  # Set from the data written to it
+            "end": None,
+            "bytes": 0,
+            "compression": None,
+        }
+        with self._manifest_lock:
+            self._manifest["segments"].append(self._segment_entry)
+            self._write_manifest()
+
+    def _close_segment(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        entry = self._segment_entry
+        entry["end"] = self._segment_last
+        entry["bytes"] = self._segment_bytes
+        with self._manifest_lock:
+            self._apply_retention()
+            self._write_manifest()
+        if self.compress:
+            # Compress off the writer thread so logging keeps flowing meanwhile
+            compressor = threading.Thread(target=self._compress_segment, args=(self._segment_path, entry),
+                                          name="LogCompressor", daemon=True)
+            self._compressors = [c for c in self._compressors if c.is_alive()] + [compressor]
+            compressor.start()
+
+    def _compress_segment(self, segment_path, entry):
+        target = segment_path + COMPRESSION_SUFFIXES[self.compress]
+        try:
+            with open(segment_path, 'rb') as src:
+                if self.compress == "gzip":
+                    with gzip.open(target, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                else:
+                    with open(target, 'wb') as raw:
+                        zstandard.ZstdCompressor().copy_stream(src, raw)
+            os.remove(segment_path)
+        except FileNotFoundError:
+            # Already removed by retention; drop what was compressed of it
+            self._remove_quietly(target)
+            return
+        except Exception as e:
+            self.error = f"Compression failed: {e}"
+            self._remove_quietly(target)
+            return
+        with self._manifest_lock:
+            if entry not in self._manifest["segments"]:
+                # Retention dropped the segment while it was being compressed
+                os.remove(target)
+                return
+            entry["file"] = os.path.basename(target)
+            entry["compression"] = self.compress
+            self._write_manifest()
+
+    @staticmethod
+    def _remove_quietly(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _apply_retention(self):
+        closed = [s for s in self._manifest["segments"] if s is not self._segment_entry or s["end"]]
+        if not self.retention or len(closed) <= self.retention:
+            return
+        for segment in closed[:len(closed) - self.retention]:
+            try:
+                os.remove(os.path.join(os.path.dirname(self.manifest_path), segment["file"]))
+            except OSError:
+                pass
+            self._manifest["segments"].remove(segment)
+
+    def _write_manifest(self):
+        # Write to a temporary file and rename, so readers never see a partial manifest
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self._manifest, f, indent=4)
+        os.replace(temp_path, self.manifest_path)
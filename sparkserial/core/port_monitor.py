@@ -0,0 +1,278 @@
+"""
+Serial port enumeration off the GUI thread, with hot-plug detection.
+
+Ports are described by dicts built from pyserial's ListPortInfo:
+
+    {"device": "/dev/ttyUSB0", "name": "ttyUSB0", "description": "CP2102 ...",
+     "hwid": "USB VID:PID=10C4:EA60 SER=0001 ...", "vid": 0x10C4, "pid": 0xEA60,
+     "serial_number": "0001", "manufacturer": "Silicon Labs",
+     "product": "CP2102 ...", "location": "1-1.2:1.0"}
+
+vid, pid and serial_number are None for ports that are not on USB.
+"""
+import fnmatch
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+
+from sparkserial.core.events import Signal
+
+# Device nodes pyserial's comports() lists on Linux
+LINUX_PATTERNS = ["ttyS*", "ttyUSB*", "ttyXRUSB*", "ttyACM*", "ttyAMA*", "rfcomm*", "ttyAP*"]
+
+# inotify(7)
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_Q_OVERFLOW = 0x4000
+_EVENT = struct.Struct("iIII")
+
+
+def port_info(info):
+    """Dict for a pyserial ListPortInfo (see the module docstring)."""
+    return {
+        "device": info.device,
+        "name": info.name,
+        "description": info.description,
+        "hwid": info.hwid,
+        "vid": info.vid,
+        "pid": info.pid,
+        "serial_number": info.serial_number,
+        "manufacturer": info.manufacturer,
+        "product": info.product,
+        "location": info.location,
+    }
+
+
+def scan_ports():
+    """Enumerates every port now, sorted by device. Blocking; can take hundreds of ms."""
+    import serial.tools.list_ports  # Only needed here; slow to import
+
+    return sorted((port_info(info) for info in serial.tools.list_ports.comports()),
+                  key=lambda port: port['device'])
+
+
+def _probe_linux(device):
+    """Dict for one /dev node, or None if comports() would not list it."""
+    from serial.tools.list_ports_linux import SysFS
+
+    if not os.path.exists(device):
+        return None
+    try:
+        info = SysFS(device)
+    except OSError as e:
+        print(f"Error probing {device}: {e}")
+        return None
+    if info.subsystem == "platform":  # Non-present internal port, hidden by comports() too
+        return None
+    return port_info(info)
+
+
+def _inotify_dev():
+    """Non-blocking inotify fd watching /dev for nodes coming and going, or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+        if libc.inotify_add_watch(fd, b"/dev", mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+class PortMonitor:
+    """
+    Keeps a cached list of the available ports, maintained on a background
+    thread so the GUI never waits for enumeration.
+
+    On Linux the monitor watches /dev with inotify and only probes the
+    nodes that were created or deleted; elsewhere (or when inotify is not
+    available) it re-scans every POLL_INTERVAL seconds. Nodes are probed
+    SETTLE seconds after the last event, once udev has finished with them.
+
+    ports_changed(ports, added, removed) is emitted on the monitor thread
+    after the first scan and whenever the list changes; ports is the whole
+    sorted list, added the new (or changed) port dicts and removed the
+    ones that went away.
+    """
+
+    POLL_INTERVAL = 2.0
+    SETTLE = 0.2
+
+    def __init__(self):
+        self.ports_changed = Signal()
+        self._ports = {}  # device -> port dict
+        self._lock = threading.Lock()
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_read.setblocking(False)
+        self._wake_write.setblocking(False)
+        self._rescan = True  # The first pass is a full scan
+        self._scanned = False
+        self.ready = threading.Event()  # Set once the first scan is in ports
+        self._running = False
+        self._thread = None
+        self.incremental = False  # True once the inotify watch is set up
+
+    @property
+    def ports(self):
+        """Cached port dicts, sorted by device."""
+        with self._lock:
+            return [self._ports[device] for device in sorted(self._ports)]
+
+    def find(self, serial_number=None, vid=None, pid=None, exclude=(), prefer=None):
+        """
+        Cached port with this serial number, or else with this VID:PID, or
+        None. Devices in exclude are skipped. The VID:PID fallback only
+        applies when no serial number is given, or the port reports none.
+        Identical adapters cannot be told apart, so when several ports
+        match by VID:PID only the device prefer is returned, if it is one
+        of them, and otherwise None rather than a guess.
+        """
+        ports = [port for port in self.ports if port['device'] not in exclude]
+        if serial_number:
+            for port in ports:
+                if port['serial_number'] == serial_number:
+                    return port
+        if vid is not None:
+            matches = [port for port in ports
+                       if port['vid'] == vid and port['pid'] == pid and not (serial_number and port['serial_number'])]
+            if len(matches) == 1:
+                return matches[0]
+            for port in matches:
+                if port['device'] == prefer:
+                    return port
+        return None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="PortMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._running = False
+        self._wake()
+        self._thread.join()
+        self._thread = None
+        self._wake_read.close()
+        self._wake_write.close()
+
+    def rescan(self):
+        """Asks for a full scan, e.g. from a Refresh button. Returns immediately."""
+        self._rescan = True
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_write.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Full, so a wake-up is already pending
+
+    def _run(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_read, selectors.EVENT_READ, "wake")
+        notify = _inotify_dev()
+        if notify is not None:
+            selector.register(notify, selectors.EVENT_READ, "notify")
+            self.incremental = True
+        pending = set()  # /dev names touched since the last probe
+        try:
+            while self._running:
+                if self._rescan:
+                    self._rescan = False
+                    pending.clear()
+                    self._apply(self._full_scan(), full=True)
+                if pending:
+                    timeout = self.SETTLE
+                else:
+                    timeout = None if self.incremental else self.POLL_INTERVAL
+                events = selector.select(timeout)
+                if not events:
+                    if pending:
+                        self._apply({device: _probe_linux(device) for device in pending})
+                        pending = set()
+                    else:
+                        self._rescan = True  # Polling
+                    continue
+                for key, _mask in events:
+                    if key.data == "wake":
+                        self._drain_wake()
+                    elif self._read_notify(notify, pending):
+                        self._rescan = True  # Events were lost
+        finally:
+            selector.close()
+            if notify is not None:
+                os.close(notify)
+
+    def _full_scan(self):
+        try:
+            return {port['device']: port for port in scan_ports()}
+        except Exception as e:
+            print(f"Error listing serial ports: {e}")
+            return dict(self._ports)
+
+    def _drain_wake(self):
+        try:
+            while self._wake_read.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read_notify(self, fd, pending):
+        """Adds /dev nodes named by queued inotify events to pending; True on queue overflow."""
+        try:
+            buffer = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        overflow = False
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            _wd, mask, _cookie, length = _EVENT.unpack_from(buffer, offset)
+            offset += _EVENT.size
+            name = buffer[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+            elif any(fnmatch.fnmatchcase(name, pattern) for pattern in LINUX_PATTERNS):
+                pending.add("/dev/" + name)
+        return overflow
+
+    def _apply(self, update, full=False):
+        """
+        Merges {device: port dict, or None if gone} into the cache. A full
+        scan replaces the cache. Emits ports_changed on the first pass and
+        on any change.
+        """
+        with self._lock:
+            first = not self._scanned
+            self._scanned = True
+            old = self._ports
+            new = dict(update) if full else dict(old)
+            if not full:
+                for device, port in update.items():
+                    if port is None:
+                        new.pop(device, None)
+                    else:
+                        new[device] = port
+            new = {device: port for device, port in new.items() if port is not None}
+            added = [new[device] for device in sorted(new) if old.get(device) != new[device]]
+            removed = [old[device] for device in sorted(old) if device not in new]
+            self._ports = new
+            ports = [new[device] for device in sorted(new)]
+        self.ready.set()
+        if first or added or removed:
+            self.ports_changed.emit(ports, added, removed)
@@ -0,0 +1,209 @@
+import os
+import selectors
+import sys
+import threading
+import traceback
+from collections import deque
+
+
+class SerialReactor:
+    """
+    Serves the reads of every open port from one thread.
+
+    Ports are registered with a selectors loop (epoll on Linux) and read
+    with os.read() when the kernel reports data, so the thread sleeps in
+    select() until there is work and never polls. Other threads hand it
+    work through a command queue plus a wake-up pipe.
+
+    The reactor drives SerialWorker objects: it opens the worker's port,
+    passes every chunk to worker.handle_received() and emits the worker's
+    connection_status/error_occurred signals, exactly like the worker's own
+    run() loop does in the thread-per-port model. Queued TX is written here
+    too: the port is watched for writability while the kernel pushes back,
+    and retried on a short timeout while flow control holds it back.
+
+    An exception from one port's work (a tap or framer in
+    handle_received(), a signal callback, a write) is reported through
+    that worker's error_occurred and closes only that port, as an
+    exception in the worker's own run() loop would.
+    """
+
+    READ_SIZE = 64 * 1024
+    # How often remove() checks that the reactor thread is still alive
+    REMOVE_CHECK_INTERVAL = 0.5
+
+    @staticmethod
+    def supported():
+        # kqueue and poll do not report tty readiness reliably on macOS, and
+        # Windows has no selectable serial handles
+        return sys.platform.startswith("linux")
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+        self._commands = deque()
+        self._writing = set()  # Workers whose fd is watched for writability
+        self._retry = set()    # Workers held back by flow control
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SerialReactor", daemon=True)
+        self._thread.start()
+
+    def add(self, worker):
+        """Opens worker's port on the reactor thread; connection_status reports the outcome."""
+        self._call(self._open, worker)
+
+    def remove(self, worker):
+        """Closes worker's port and waits until the reactor no longer touches it."""
+        if threading.current_thread() is self._thread:
+            self._close(worker)  # From a callback on the reactor thread itself
+            return
+        done = threading.Event()
+        self._call(self._close, worker, done)
+        while not done.wait(self.REMOVE_CHECK_INTERVAL):
+            if not self._thread.is_alive():
+                # Nothing touches the port any more, so close it here
+                self._close(worker)
+                return
+
+    def stop(self):
+        self._running = False
+        self._call(lambda: None)
+        self._thread.join()
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    def _call(self, function, *args):
+        self._commands.append((function, args))
+        try:
+            os.write(self._wake_write, b"\0")
+        except BlockingIOError:
+            pass  # The pipe is full, so a wake-up is already pending
+
+    def _run(self):
+        while self._running:
+            timeout = None
+            if self._retry:
+                timeout = min(worker.TX_RETRY_INTERVAL for worker in self._retry)
+            for key, events in self._selector.select(timeout):
+                worker = key.data
+                if worker is None:
+                    self._run_commands()
+                    continue
+                try:
+                    if events & selectors.EVENT_READ:
+                        self._read(worker, key.fd)
+                    if events & selectors.EVENT_WRITE:
+                        self._write(worker)
+                except Exception as e:
+                    self._fail(worker, e)
+            if self._retry:
+                retry = self._retry
+                self._retry = set()
+                for worker in retry:
+                    try:
+                        self._write(worker)
+                    except Exception as e:
+                        self._fail(worker, e)
+
+    def _fail(self, worker, error):
+        """Reports an unexpected exception from one port's work and closes only that port."""
+        worker.error_occurred.emit(str(error))
+        self._close(worker)
+
+    def _run_commands(self):
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._commands:
+            function, args = self._commands.popleft()
+            try:
+                function(*args)
+            except Exception as e:
+                # Every command with arguments takes the worker first
+                if args:
+                    self._fail(args[0], e)
+                else:
+                    traceback.print_exc()
+
+    def _open(self, worker):
+        try:
+            port = worker._open_port()
+            # Reads happen only when select() says there is data
+            port.timeout = 0
+            worker.serial_port = port
+            self._selector.register(port.fileno(), selectors.EVENT_READ, worker)
+        except Exception as e:
+            worker.error_occurred.emit(str(e))
+            worker.connection_status.emit(False)
+            return
+        worker.wake_io = lambda: self._call(self._write, worker)
+        worker.running = True
+        worker.connection_status.emit(True)
+
+    def _read(self, worker, fd):
+        try:
+            data = os.read(fd, self.READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            worker.error_occurred.emit(str(e))
+            self._close(worker)
+            return
+        if not data:
+            # Readable but empty: the device went away
+            worker.error_occurred.emit("Device disconnected")
+            self._close(worker)
+            return
+        worker.handle_received(data)
+
+    def _write(self, worker):
+        if not worker.running:
+            return
+        fd = worker.serial_port.fileno()
+        try:
+            state = worker.write_pending(lambda data: self._write_fd(fd, data))
+        except OSError as e:
+            worker.error_occurred.emit(str(e))
+            self._close(worker)
+            return
+        if state == "flow":
+            self._retry.add(worker)
+        if state == "blocked" and worker not in self._writing:
+            self._writing.add(worker)
+            self._selector.modify(fd, selectors.EVENT_READ | selectors.EVENT_WRITE, worker)
+        elif state != "blocked" and worker in self._writing:
+            self._writing.discard(worker)
+            self._selector.modify(fd, selectors.EVENT_READ, worker)
+
+    @staticmethod
+    def _write_fd(fd, data):
+        try:
+            return os.write(fd, data)
+        except BlockingIOError:
+            return 0
+
+    def _close(self, worker, done=None):
+        port = worker.serial_port
+        self._writing.discard(worker)
+        self._retry.discard(worker)
+        try:
+            if worker.running and port:
+                worker.running = False
+                try:
+                    self._selector.unregister(port.fileno())
+                except (KeyError, ValueError):
+                    pass
+                try:
+                    port.close()
+                except Exception:
+                    pass
+                worker.connection_status.emit(False)
+        finally:
+            if done:
+                done.set()
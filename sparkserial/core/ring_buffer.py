@@ -0,0 +1,107 @@
+from collections import deque
+
+
+class RingBuffer:
+    """
+    Preallocated single-producer/single-consumer byte ring buffer.
+
+    The serial thread writes and the GUI thread drains. Each side only
+    advances its own counter, and the writer publishes new bytes by bumping
+    its counter after the copy, so no lock is needed.
+
+    Writes can carry the monotonic ns time the bytes were read at;
+    read_chunks() then hands them back as (timestamp_ns, bytes) pieces.
+    To keep this cheap at one read per byte, a new timestamp is only
+    recorded where it can matter for display: when the chunk starts or
+    contains a line, or MARK_INTERVAL_NS after the previous one. Every line
+    therefore keeps the arrival time of its first byte.
+    """
+
+    MARK_INTERVAL_NS = 1_000_000
+
+    def __init__(self, capacity=4 * 1024 * 1024):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._written = 0  # Total bytes ever written (producer side)
+        self._read = 0     # Total bytes ever read (consumer side)
+        self.overflow_bytes = 0
+        # (stream offset, timestamp_ns) where each timed chunk starts
+        self._marks = deque()
+        self._mark_time = None  # Producer: time of the latest mark
+        self._line_open = False  # Producer: last write did not end a line
+        self._read_time = None  # Consumer: time of the bytes at the read position
+
+    def __len__(self):
+        return self._written - self._read
+
+    def write(self, data, timestamp_ns=None):
+        """
+        Appends as much of data as fits. Bytes that do not fit are counted
+        in overflow_bytes. Returns the number of bytes stored.
+        """
+        size = len(data)
+        free = self.capacity - (self._written - self._read)
+        if size > free:
+            self.overflow_bytes += size - free
+            size = free
+        if size == 0:
+            return 0
+
+        if timestamp_ns is not None:
+            # Published before the bytes, so a reader never sees bytes without their mark
+            if (not self._line_open or self._mark_time is None or b'\n' in data
+                    or timestamp_ns - self._mark_time >= self.MARK_INTERVAL_NS):
+                self._marks.append((self._written, timestamp_ns))
+                self._mark_time = timestamp_ns
+            self._line_open = data[size - 1] != 0x0A
+
+        src = memoryview(data)
+        start = self._written % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = src[:first]
+        if first < size:
+            self._view[:size - first] = src[first:size]
+        self._written += size
+        return size
+
+    def read(self, max_bytes=None):
+        """Removes and returns up to max_bytes (default: everything buffered)."""
+        size = self._written - self._read
+        if max_bytes is not None:
+            size = min(size, max_bytes)
+        if size == 0:
+            return b''
+
+        start = self._read % self.capacity
+        first = min(size, self.capacity - start)
+        data = bytes(self._view[start:start + first])
+        if first < size:
+            data += self._view[:size - first]
+        self._read += size
+        return data
+
+    def read_chunks(self):
+        """
+        Removes everything buffered and returns it as a list of
+        (timestamp_ns, bytes), split where write() recorded a new time.
+        Bytes written without a timestamp inherit the previous one (None
+        before the first).
+        """
+        data = self.read()
+        if not data:
+            return []
+        base = self._read - len(data)  # Stream offset of data[0]
+        position = 0
+        current = self._read_time
+        chunks = []
+        marks = self._marks
+        while marks and marks[0][0] < self._read:
+            offset, timestamp_ns = marks.popleft()
+            if offset - base > position:
+                chunks.append((current, data[position:offset - base]))
+                position = offset - base
+            current = timestamp_ns
+        chunks.append((current, data[position:]))
+        self._read_time = current
+        return chunks
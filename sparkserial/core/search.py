@@ -0,0 +1,136 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+SEARCH_MODES = ["Text", "Regex", "Hex"]
+
+
+def compile_pattern(text, mode="Text", ignore_case=False):
+    """
+    Compiles a search box entry into a bytes regex. Text is matched
+    literally, Regex as a Python regular expression over the UTF-8 bytes, and
+    Hex as a byte sequence such as "0D 0A" or "0d0a". Raises ValueError for
+    input that cannot be compiled.
+    """
+    if mode == "Hex":
+        try:
+            pattern = re.escape(bytes.fromhex(text.replace(" ", "")))
+        except ValueError:
+            raise ValueError("Hex search expects pairs of hex digits, e.g. 0D 0A")
+    elif mode == "Regex":
+        pattern = text.encode('utf-8')
+    else:
+        pattern = re.escape(text.encode('utf-8'))
+    if not pattern:
+        raise ValueError("Empty search")
+    try:
+        return re.compile(pattern, re.IGNORECASE if ignore_case and mode != "Hex" else 0)
+    except re.error as e:
+        raise ValueError(f"Invalid regex: {e}")
+
+
+class SessionSearch:
+    """
+    Finds every match of a pattern in a LineStore on a background thread.
+
+    The store is scanned in BLOCK_BYTES blocks from its first held byte and
+    the thread then keeps following its end: call notify() after appending
+    so new data is searched straight away. Only bytes not scanned before
+    are searched, apart from an OVERLAP_BYTES tail that lets a match
+    complete once the rest of it arrives; matches longer than that across a
+    block or chunk boundary can be missed.
+
+    Match start/end offsets are absolute, so they stay valid as the store
+    is trimmed. At most MAX_MATCHES are kept; count keeps counting.
+    """
+
+    BLOCK_BYTES = 4 * 1024 * 1024
+    OVERLAP_BYTES = 4096
+    MAX_MATCHES = 1_000_000
+
+    def __init__(self, store, pattern):
+        self.store = store
+        self.pattern = pattern
+        self.count = 0
+        # Matches starting before scanned_offset are final; searched_end is
+        # where the last scanned block ended
+        self.scanned_offset = store.base_offset
+        self.searched_end = store.base_offset
+        self._starts = array('Q')
+        self._ends = array('Q')
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="SessionSearch", daemon=True)
+        self._thread.start()
+
+    @property
+    def caught_up(self):
+        return self.searched_end >= self.store.end_offset
+
+    def notify(self):
+        """Tells the search that the store has grown."""
+        self._wake.set()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self):
+        while self._running:
+            end = self.store.end_offset
+            if end <= self.searched_end:
+                self._wake.wait(1.0)
+                self._wake.clear()
+                continue
+            start = max(self.scanned_offset, self.store.base_offset)
+
+            block_end = min(end, start + self.BLOCK_BYTES)
+            block = self.store.slice(start, block_end)
+            last_end = start
+            for match in self.pattern.finditer(block):
+                if match.end() == match.start():
+                    continue  # Empty matches, e.g. from "x*"
+                if len(self._starts) < self.MAX_MATCHES:
+                    # Append ends first; readers use the shorter of the two
+                    self._ends.append(start + match.end())
+                    self._starts.append(start + match.start())
+                self.count += 1
+                last_end = start + match.end()
+
+            # Re-scan the tail next time so matches cut off at block_end complete
+            self.scanned_offset = max(last_end, block_end - self.OVERLAP_BYTES, start)
+            self.searched_end = block_end
+
+    def _match(self, index):
+        return self._starts[index], self._ends[index]
+
+    def next_match(self, offset):
+        """First match starting after offset, wrapping around to the first one."""
+        held = min(len(self._starts), len(self._ends))
+        if not held:
+            return None
+        index = bisect_right(self._starts, offset, 0, held)
+        if index == held or self._starts[index] < self.store.base_offset:
+            index = bisect_left(self._starts, self.store.base_offset, 0, held)
+            if index == held:
+                return None
+        return self._match(index)
+
+    def prev_match(self, offset):
+        """Last match starting before offset, wrapping around to the last one."""
+        held = min(len(self._starts), len(self._ends))
+        if not held:
+            return None
+        index = bisect_left(self._starts, offset, 0, held) - 1
+        if index < 0 or self._starts[index] < self.store.base_offset:
+            index = held - 1
+            if self._starts[index] < self.store.base_offset:
+                return None
+        return self._match(index)
+
+    def match_number(self, start):
+        """1-based position of the match starting at start among the matches still held."""
+        held = min(len(self._starts), len(self._ends))
+        return bisect_left(self._starts, start, 0, held) - bisect_left(self._starts, self.store.base_offset, 0, held) + 1
@@ -0,0 +1,249 @@
+"""
+Runs scripted sequences of commands against a connected port.
+
+A sequence is a list of step dicts, saved as JSON like the command
+shortcuts:
+
+    {"name": "Version", "command": "AT+VER", "is_hex": false,
+     "delay_ms": 0, "expect": "OK", "expect_mode": "Text",
+     "timeout_ms": 1000, "repeat": 1}
+
+Each step is sent repeat times. Before each send the runner waits
+delay_ms; it then waits up to timeout_ms for the received data to match
+expect (Text, Regex or Hex, see core.search). A step without expect passes
+once it has been written.
+"""
+import json
+import threading
+
+from sparkserial.core.capture_file import RX
+from sparkserial.core.events import Signal
+from sparkserial.core.search import SEARCH_MODES, compile_pattern
+from sparkserial.core.stats import command_label
+
+STEP_DEFAULTS = {
+    "name": "",
+    "command": "",
+    "is_hex": False,
+    "delay_ms": 0,
+    "expect": "",
+    "expect_mode": "Text",
+    "timeout_ms": 1000,
+    "repeat": 1,
+}
+
+
+def make_step(**fields):
+    """Returns a step dict with every field present."""
+    step = dict(STEP_DEFAULTS)
+    step.update(fields)
+    return step
+
+
+def _check_step(index, step):
+    """Raises ValueError unless step is a dict of known, correctly typed fields."""
+    if not isinstance(step, dict):
+        raise ValueError(f"Step {index + 1}: expected an object, got {type(step).__name__}")
+    for key, value in step.items():
+        if key not in STEP_DEFAULTS:
+            raise ValueError(f"Step {index + 1}: unknown field '{key}'")
+        default = STEP_DEFAULTS[key]
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif key == "repeat":
+            valid = isinstance(value, int) and not isinstance(value, bool) and value >= 0
+        elif isinstance(default, int):
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+        else:
+            valid = isinstance(value, str)
+        if not valid:
+            raise ValueError(f"Step {index + 1}: invalid {key}: {value!r}")
+    if step.get("expect_mode", "Text") not in SEARCH_MODES:
+        raise ValueError(f"Step {index + 1}: expect_mode must be one of {', '.join(SEARCH_MODES)}")
+
+
+def load_sequence(path):
+    """Reads a sequence file. Raises ValueError if it is not a valid sequence."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    steps = data.get('steps', []) if isinstance(data, dict) else data
+    if not isinstance(steps, list):
+        raise ValueError("Expected a list of steps")
+    for index, step in enumerate(steps):
+        _check_step(index, step)
+    return [make_step(**step) for step in steps]
+
+
+def save_sequence(path, steps):
+    with open(path, 'w') as f:
+        json.dump({"steps": steps}, f, indent=4)
+
+
+class _StepLabel(str):
+    """
+    Label of one send by the runner. It is logged and counted like the
+    command itself, but each send gets its own object, so data_sent can
+    tell the step's write apart from manual sends and earlier steps.
+    """
+
+
+class SequenceRunner:
+    """
+    Runs steps against a SerialWorker on a background thread.
+
+    A step counts as sent when the worker's data_sent reports its own
+    write. Responses are matched by a raw tap on the worker, i.e. on its
+    I/O thread as the bytes are read, and latency is measured between the
+    I/O timestamps of the last byte written and of the read that completed
+    the match, so neither the GUI nor this thread's wake-up time is
+    included.
+
+    Each result is a dict with step (index), name, iteration, passed,
+    latency_ms (None without expect or on failure), response (the matched
+    bytes, or what arrived before the timeout) and error. step_finished
+    (result) and finished(results) are emitted on the runner's thread.
+    """
+
+    # Received bytes kept per step while waiting for a match. Each chunk is
+    # searched together with the last MATCH_OVERLAP_BYTES before it, so a
+    # longer match split across chunks can be missed.
+    MAX_RESPONSE_BYTES = 64 * 1024
+    MATCH_OVERLAP_BYTES = 4096
+
+    def __init__(self, worker, steps, line_end=b'\r\n'):
+        """Raises ValueError for a step whose command or expect cannot be parsed."""
+        self.step_finished = Signal()
+        self.finished = Signal()
+        self.worker = worker
+        self.steps = [make_step(**step) for step in steps]
+        self.results = []
+        self._prepared = []
+        for index, step in enumerate(self.steps):
+            try:
+                # line_end is added to hex commands too, as when sending by hand
+                if step['is_hex']:
+                    data = bytes.fromhex(step['command'].replace(" ", "")) + line_end
+                else:
+                    data = step['command'].encode('utf-8') + line_end
+                pattern = compile_pattern(step['expect'], step['expect_mode']) if step['expect'] else None
+            except ValueError as e:
+                raise ValueError(f"Step {index + 1}: {e}")
+            self._prepared.append((data, pattern, command_label(step['command'], step['is_hex'])))
+
+        # Armed state shared with the tap, guarded by _lock
+        self._lock = threading.Lock()
+        self._armed = False
+        self._pattern = None
+        self._label = None
+        self._sent_ns = None
+        self._matched_ns = None
+        self._response = bytearray()
+        self._done = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.worker.set_tap(self, self._tap)
+        self.worker.data_sent.connect(self._sent)
+        self._thread = threading.Thread(target=self._run, name="SequenceRunner", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops after the current step and waits for the thread to end."""
+        self._stopping.set()
+        self._done.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            for index, step in enumerate(self.steps):
+                data, pattern, label = self._prepared[index]
+                for iteration in range(max(1, step['repeat'])):
+                    if self._stopping.wait(step['delay_ms'] / 1000):
+                        return
+                    if not self.worker.running:
+                        self._finish_step(index, iteration, False, error="Not connected")
+                        return
+                    self._run_step(index, iteration, data, pattern, label, step['timeout_ms'] / 1000)
+                    if self._stopping.is_set():
+                        return
+        finally:
+            self.worker.set_tap(self, None)
+            self.worker.data_sent.disconnect(self._sent)
+            self.finished.emit(self.results)
+
+    def _run_step(self, index, iteration, data, pattern, label, timeout):
+        label = _StepLabel(label)
+        with self._lock:
+            self._pattern = pattern
+            self._label = label
+            self._sent_ns = None
+            self._matched_ns = None
+            self._response = bytearray()
+            self._done.clear()
+            self._armed = True
+        # Labelled like a command sent by hand, so it is logged and counted in the latency stats
+        self.worker.send_data(data, label)
+        self._done.wait(timeout)
+        with self._lock:
+            self._armed = False
+            response = bytes(self._response)
+            sent_ns, matched_ns = self._sent_ns, self._matched_ns
+
+        if matched_ns is not None:
+            self._finish_step(index, iteration, True, (matched_ns - sent_ns) / 1e6, response)
+        elif pattern is None and sent_ns is not None:
+            self._finish_step(index, iteration, True)
+        elif self._stopping.is_set():
+            self._finish_step(index, iteration, False, response=response, error="Stopped")
+        elif pattern is None:
+            self._finish_step(index, iteration, False, error="Not sent within timeout")
+        else:
+            self._finish_step(index, iteration, False, response=response, error="Timeout")
+
+    def _finish_step(self, index, iteration, passed, latency_ms=None, response=b'', error=""):
+        result = {
+            "step": index,
+            "name": self.steps[index]['name'],
+            "iteration": iteration,
+            "passed": passed,
+            "latency_ms": latency_ms,
+            "response": response,
+            "error": error,
+        }
+        self.results.append(result)
+        self.step_finished.emit(result)
+
+    def _sent(self, data, timestamp_ns, label):
+        # data_sent handler, run on the worker's I/O thread
+        with self._lock:
+            if not self._armed or label is not self._label:
+                return
+            self._sent_ns = timestamp_ns
+            if self._pattern is None:
+                self._armed = False
+                self._done.set()
+
+    def _tap(self, timestamp_ns, direction, data):
+        # Runs on the worker's I/O thread
+        with self._lock:
+            if not self._armed:
+                return
+            if direction == RX and self._pattern is not None and self._sent_ns is not None:
+                start = max(0, len(self._response) - self.MATCH_OVERLAP_BYTES)
+                self._response += data
+                excess = len(self._response) - self.MAX_RESPONSE_BYTES
+                if excess > 0:
+                    del self._response[:excess]
+                    start = max(0, start - excess)
+                match = self._pattern.search(self._response, start)
+                if match:
+                    self._response = bytearray(match.group())
+                    self._matched_ns = timestamp_ns
+                    self._armed = False
+                    self._done.set()
@@ -1,15 +1,40 @@
-import serial
-import serial.tools.list_ports
-from PyQt6.QtCore import QThread, pyqtSignal, QObject
+import threading
 import time
+from collections import deque
+import serial
+from sparkserial.core.events import Signal
+from sparkserial.core.port_monitor import scan_ports
+from sparkserial.core.ring_buffer import RingBuffer
+from sparkserial.core.capture_file import RX, TX
+from sparkserial.core.reactor import SerialReactor
+from sparkserial.core.stats import LinkStats
+
+class SerialWorker:
+    """
+    One open port. Signals (see core.events) are emitted on the I/O thread:
+    error_occurred(message), connection_status(connected) and
+    data_sent(data, timestamp_ns, label) for each send_data() call once it
+    is written.
+    """
 
-class SerialWorker(QObject):
-    data_received = pyqtSignal(bytes)
-    error_occurred = pyqtSignal(str)
-    connection_status = pyqtSignal(bool)
+    # Upper bound on how long a blocking read waits before re-checking
+    # self.running. stop() cancels a pending read, so this only matters on
+    # backends without cancel_read().
+    READ_TIMEOUT = 0.5
+    # Decoded frames waiting for the GUI beyond this are dropped and counted
+    MAX_QUEUED_FRAMES = 100_000
+    # send_data() only queues. The I/O thread coalesces queued writes into
+    # batches of up to TX_BATCH_BYTES and holds back while the driver already
+    # has TX_HIGH_WATER bytes waiting to go out or CTS is low, retrying every
+    # TX_RETRY_INTERVAL seconds.
+    TX_BATCH_BYTES = 4096
+    TX_HIGH_WATER = 4096
+    TX_RETRY_INTERVAL = 0.002
 
     def __init__(self, port_name, baudrate, bytesize, parity, stopbits, flowcontrol):
-        super().__init__()
+        self.error_occurred = Signal()
+        self.connection_status = Signal()
+        self.data_sent = Signal()
         self.port_name = port_name
         self.baudrate = baudrate
         self.bytesize = bytesize
@@ -18,29 +43,79 @@ class SerialWorker(QObject):
         self.flowcontrol = flowcontrol
         self.serial_port = None
         self.running = False
+        self.opened = False  # Set by SerialManager once the port has been open
+        # Received bytes are queued here and drained by the GUI on its own
+        # tick instead of one cross-thread signal per read.
+        self.rx_buffer = RingBuffer()
+        # Raw taps: callables tap(timestamp_ns, direction, data) invoked with
+        # every chunk read or written, stamped with time.monotonic_ns() at
+        # the moment of the I/O. RX taps run on the serial thread, so they
+        # must only enqueue. Installed with set_tap(); taps is the snapshot
+        # the I/O thread iterates.
+        self.taps = ()
+        self._taps_by_key = {}
+        self._taps_lock = threading.Lock()
+        # Optional framer (see core.framing) run on this thread. Completed
+        # frames are queued as (timestamp_ns, frame) for the GUI to drain;
+        # deque appends and pops are atomic, so no lock is needed.
+        self.framer = None
+        self.frames = deque()
+        self.dropped_frames = 0
+        # Per-connection stats; each is only advanced by one thread
+        self.rx_bytes = 0
+        self.tx_bytes = 0
+        self.stats = LinkStats()
+        # Writes waiting for the I/O thread as (data, label). tx_enqueued is
+        # advanced by the sending thread, tx_bytes by the I/O thread.
+        self.tx_queue = deque()
+        self.tx_enqueued = 0
+        self._tx_batch = []  # The writes coalesced into _tx_out
+        self._tx_out = b''   # What is left of the batch being written
+        # Called after queueing a write to get the I/O thread to drain it.
+        # The reactor replaces it; on this worker's own thread it interrupts
+        # the blocking read.
+        self.wake_io = self._cancel_read
+
+    def _open_port(self):
+        return serial.Serial(
+            port=self.port_name,
+            baudrate=self.baudrate,
+            bytesize=self.bytesize,
+            parity=self.parity,
+            stopbits=self.stopbits,
+            xonxoff=self.flowcontrol == "XON/XOFF",
+            rtscts=self.flowcontrol == "RTS/CTS",
+            dsrdtr=False,
+            timeout=self.READ_TIMEOUT
+        )
 
     def run(self):
         try:
-            self.serial_port = serial.Serial(
-                port=self.port_name,
-                baudrate=self.baudrate,
-                bytesize=self.bytesize,
-                parity=self.parity,
-                stopbits=self.stopbits,
-                xonxoff=False,
-                rtscts=self.flowcontrol == "Hardware (RTS/CTS)",
-                dsrdtr=False,
-                timeout=0.1
-            )
+            self.serial_port = self._open_port()
             self.running = True
             self.connection_status.emit(True)
 
             while self.running:
-                if self.serial_port.in_waiting > 0:
-                    data = self.serial_port.read(self.serial_port.in_waiting)
-                    if data:
-                        self.data_received.emit(data)
-                time.sleep(0.01)
+                if self.tx_queue or self._tx_out:
+                    self.write_pending(self.serial_port.write)
+                if self.tx_queue or self._tx_out:
+                    # Held back by flow control: poll RX until TX can go on
+                    waiting = self.serial_port.in_waiting
+                    if not waiting:
+                        time.sleep(self.TX_RETRY_INTERVAL)
+                        continue
+                    data = self.serial_port.read(waiting)
+                else:
+                    # Block until at least one byte arrives (or wake_io()),
+                    # then pick up whatever else the driver has already
+                    # buffered in the same chunk.
+                    data = self.serial_port.read(1)
+                    if not data:
+                        continue
+                    waiting = self.serial_port.in_waiting
+                    if waiting:
+                        data += self.serial_port.read(waiting)
+                self.handle_received(data)
 
         except Exception as e:
             self.error_occurred.emit(str(e))
@@ -49,31 +124,210 @@ class SerialWorker(QObject):
                 self.serial_port.close()
             self.connection_status.emit(False)
 
+    def handle_received(self, data):
+        """
+        Processes a chunk that was just read. Called on whichever thread does
+        the I/O: this worker's own thread, or the shared SerialReactor.
+        """
+        timestamp_ns = time.monotonic_ns()
+        self.rx_bytes += len(data)
+        self.stats.received(timestamp_ns, len(data))
+        self.rx_buffer.write(data, timestamp_ns)
+        for tap in self.taps:
+            tap(timestamp_ns, RX, data)
+        framer = self.framer
+        if framer:
+            self._queue_frames(timestamp_ns, framer.feed(data))
+
+    def _queue_frames(self, timestamp_ns, frames):
+        for frame in frames:
+            if len(self.frames) >= self.MAX_QUEUED_FRAMES:
+                self.dropped_frames += 1
+            else:
+                self.frames.append((timestamp_ns, frame))
+
+    def set_tap(self, key, tap):
+        """
+        Installs tap under key (e.g. "capture"), replacing any tap already
+        there; None removes it. Can be called from any thread.
+        """
+        with self._taps_lock:
+            if tap is None:
+                self._taps_by_key.pop(key, None)
+            else:
+                self._taps_by_key[key] = tap
+            self.taps = tuple(self._taps_by_key.values())
+
     def stop(self):
         self.running = False
+        self._cancel_read()
 
-    def send_data(self, data):
-        if self.serial_port and self.serial_port.is_open:
+    def _cancel_read(self):
+        # Wake up a read() that is blocked waiting for data
+        if self.serial_port and self.serial_port.is_open and hasattr(self.serial_port, 'cancel_read'):
             try:
-                self.serial_port.write(data)
-            except Exception as e:
-                self.error_occurred.emit(str(e))
+                self.serial_port.cancel_read()
+            except Exception:
+                pass
+
+    @property
+    def tx_queue_bytes(self):
+        """Bytes queued by send_data() that have not been written yet."""
+        return self.tx_enqueued - self.tx_bytes
+
+    def send_data(self, data, label=None):
+        """
+        Queues data for the I/O thread and returns at once. data_sent is
+        emitted with label once the data has been written to the port.
+        """
+        if not self.running:
+            return
+        self.tx_enqueued += len(data)
+        self.tx_queue.append((bytes(data), label))
+        self.wake_io()
+
+    def write_pending(self, write):
+        """
+        Writes queued data on the I/O thread with write(data), which returns
+        the number of bytes taken. Returns None once everything is written,
+        "flow" when the port pushes back, or "blocked" when write() took
+        nothing.
+        """
+        while self._tx_out or self.tx_queue:
+            if not self._tx_out:
+                batch = [self.tx_queue.popleft()]
+                size = len(batch[0][0])
+                while self.tx_queue and size + len(self.tx_queue[0][0]) <= self.TX_BATCH_BYTES:
+                    batch.append(self.tx_queue.popleft())
+                    size += len(batch[-1][0])
+                self._tx_batch = batch
+                self._tx_out = memoryview(b''.join(data for data, _label in batch))
+            if not self._tx_ready():
+                return "flow"
+            written = write(self._tx_out[:self.TX_BATCH_BYTES])
+            if not written:
+                return "blocked"
+            timestamp_ns = time.monotonic_ns()
+            sent = bytes(self._tx_out[:written])
+            self._tx_out = self._tx_out[written:]
+            self.tx_bytes += written
+            for tap in self.taps:
+                tap(timestamp_ns, TX, sent)
+            if not self._tx_out:
+                for data, label in self._tx_batch:
+                    if label is not None:
+                        self.stats.sent(label, timestamp_ns)
+                    self.data_sent.emit(data, timestamp_ns, label)
+                self._tx_batch = []
+        return None
+
+    def _tx_ready(self):
+        port = self.serial_port
+        try:
+            if port.rtscts and not port.cts:
+                return False
+            return port.out_waiting < self.TX_HIGH_WATER
+        except Exception:
+            return True  # The driver cannot report it, e.g. on a pty
+
+class SerialManager:
+    """
+    Manages any number of concurrent connections, keyed by name (the port
+    name unless given). Each connection runs its own SerialWorker.
+
+    backend selects who reads the ports: "reactor" serves all of them from
+    one SerialReactor thread, "threads" gives each worker its own thread.
+    "auto" picks the reactor where it is supported (Linux).
+
+    A connection that closes by itself (error, device gone) is dropped from
+    connections on its I/O thread; connect and disconnect may be called
+    from any thread.
+
+    A connection made with reconnect=True is reopened instead, on a
+    background thread with exponential backoff, until it succeeds or
+    disconnect() is called. With a port_monitor (core.port_monitor) the
+    device is found again by USB serial number, or VID:PID, so it may come
+    back under another path, and an attempt is made as soon as it
+    reappears. A port another connection has open is never picked, nor one
+    of several identical adapters that only VID:PID could tell apart. The
+    new worker takes over the old one's RX buffer, counters and stats, so
+    nothing received before the drop is lost. Signals: reconnecting(name,
+    attempt) before each wait, reconnected(name, worker, gap_seconds) once
+    the port is open again.
+    """
+
+    BACKENDS = ["auto", "reactor", "threads"]
+    # Reconnect backoff: first wait, growth factor and longest wait, in seconds
+    RECONNECT_DELAY = 0.1
+    RECONNECT_BACKOFF = 2
+    RECONNECT_MAX_DELAY = 5.0
 
-class SerialManager(QObject):
-    def __init__(self):
-        super().__init__()
-        self.worker = None
-        self.thread = None
+    def __init__(self, backend="auto", port_monitor=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == "auto":
+            backend = "reactor" if SerialReactor.supported() else "threads"
+        self.backend = backend
+        self.reactor = None  # Started with the first connection
+        # name -> (worker, thread); thread is None on the reactor backend
+        self.connections = {}
+        self._lock = threading.Lock()
+        self.reconnecting = Signal()
+        self.reconnected = Signal()
+        # name -> reconnect policy dict (settings, setup, identity, wake)
+        # for connections made with reconnect=True
+        self._policies = {}
+        self.port_monitor = port_monitor
+        if port_monitor:
+            port_monitor.ports_changed.connect(self._ports_changed)
 
     def get_available_ports(self):
-        return [port.device for port in serial.tools.list_ports.comports()]
+        """Device names of the ports present now. Blocking; the GUI uses a PortMonitor instead."""
+        return [port['device'] for port in scan_ports()]
 
-    def connect(self, settings):
-        if self.thread and self.thread.isRunning():
-            return
+    @property
+    def workers(self):
+        with self._lock:
+            return {name: worker for name, (worker, _thread) in self.connections.items()}
+
+    def is_connected(self, name):
+        return name in self.connections
+
+    def is_reconnecting(self, name):
+        """True from a drop until the connection is reopened or disconnected."""
+        policy = self._policies.get(name)
+        return bool(policy and policy['dropped'])
 
-        self.thread = QThread()
-        self.worker = SerialWorker(
+    def connect(self, settings, name=None, setup=None, reconnect=False):
+        """
+        Opens a connection and returns its worker, or None if name is
+        already connected. setup(worker) is called before the port is
+        opened, to connect to its signals and set taps without missing any;
+        with reconnect it is called again, from the reconnect thread and
+        without the manager's lock held, for every new worker. An exception
+        from it there fails that attempt and is reported through the
+        dropped worker's error_occurred.
+        """
+        name = name or settings['port']
+        if reconnect:
+            policy = {'settings': dict(settings), 'setup': setup, 'identity': self._identity(settings['port']),
+                      'wake': threading.Event(), 'dropped': False}
+        else:
+            policy = None
+        worker = self._new_worker(settings, name, setup)
+        with self._lock:
+            if name in self.connections:
+                return None
+            if policy:
+                self._policies[name] = policy
+            else:
+                self._policies.pop(name, None)
+            thread = self._register(worker)
+        self._start(worker, thread)
+        return worker
+
+    def _new_worker(self, settings, name, setup, previous=None):
+        worker = SerialWorker(
             settings['port'],
             settings['baudrate'],
             settings['bytesize'],
@@ -81,21 +335,154 @@ class SerialManager(QObject):
             settings['stopbits'],
             settings['flowcontrol']
         )
-        self.worker.moveToThread(self.thread)
-        
-        self.thread.started.connect(self.worker.run)
-        self.worker.connection_status.connect(self._handle_status)
-        
-        self.thread.start()
-        return self.worker
-
-    def disconnect(self):
-        if self.worker:
-            self.worker.stop()
-        if self.thread:
-            self.thread.quit()
-            self.thread.wait()
-
-    def _handle_status(self, status):
-        if not status:
-            self.disconnect()
+        worker.name = name
+        if previous:
+            # Continue where the dropped worker left off. Its unsent TX is dropped.
+            worker.rx_buffer = previous.rx_buffer
+            worker.stats = previous.stats
+            worker.rx_bytes = previous.rx_bytes
+            worker.tx_bytes = worker.tx_enqueued = previous.tx_bytes
+        worker.connection_status.connect(lambda status, worker=worker: self._handle_status(worker, status))
+        if setup:
+            setup(worker)
+        return worker
+
+    def _register(self, worker):
+        # Called with _lock held
+        if self.backend == "reactor":
+            if self.reactor is None:
+                self.reactor = SerialReactor()
+            thread = None
+        else:
+            thread = threading.Thread(target=worker.run, name=f"SerialWorker {worker.name}", daemon=True)
+        self.connections[worker.name] = (worker, thread)
+        return thread
+
+    def _start(self, worker, thread):
+        if thread is None:
+            self.reactor.add(worker)
+        else:
+            thread.start()
+
+    def disconnect(self, name=None):
+        """Closes the named connection, or every connection if name is None. Stops reconnecting too."""
+        with self._lock:
+            names = set(self.connections) | set(self._policies) if name is None else {name}
+            closing = [self.connections.pop(name) for name in names if name in self.connections]
+            for name in names:
+                policy = self._policies.pop(name, None)
+                if policy:
+                    policy['wake'].set()
+        for worker, thread in closing:
+            if thread is None:
+                self.reactor.remove(worker)
+                continue
+            worker.stop()
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def close(self):
+        """Disconnects everything and stops the reactor thread."""
+        self.disconnect()
+        if self.reactor:
+            self.reactor.stop()
+            self.reactor = None
+
+    def _handle_status(self, worker, status):
+        # The worker has already closed its port; only forget it, unless the
+        # name has been reconnected by a new worker meanwhile
+        if status:
+            worker.opened = True
+            return
+        with self._lock:
+            if self.connections.get(worker.name, (None,))[0] is not worker:
+                return
+            del self.connections[worker.name]
+            policy = self._policies.get(worker.name)
+            # Only a port that was open is reopened; a failed open is reported as is
+            reopen = policy is not None and worker.opened
+            if reopen:
+                policy['dropped'] = True
+        if reopen:
+            threading.Thread(target=self._reconnect, args=(worker, policy, time.monotonic()),
+                             name=f"Reconnect {worker.name}", daemon=True).start()
+
+    def _identity(self, device):
+        """(serial_number, vid, pid) of device as the port monitor lists it, or None."""
+        if not self.port_monitor:
+            return None
+        for port in self.port_monitor.ports:
+            if port['device'] == device and port['vid'] is not None:
+                return port['serial_number'], port['vid'], port['pid']
+        return None
+
+    def _ports_in_use(self):
+        # Called with _lock held
+        return {worker.port_name for worker, _thread in self.connections.values()}
+
+    def _locate(self, policy):
+        """
+        Path to reopen: where the same adapter is now, or the original path.
+        Ports other connections have open are never picked.
+        """
+        identity = policy['identity']
+        if identity and self.port_monitor:
+            with self._lock:
+                in_use = self._ports_in_use()
+            port = self.port_monitor.find(*identity, exclude=in_use, prefer=policy['settings']['port'])
+            return port['device'] if port else None
+        return policy['settings']['port']
+
+    def _ports_changed(self, ports, added, removed):
+        if added:
+            with self._lock:
+                for policy in self._policies.values():
+                    policy['wake'].set()
+
+    def _reconnect(self, previous, policy, dropped_at):
+        name = previous.name
+        delay = self.RECONNECT_DELAY
+        attempt = 0
+        while self._policies.get(name) is policy:
+            self.reconnecting.emit(name, attempt)
+            policy['wake'].wait(delay)
+            policy['wake'].clear()
+            delay = min(delay * self.RECONNECT_BACKOFF, self.RECONNECT_MAX_DELAY)
+            attempt += 1
+            device = self._locate(policy)
+            if device is None:
+                continue  # Not plugged back in yet
+
+            opened = threading.Event()
+            outcome = []
+
+            def setup(worker):
+                worker.connection_status.connect(lambda status: (outcome.append(status), opened.set()))
+                if policy['setup']:
+                    policy['setup'](worker)
+
+            settings = dict(policy['settings'], port=device)
+            try:
+                # setup is the caller's code, so it runs without the lock held
+                worker = self._new_worker(settings, name, setup, previous)
+            except Exception as e:
+                # A failed attempt; the dropped worker's error signal still reaches the caller
+                previous.error_occurred.emit(f"Reconnect failed: {e}")
+                continue
+            with self._lock:
+                # Holding the lock keeps disconnect() from slipping in
+                # between the check and registering the new worker
+                if self._policies.get(name) is not policy:
+                    return
+                if device in self._ports_in_use():
+                    continue  # Opened by another connection meanwhile
+                thread = self._register(worker)
+            self._start(worker, thread)
+            opened.wait()
+            if outcome[0]:
+                policy['dropped'] = False
+                gap = time.monotonic() - dropped_at
+                worker.stats.reconnect_time.add(gap * 1e6)
+                self.reconnected.emit(name, worker, gap)
+                return
+            previous = worker
@@ -0,0 +1,134 @@
+"""
+Constant-memory link statistics.
+
+Histograms are log2-bucketed with SUB_BUCKETS linear steps per power of
+two, so any non-negative integer up to 2**64 fits in a fixed array of
+counters and percentiles are accurate to within 1/SUB_BUCKETS (12.5%).
+Values below 2 * SUB_BUCKETS are counted exactly.
+"""
+import time
+from array import array
+
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+
+
+def _bucket(value):
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return shift * SUB_BUCKETS + (value >> shift)
+
+
+def _bucket_range(index):
+    """(lowest, highest) value counted in bucket index."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Streaming histogram of non-negative integers. add() is a handful of
+    integer operations, so it can run on the I/O thread per read; readers
+    on other threads may see a count that is one add behind.
+    """
+
+    BUCKETS = _bucket((1 << 64) - 1) + 1
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        value = max(0, int(value))
+        self.counts[_bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, pct):
+        """Approximate value below which pct percent of the values fall, or None when empty."""
+        count = self.count
+        if not count:
+            return None
+        rank = max(1, -(-count * pct // 100))  # Ceiling without floats
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                low, high = _bucket_range(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+
+class RateMeter:
+    """Turns a growing counter into a per-second rate between update() calls."""
+
+    def __init__(self):
+        self._last_total = None
+        self._last_time = None
+        self.rate = 0.0
+
+    def update(self, total, now=None):
+        now = time.monotonic() if now is None else now
+        if self._last_time is not None and now > self._last_time:
+            self.rate = (total - self._last_total) / (now - self._last_time)
+        self._last_total = total
+        self._last_time = now
+        return self.rate
+
+
+def command_label(command, is_hex):
+    """Label a sent command is logged and tracked in response_latency under."""
+    return f"HEX({command})" if is_hex else command
+
+
+class LinkStats:
+    """
+    Per-connection histograms. chunk_sizes (bytes per read) and
+    response_latency are fed by the worker on its I/O thread;
+    render_backlog (bytes per drain) and render_delay (microseconds from
+    read to drain) by the GUI. To reset, replace the object rather than
+    clearing it.
+
+    response_latency maps a sent command's label to a histogram of the
+    microseconds from its last byte being written to the first byte read
+    after it. reconnect_time holds the microseconds each automatic
+    reconnect took, from the drop to the port being open again; stats
+    carry over to the reconnected worker.
+    """
+
+    def __init__(self):
+        self.chunk_sizes = Histogram()
+        self.render_backlog = Histogram()
+        self.render_delay = Histogram()
+        self.response_latency = {}
+        self.reconnect_time = Histogram()
+        self._awaiting = None  # (label, timestamp_ns) of the last labelled write
+
+    def sent(self, label, timestamp_ns):
+        self._awaiting = (label, timestamp_ns)
+
+    def received(self, timestamp_ns, size):
+        self.chunk_sizes.add(size)
+        awaiting = self._awaiting
+        if awaiting:
+            self._awaiting = None
+            label, sent_ns = awaiting
+            histogram = self.response_latency.get(label)
+            if histogram is None:
+                histogram = self.response_latency[label] = Histogram()
+            histogram.add((timestamp_ns - sent_ns) // 1000)
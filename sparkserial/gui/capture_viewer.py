@@ -0,0 +1,177 @@
+import os
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton, QLineEdit
+from PyQt6.QtCore import pyqtSignal, QTimer
+from sparkserial.core.capture_file import CaptureReader, CaptureReplay, RX
+from sparkserial.core.file_views import CaptureFileView, TextFileView
+from sparkserial.gui.styles import get_stylesheet
+from sparkserial.gui.terminal_view import TerminalView
+from sparkserial.gui.widgets import StyledCheckBox
+
+
+class CaptureViewer(QDialog):
+    """
+    Browses a saved .sscap capture or text log, and replays captures.
+
+    The file is memory-mapped and only the visible rows are formatted.
+    Replayed RX payloads are emitted through replay_data (shown in the live
+    terminal) and, with "Send to port" checked, replay_to_port.
+    """
+
+    REPLAY_INTERVAL_MS = 20
+    REPLAY_SPEEDS = [("0.5x", 0.5), ("1x", 1.0), ("2x", 2.0), ("10x", 10.0), ("100x", 100.0), ("Max", 0)]
+
+    replay_data = pyqtSignal(bytes)
+    replay_to_port = pyqtSignal(bytes)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Capture - {os.path.basename(path)}")
+        self.setMinimumSize(800, 500)
+        self.setStyleSheet(get_stylesheet())
+
+        # Raises ValueError for files that are not captures
+        self.reader = CaptureReader(path) if path.endswith(".sscap") else None
+        if self.reader:
+            self.source = CaptureFileView(self.reader)
+        else:
+            self.source = TextFileView(path)
+        self.replay = None
+
+        layout = QVBoxLayout(self)
+
+        view_row = QHBoxLayout()
+        self.hex_check = StyledCheckBox("Hex View")
+        self.hex_check.toggled.connect(self.update_view)
+        self.timestamp_check = StyledCheckBox("Timestamps")
+        self.timestamp_check.setChecked(True)
+        self.timestamp_check.toggled.connect(self.update_view)
+        self.time_input = QLineEdit()
+        self.time_input.setPlaceholderText("HH:MM:SS")
+        self.time_input.setFixedWidth(100)
+        self.time_input.returnPressed.connect(self.go_to_time)
+        go_btn = QPushButton("Go to Time")
+        go_btn.clicked.connect(self.go_to_time)
+        view_row.addWidget(self.hex_check)
+        view_row.addWidget(self.timestamp_check)
+        view_row.addStretch()
+        view_row.addWidget(self.time_input)
+        view_row.addWidget(go_btn)
+        layout.addLayout(view_row)
+
+        self.terminal = TerminalView()
+        self.terminal.set_source(self.source)
+        self.terminal.verticalScrollBar().setValue(0)
+        layout.addWidget(self.terminal)
+
+        replay_row = QHBoxLayout()
+        self.speed_combo = QComboBox()
+        for label, speed in self.REPLAY_SPEEDS:
+            self.speed_combo.addItem(label, speed)
+        self.speed_combo.setCurrentIndex(1)
+        self.to_port_check = StyledCheckBox("Send to Port")
+        self.to_port_check.setToolTip("Also write replayed RX data to the connected port (e.g. one end of a virtual port pair)")
+        self.replay_btn = QPushButton("Replay")
+        self.replay_btn.setToolTip("Replay received data from the selected row into the live terminal")
+        self.replay_btn.clicked.connect(self.toggle_replay)
+        self.info_label = QLabel()
+        replay_row.addWidget(self.info_label, 1)
+        replay_row.addWidget(QLabel("Speed:"))
+        replay_row.addWidget(self.speed_combo)
+        replay_row.addWidget(self.to_port_check)
+        replay_row.addWidget(self.replay_btn)
+        layout.addLayout(replay_row)
+
+        if not self.reader:
+            for widget in [self.hex_check, self.timestamp_check, self.time_input, go_btn,
+                           self.speed_combo, self.to_port_check, self.replay_btn]:
+                widget.setEnabled(False)
+
+        self.replay_timer = QTimer(self)
+        self.replay_timer.setInterval(self.REPLAY_INTERVAL_MS)
+        self.replay_timer.timeout.connect(self.replay_step)
+
+        # Text logs are indexed in the background; pick up new rows meanwhile
+        self.index_timer = QTimer(self)
+        self.index_timer.setInterval(200)
+        self.index_timer.timeout.connect(self.update_info)
+        if not self.reader:
+            self.index_timer.start()
+        self.update_info()
+
+    def update_info(self):
+        if self.reader:
+            size = self.reader.data_end / (1024 * 1024)
+            text = f"{len(self.reader)} records, {size:.1f} MB"
+            if self.replay:
+                text += f"  |  Replaying {self.replay.position}/{len(self.reader)}"
+        else:
+            size = self.source.size / (1024 * 1024)
+            text = f"{len(self.source)} lines, {size:.1f} MB"
+            if self.source.indexing:
+                text += f" (indexing {self.source.indexed_bytes * 100 // max(1, self.source.size)}%)"
+            else:
+                self.index_timer.stop()
+            self.terminal.refresh()
+        self.info_label.setText(text)
+
+    def update_view(self):
+        top = self.terminal.verticalScrollBar().value()
+        self.source.hex_view = self.hex_check.isChecked()
+        self.source.timestamps = self.timestamp_check.isChecked()
+        self.terminal.refresh()
+        self.terminal.verticalScrollBar().setValue(top)
+
+    def go_to_time(self):
+        """Scrolls to the first record at or after HH:MM:SS[.ffff] on the capture's start date."""
+        from datetime import datetime, timedelta, time as dt_time
+        try:
+            when = dt_time.fromisoformat(self.time_input.text().strip())
+        except ValueError:
+            self.info_label.setText("Enter a time as HH:MM:SS")
+            return
+        start = datetime.fromtimestamp(self.reader.start_wall_ns / 1e9)
+        target = datetime.combine(start.date(), when)
+        if target < start.replace(microsecond=0):
+            # An earlier time of day means the day after, for captures running past midnight
+            target += timedelta(days=1)
+        row = self.source.row_at_time(round(target.timestamp() * 1e6) * 1000)
+        self.terminal.scroll_to_line(row)
+        self.terminal.select_lines(row)
+
+    def toggle_replay(self):
+        if self.replay:
+            self.stop_replay()
+            return
+        selected = self.terminal.selected_range()
+        start = selected[0] if selected else 0
+        self.replay = CaptureReplay(self.reader, self.speed_combo.currentData(), start)
+        self.replay_btn.setText("Stop")
+        self.replay_timer.start()
+
+    def stop_replay(self):
+        self.replay_timer.stop()
+        self.replay = None
+        self.replay_btn.setText("Replay")
+        self.update_info()
+
+    def replay_step(self):
+        for _timestamp, direction, _port_id, data in self.replay.due():
+            if direction != RX:
+                continue
+            self.replay_data.emit(data)
+            if self.to_port_check.isChecked():
+                self.replay_to_port.emit(data)
+        if self.replay.finished:
+            self.stop_replay()
+        else:
+            self.update_info()
+
+    def closeEvent(self, event):
+        self.replay_timer.stop()
+        self.index_timer.stop()
+        self.terminal.set_source(self.terminal.store)
+        if self.reader:
+            self.reader.close()
+        else:
+            self.source.close()
+        super().closeEvent(event)
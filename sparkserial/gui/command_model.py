@@ -0,0 +1,195 @@
+from bisect import bisect_left
+import time
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, pyqtSignal
+
+from sparkserial.core.command_index import CommandIndex, command_tags
+
+
+class CommandListModel(QAbstractListModel):
+    """
+    The saved commands of a CommandManager as list rows, optionally
+    filtered by a fuzzy query and a tag (see core.command_index).
+
+    Edits go through add_command(), update_command() and delete_command(),
+    which change the manager, the index and only the affected rows; call
+    reload() after replacing the library wholesale.
+
+    A filter shows the matches it finds in its first FIRST_BUDGET_MS
+    straight away and scans the rest of the library in SEARCH_BUDGET_MS
+    slices between events, so typing never waits for a scan of a large
+    library; search_finished(count) is emitted once all the matches are in.
+    While idle after loading, the index builds its per-character arrays
+    the same way, one per event loop pass.
+    """
+
+    FIRST_BUDGET_MS = 1
+    SEARCH_BUDGET_MS = 4
+
+    search_finished = pyqtSignal(int)
+
+    def __init__(self, command_manager, parent=None, search_index=None):
+        """search_index shares another model's index, e.g. for a modal picker while the library cannot change."""
+        super().__init__(parent)
+        self.command_manager = command_manager
+        self.search_index = search_index if search_index is not None else CommandIndex(command_manager.get_commands())
+        self.query = ""
+        self.tag = None
+        self._rows = None  # Command indices shown, in library order; None when unfiltered
+        self._search = None  # Generator still producing matches
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._work)
+        self._timer.start()  # Warm up the index
+
+    @property
+    def searching(self):
+        return self._search is not None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.search_index) if self._rows is None else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        cmd = self.command(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{cmd['name']} : {cmd['command']}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            tooltip = f"Command: {cmd['command']}\nType: {'Hex' if cmd['is_hex'] else 'Text'}"
+            tags = command_tags(cmd)
+            if tags:
+                tooltip += f"\nTags: {', '.join(tags)}"
+            return tooltip
+        return None
+
+    def command_index(self, row):
+        """Position in the library of the command on row."""
+        return row if self._rows is None else self._rows[row]
+
+    def command(self, row):
+        return self.command_manager.get_commands()[self.command_index(row)]
+
+    def row_of(self, command_index):
+        """Row showing the command at command_index, or -1 if it is filtered out."""
+        if self._rows is None:
+            return command_index
+        row = bisect_left(self._rows, command_index)
+        if row < len(self._rows) and self._rows[row] == command_index:
+            return row
+        return -1
+
+    def tags(self):
+        return self.search_index.tags()
+
+    def set_filter(self, query="", tag=None):
+        query = query.strip()
+        if query == self.query and tag == self.tag:
+            return
+        self.query = query
+        self.tag = tag
+        self._restart()
+
+    def reload(self):
+        """Re-reads the whole library, e.g. after an import or bulk replace."""
+        self.search_index.reset(self.command_manager.get_commands())
+        self._restart()
+
+    def add_command(self, name, command, is_hex=False, tags=None):
+        command_index = len(self.search_index)
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), command_index, command_index)
+        self.command_manager.add_command(name, command, is_hex, tags)
+        self.search_index.insert(command_index, self.command_manager.get_commands()[command_index])
+        if self._rows is None:
+            self.endInsertRows()
+        elif self._search is not None:
+            self._restart()
+        elif self.search_index.matches(command_index, self.query, self.tag):
+            self._insert_row(len(self._rows), command_index)
+
+    def update_command(self, command_index, name, command, is_hex=False, tags=None):
+        self.command_manager.update_command(command_index, name, command, is_hex, tags)
+        self.search_index.update(command_index, self.command_manager.get_commands()[command_index])
+        if self._search is not None:
+            self._restart()
+            return
+        row = self.row_of(command_index)
+        shown = self._rows is None or self.search_index.matches(command_index, self.query, self.tag)
+        if row >= 0 and shown:
+            changed = self.createIndex(row, 0)
+            self.dataChanged.emit(changed, changed)
+        elif row >= 0:
+            self._remove_row(row)
+        elif shown:
+            self._insert_row(bisect_left(self._rows, command_index), command_index)
+
+    def delete_command(self, command_index):
+        row = self.row_of(command_index) if self._search is None else -1
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        self.command_manager.delete_command(command_index)
+        self.search_index.remove(command_index)
+        if self._rows is not None:
+            if row >= 0:
+                del self._rows[row]
+            # Commands after the deleted one moved up a place
+            start = bisect_left(self._rows, command_index)
+            self._rows[start:] = [i - 1 for i in self._rows[start:]]
+        if row >= 0:
+            self.endRemoveRows()
+        if self._search is not None:
+            self._restart()
+
+    def _insert_row(self, row, command_index):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, command_index)
+        self.endInsertRows()
+
+    def _remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+    def _restart(self):
+        self.beginResetModel()
+        if not self.query and not self.tag:
+            self._rows = None
+            self._search = None
+        else:
+            self._rows = []
+            self._search = self.search_index.search(self.query, self.tag)
+            self._scan(self._rows, self.FIRST_BUDGET_MS)
+        self.endResetModel()
+        if self._search is None:
+            self.search_finished.emit(self.rowCount())
+        self._timer.start()
+
+    def _scan(self, rows, budget_ms):
+        """Adds matches to rows for up to budget_ms; drops the search once it is done."""
+        deadline = time.perf_counter() + budget_ms / 1000
+        for chunk in self._search:
+            rows.extend(chunk)
+            if time.perf_counter() >= deadline:
+                return
+        self._search = None
+
+    def _work(self):
+        if self._search is None:
+            # Idle: build another per-character array so a later search is fast
+            if self.search_index.warm_up():
+                self._timer.start()
+            return
+        found = []
+        self._scan(found, self.SEARCH_BUDGET_MS)
+        if found:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(found) - 1)
+            self._rows.extend(found)
+            self.endInsertRows()
+        if self._search is None:
+            self.search_finished.emit(len(self._rows))
+        self._timer.start()
@@ -1,63 +1,32 @@
 import sys
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QGridLayout, QGroupBox, QLabel, QComboBox, 
-                             QPushButton, QPlainTextEdit, QLineEdit, QStatusBar,
-                             QCheckBox, QSplitter, QListWidget, QListWidgetItem,
+                             QPushButton, QPlainTextEdit, QLineEdit, QStatusBar, QSplitter,
                              QDialog, QFormLayout, QDialogButtonBox, QMessageBox,
-                             QStyle, QStyleOptionButton)
-from PyQt6.QtCore import Qt, pyqtSlot, QRect
-from PyQt6.QtGui import QIcon, QTextCursor, QPainter, QPen, QColor
+                             QSpinBox, QDockWidget, QTabBar)
+from PyQt6.QtCore import Qt, pyqtSlot, QTimer
+from PyQt6.QtGui import QIcon, QTextCursor
 import serial
 from sparkserial.core.serial_manager import SerialManager
+from sparkserial.core.port_monitor import PortMonitor
 from sparkserial.core.command_manager import CommandManager
+from sparkserial.core.command_index import command_tags
 from sparkserial.gui.styles import get_stylesheet
+from sparkserial.core.capture_store import CaptureStore, CaptureView, InterleavedView, format_timestamp
+from sparkserial.core.hexfmt import hex_rows, hexdump, to_hex
+from sparkserial.core.log_writer import LogWriter
+from sparkserial.core.capture_file import CaptureWriter, EVENT
+from sparkserial.core.search import SessionSearch, compile_pattern, SEARCH_MODES
+from sparkserial.core.framing import make_framer, FRAMING_TYPES, CRC_TYPES
+from sparkserial.core.stats import command_label
+from sparkserial.gui.terminal_view import TerminalView
+from sparkserial.gui.qt_bridge import QtRelay
+from sparkserial.gui.widgets import StyledCheckBox, CommandListView
+from sparkserial.gui.command_model import CommandListModel
 import os
 import json
-
-class StyledCheckBox(QCheckBox):
-    """Custom checkbox that draws a proper checkmark."""
-    
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        
-        # Draw the checkbox indicator
-        indicator_size = 18
-        indicator_x = 0
-        indicator_y = (self.height() - indicator_size) // 2
-        indicator_rect = QRect(indicator_x, indicator_y, indicator_size, indicator_size)
-        
-        # Background and border
-        if self.isChecked():
-            painter.fillRect(indicator_rect, QColor("#007acc"))
-            painter.setPen(QPen(QColor("#007acc"), 2))
-        else:
-            painter.fillRect(indicator_rect, QColor("#252526"))
-            painter.setPen(QPen(QColor("#6e6e6e"), 2))
-        
-        painter.drawRoundedRect(indicator_rect, 3, 3)
-        
-        # Draw checkmark if checked
-        if self.isChecked():
-            pen = QPen(QColor("#ffffff"), 2)
-            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-            pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            
-            # Checkmark path
-            x_offset = indicator_x + 4
-            y_offset = indicator_y + 4
-            painter.drawLine(x_offset, y_offset + 5, x_offset + 4, y_offset + 9)
-            painter.drawLine(x_offset + 4, y_offset + 9, x_offset + 10, y_offset + 1)
-        
-        # Draw text
-        text_x = indicator_size + 8
-        text_rect = QRect(text_x, 0, self.width() - text_x, self.height())
-        painter.setPen(QColor("#d4d4d4"))
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, self.text())
-        
-        painter.end()
-
+import time
+import codecs
 
 class CommandDialog(QDialog):
     def __init__(self, parent=None, command_info=None):
@@ -78,12 +47,18 @@ class CommandDialog(QDialog):
         if command_info:
             self.command_input.setText(command_info.get('command', ''))
             
+        self.tags_input = QLineEdit()
+        self.tags_input.setPlaceholderText("e.g., power, debug")
+        if command_info:
+            self.tags_input.setText(", ".join(command_tags(command_info)))
+
         self.hex_check = StyledCheckBox("Send as Hex")
         if command_info:
             self.hex_check.setChecked(command_info.get('is_hex', False))
             
         form_layout.addRow("Name:", self.name_input)
         form_layout.addRow("Command:", self.command_input)
+        form_layout.addRow("Tags:", self.tags_input)
         form_layout.addRow("", self.hex_check)
         
         layout.addLayout(form_layout)
@@ -99,7 +74,8 @@ class CommandDialog(QDialog):
         return {
             "name": self.name_input.text().strip(),
             "command": self.command_input.text().strip(),
-            "is_hex": self.hex_check.isChecked()
+            "is_hex": self.hex_check.isChecked(),
+            "tags": [tag.strip() for tag in self.tags_input.text().split(",") if tag.strip()]
         }
 
 class BulkReplaceDialog(QDialog):
@@ -135,16 +111,241 @@ class BulkReplaceDialog(QDialog):
     def get_data(self):
         return self.find_input.text(), self.replace_input.text()
 
+class LogOptionsDialog(QDialog):
+    """Rotation, compression and retention settings for Log to File."""
+
+    def __init__(self, parent=None, options=None):
+        super().__init__(parent)
+        self.setWindowTitle("Logging Options")
+        self.setMinimumWidth(360)
+        self.setStyleSheet(get_stylesheet())
+        options = options or {}
+
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+
+        self.size_spin = QSpinBox()
+        self.size_spin.setRange(0, 100_000)
+        self.size_spin.setSuffix(" MB")
+        self.size_spin.setSpecialValueText("Off")
+        self.size_spin.setValue(options.get('max_mb', 0))
+
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(0, 7 * 24 * 60)
+        self.interval_spin.setSuffix(" min")
+        self.interval_spin.setSpecialValueText("Off")
+        self.interval_spin.setValue(options.get('interval_min', 0))
+
+        self.compress_combo = QComboBox()
+        self.compress_combo.addItems(["None", "gzip", "zstd"])
+        self.compress_combo.setCurrentText(options.get('compress', "None"))
+
+        self.retention_spin = QSpinBox()
+        self.retention_spin.setRange(0, 100_000)
+        self.retention_spin.setSpecialValueText("All")
+        self.retention_spin.setValue(options.get('retention', 0))
+
+        form_layout.addRow("Rotate at size:", self.size_spin)
+        form_layout.addRow("Rotate every:", self.interval_spin)
+        form_layout.addRow("Compress segments:", self.compress_combo)
+        form_layout.addRow("Keep segments:", self.retention_spin)
+        layout.addLayout(form_layout)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def get_data(self):
+        return {
+            "max_mb": self.size_spin.value(),
+            "interval_min": self.interval_spin.value(),
+            "compress": self.compress_combo.currentText(),
+            "retention": self.retention_spin.value()
+        }
+
+class FramingDialog(QDialog):
+    """Frame decoder settings for the Frames panel."""
+
+    def __init__(self, parent=None, options=None):
+        super().__init__(parent)
+        self.setWindowTitle("Frame Decoder")
+        self.setMinimumWidth(380)
+        self.setStyleSheet(get_stylesheet())
+        options = options or {}
+
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+
+        self.type_combo = QComboBox()
+        self.type_combo.addItems(["Off"] + FRAMING_TYPES)
+        self.type_combo.setCurrentText(options.get('type', "Off"))
+
+        self.delimiter_input = QLineEdit(options.get('delimiter', "0A"))
+        self.delimiter_input.setPlaceholderText("Hex, e.g. 0D 0A")
+
+        self.length_spin = QSpinBox()
+        self.length_spin.setRange(1, 65535)
+        self.length_spin.setSuffix(" bytes")
+        self.length_spin.setValue(options.get('length', 8))
+
+        self.header_combo = QComboBox()
+        self.header_combo.addItems(["1", "2", "4"])
+        self.header_combo.setCurrentText(str(options.get('header_bytes', 2)))
+
+        self.byteorder_combo = QComboBox()
+        self.byteorder_combo.addItems(["big", "little"])
+        self.byteorder_combo.setCurrentText(options.get('byteorder', "big"))
+
+        self.includes_header_check = StyledCheckBox("Length includes header")
+        self.includes_header_check.setChecked(options.get('includes_header', False))
+
+        self.crc_combo = QComboBox()
+        self.crc_combo.addItems(["None"] + list(CRC_TYPES))
+        self.crc_combo.setCurrentText(options.get('crc') or "None")
+
+        self.max_length_spin = QSpinBox()
+        self.max_length_spin.setRange(1, 16 * 1024 * 1024)
+        self.max_length_spin.setSuffix(" bytes")
+        self.max_length_spin.setValue(options.get('max_length', 64 * 1024))
+
+        form_layout.addRow("Framing:", self.type_combo)
+        form_layout.addRow("Delimiter:", self.delimiter_input)
+        form_layout.addRow("Fixed length:", self.length_spin)
+        form_layout.addRow("Length prefix:", self.header_combo)
+        form_layout.addRow("Byte order:", self.byteorder_combo)
+        form_layout.addRow("", self.includes_header_check)
+        form_layout.addRow("Trailing CRC:", self.crc_combo)
+        form_layout.addRow("Max frame:", self.max_length_spin)
+        layout.addLayout(form_layout)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.validate_and_accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def validate_and_accept(self):
+        try:
+            make_framer(self.get_data())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Settings", str(e))
+            return
+        self.accept()
+
+    def get_data(self):
+        crc = self.crc_combo.currentText()
+        return {
+            "type": self.type_combo.currentText(),
+            "delimiter": self.delimiter_input.text().strip(),
+            "length": self.length_spin.value(),
+            "header_bytes": int(self.header_combo.currentText()),
+            "byteorder": self.byteorder_combo.currentText(),
+            "includes_header": self.includes_header_check.isChecked(),
+            "crc": None if crc == "None" else crc,
+            "max_length": self.max_length_spin.value()
+        }
+
+class PortSession:
+    """One named connection: its worker (None while disconnected) and received data."""
+
+    def __init__(self, name, capture, port_id):
+        self.name = name
+        self.port_id = port_id
+        self.worker = None
+        self.capture = capture
+        self.capture_view = CaptureView(capture)
+        # Decodes received text across chunk boundaries for the classic view and log
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.log_at_newline = True
+        self.rx_overflow_reported = 0
+        self.reconnect = False  # Connected with Auto-Reconnect on
+
 class MainWindow(QMainWindow):
+    # How often received data is drained from the worker's RX buffer.
+    # 16-33 ms keeps the terminal fluid while bounding GUI wakeups.
+    RX_DRAIN_INTERVAL_MS = 25
+
+    # Terminal scrollback choices: (label, kind, limit). "lines" caps the
+    # number of lines, "chars" caps the text size, None keeps everything in
+    # memory; only Log to File keeps a whole session on disk.
+    SCROLLBACK_OPTIONS = [
+        ("10k lines", "lines", 10_000),
+        ("100k lines", "lines", 100_000),
+        ("1M lines", "lines", 1_000_000),
+        ("16 MB", "chars", 16 * 1024 * 1024),
+        ("64 MB", "chars", 64 * 1024 * 1024),
+        ("Unlimited (in memory)", None, 0),
+    ]
+    DEFAULT_SCROLLBACK = 1
+    # Most lines re-rendered into the classic terminal on a view change
+    CLASSIC_RENDER_LINES = 100_000
+    # Export Session formats the capture in blocks of this size (a multiple of 16)
+    EXPORT_BLOCK_BYTES = 1024 * 1024
+    # Frames panel: bytes shown per frame and lines kept
+    FRAME_DISPLAY_BYTES = 256
+    FRAME_HISTORY_LINES = 1_000_000
+
     def __init__(self):
         super().__init__()
-        self.serial_manager = SerialManager()
+        # Enumerates ports in the background and reports hot-plug changes
+        self.port_monitor = PortMonitor()
+        self.serial_manager = SerialManager(port_monitor=self.port_monitor)
+        # Serial threads report through core signals; this hands them to the GUI thread
+        self.relay = QtRelay(self)
+        self.relay.connect(self.serial_manager.reconnecting, self.port_reconnecting)
+        self.relay.connect(self.serial_manager.reconnected, self.port_reconnected)
         self.command_manager = CommandManager()
-        self.current_worker = None
+
+        # One PortSession per named connection. self.session is the one the
+        # terminal shows; before the first connection it is a detached idle
+        # session that the first connection adopts.
+        self.sessions = {}
+        self.session = PortSession("", CaptureStore(), 0)
+        # Raw received bytes of the shown session; the terminal is rendered from here
+        self.capture = self.session.capture
+        self.capture_view = self.session.capture_view
+        # "All Ports" view: completed lines of every session in arrival order
+        self.merged_view = InterleavedView()
+        self.showing_merged = False
+
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(1000)
+        self.stats_timer.timeout.connect(self.update_port_stats)
+
+        self.rx_timer = QTimer(self)
+        self.rx_timer.setInterval(self.RX_DRAIN_INTERVAL_MS)
+        self.rx_timer.timeout.connect(self.drain_rx)
+
+        self.log_status_timer = QTimer(self)
+        self.log_status_timer.setInterval(500)
+        self.log_status_timer.timeout.connect(self.update_log_status)
+
+        # Background search over the capture; restarted when the query changes
+        self.search = None
+        self._search_match = None  # (start, end) of the current match
+        self.search_debounce = QTimer(self)
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.setInterval(300)
+        self.search_debounce.timeout.connect(self.start_search)
+        self.search_status_timer = QTimer(self)
+        self.search_status_timer.setInterval(200)
+        self.search_status_timer.timeout.connect(self.update_search_status)
+
+        self.sequence_dialog = None  # Created on first use
+        self.stats_dialog = None
+
+        # Frame decoder settings (see core.framing); applied to each connection
+        self.framing_settings = self.load_config().get('framing', {})
+        self.frame_count = 0
         
         self.init_ui()
         self.apply_styles()
-        self.refresh_ports()
+        self.relay.connect(self.port_monitor.ports_changed, self.update_ports)
+        self.port_monitor.start()
 
     def init_ui(self):
         self.setWindowTitle("SparkSerial Pro")
@@ -175,6 +376,7 @@ class MainWindow(QMainWindow):
         config_grid.addWidget(QLabel("Port:"), 0, 0)
         port_row = QHBoxLayout()
         self.port_combo = QComboBox()
+        self.port_combo.currentTextChanged.connect(self.update_connect_button)
         # Remove rigid fixed heights, use standard sizing
         port_row.addWidget(self.port_combo, 1)
         refresh_btn = QPushButton("↻")
@@ -237,9 +439,27 @@ class MainWindow(QMainWindow):
         saved_group_layout = QVBoxLayout()
         saved_group_layout.setContentsMargins(10, 15, 10, 10)
         
-        self.commands_list = QListWidget()
-        self.commands_list.itemDoubleClicked.connect(self.load_saved_command)
+        search_row = QHBoxLayout()
+        self.command_search_input = QLineEdit()
+        self.command_search_input.setPlaceholderText("Search commands")
+        self.command_search_input.setClearButtonEnabled(True)
+        self.command_search_input.setToolTip("Fuzzy search: \"rst pwr\" finds \"Reset Power\"")
+        self.command_search_input.textChanged.connect(self.filter_commands)
+        search_row.addWidget(self.command_search_input, 1)
+        self.command_tag_combo = QComboBox()
+        self.command_tag_combo.addItem("All Tags")
+        self.command_tag_combo.currentIndexChanged.connect(self.filter_commands)
+        search_row.addWidget(self.command_tag_combo)
+        saved_group_layout.addLayout(search_row)
+
+        self.command_model = CommandListModel(self.command_manager, self)
+        self.command_model.search_finished.connect(self.update_command_count)
+        self.commands_list = CommandListView()
+        self.commands_list.setModel(self.command_model)
+        self.commands_list.doubleClicked.connect(self.load_saved_command)
         saved_group_layout.addWidget(self.commands_list)
+        self.command_count_label = QLabel()
+        saved_group_layout.addWidget(self.command_count_label)
 
         
         cmd_btns = QHBoxLayout()
@@ -254,14 +474,19 @@ class MainWindow(QMainWindow):
         bulk_replace_btn.setToolTip("Find and Replace in all commands")
         bulk_replace_btn.clicked.connect(self.bulk_replace_dialog)
 
+        sequence_btn = QPushButton("Sequence")
+        sequence_btn.setToolTip("Run commands as a scripted sequence with expected responses")
+        sequence_btn.clicked.connect(self.show_sequence_runner)
+
         # Consistent industry styling
-        for btn in [add_cmd_btn, edit_cmd_btn, del_cmd_btn, bulk_replace_btn]:
+        for btn in [add_cmd_btn, edit_cmd_btn, del_cmd_btn, bulk_replace_btn, sequence_btn]:
             btn.setMinimumHeight(32)
         
         cmd_btns.addWidget(add_cmd_btn)
         cmd_btns.addWidget(edit_cmd_btn)
         cmd_btns.addWidget(del_cmd_btn)
         cmd_btns.addWidget(bulk_replace_btn)
+        cmd_btns.addWidget(sequence_btn)
         saved_group_layout.addLayout(cmd_btns)
         
         saved_group.setLayout(saved_group_layout)
@@ -271,21 +496,36 @@ class MainWindow(QMainWindow):
         # Right Panel: Terminal and Tools
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
+        self.right_layout = right_layout
 
         # Terminal Settings
         term_settings = QHBoxLayout()
         self.autoscroll_check = StyledCheckBox("Autoscroll")
         self.autoscroll_check.setChecked(True)
         self.hex_view_check = StyledCheckBox("Hex View")
+        self.hex_view_check.toggled.connect(self.rerender_terminal)
         self.timestamp_check = StyledCheckBox("Timestamps")
+        self.timestamp_check.toggled.connect(self.rerender_terminal)
         self.logging_check = StyledCheckBox("Log to File")
         self.logging_check.toggled.connect(self.toggle_logging)
+
+        # Scrollback cap: (label, kind, limit)
+        self.scrollback_combo = QComboBox()
+        for label, kind, limit in self.SCROLLBACK_OPTIONS:
+            self.scrollback_combo.addItem(label, (kind, limit))
+        self.scrollback_combo.setToolTip(
+            "Terminal history kept in memory. Older lines are discarded;\n"
+            "Unlimited keeps them all, so memory grows with the session.\n"
+            "Enable Log to File to keep the full session on disk."
+        )
         
         clear_btn = QPushButton("Clear")
         clear_btn.clicked.connect(self.clear_terminal)
         
         term_settings.addWidget(self.autoscroll_check)
         term_settings.addWidget(self.hex_view_check)
+        term_settings.addWidget(QLabel("Scrollback:"))
+        term_settings.addWidget(self.scrollback_combo)
         term_settings.addWidget(self.timestamp_check)
         term_settings.addWidget(self.logging_check)
         term_settings.addStretch()
@@ -293,10 +533,59 @@ class MainWindow(QMainWindow):
         
         right_layout.addLayout(term_settings)
 
-        # Terminal Output
-        self.terminal = QPlainTextEdit()
-        self.terminal.setReadOnly(True)
+        # Search bar (View > Find), hidden until used
+        self.search_bar = QWidget()
+        search_row = QHBoxLayout(self.search_bar)
+        search_row.setContentsMargins(0, 0, 0, 0)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search session...")
+        self.search_input.textChanged.connect(lambda: self.search_debounce.start())
+        self.search_input.returnPressed.connect(self.find_next)
+        self.search_mode_combo = QComboBox()
+        self.search_mode_combo.addItems(SEARCH_MODES)
+        self.search_mode_combo.currentIndexChanged.connect(self.start_search)
+        self.search_case_check = StyledCheckBox("Match Case")
+        self.search_case_check.setChecked(True)
+        self.search_case_check.toggled.connect(self.start_search)
+        prev_btn = QPushButton("▲")
+        prev_btn.setToolTip("Previous match (Shift+F3)")
+        prev_btn.setFixedWidth(40)
+        prev_btn.clicked.connect(self.find_previous)
+        next_btn = QPushButton("▼")
+        next_btn.setToolTip("Next match (F3)")
+        next_btn.setFixedWidth(40)
+        next_btn.clicked.connect(self.find_next)
+        self.search_count_label = QLabel()
+        close_search_btn = QPushButton("✕")
+        close_search_btn.setFixedWidth(40)
+        close_search_btn.clicked.connect(self.close_search)
+        search_row.addWidget(self.search_input, 1)
+        search_row.addWidget(self.search_mode_combo)
+        search_row.addWidget(self.search_case_check)
+        search_row.addWidget(prev_btn)
+        search_row.addWidget(next_btn)
+        search_row.addWidget(self.search_count_label)
+        search_row.addWidget(close_search_btn)
+        self.search_bar.hide()
+        right_layout.addWidget(self.search_bar)
+
+        # One tab per connected port plus "All Ports", shown once there are two
+        self.port_tabs = QTabBar()
+        self.port_tabs.setTabsClosable(True)
+        self.port_tabs.setExpanding(False)
+        self.port_tabs.currentChanged.connect(self.select_port_tab)
+        self.port_tabs.tabCloseRequested.connect(self.close_port_tab)
+        self.port_tabs.hide()
+        right_layout.addWidget(self.port_tabs)
+
+        # Terminal Output: the virtualized view, which re-renders a view change in milliseconds
+        # at any session size; View → Virtualized Terminal switches to the classic QPlainTextEdit
+        self.terminal = TerminalView()
+        self.terminal.set_source(self.capture_view)
         right_layout.addWidget(self.terminal)
+        self.scrollback_combo.currentIndexChanged.connect(self.set_scrollback)
+        self.scrollback_combo.setCurrentIndex(self.DEFAULT_SCROLLBACK)
+        self.set_scrollback(self.DEFAULT_SCROLLBACK)
 
         # Input Area
         input_group = QGroupBox("Send Command")
@@ -344,16 +633,39 @@ class MainWindow(QMainWindow):
         splitter.setStretchFactor(1, 1) # Terminal panel gets more space
         main_layout.addWidget(splitter)
         
-        self.refresh_commands_list()
+        self.refresh_command_tags()
+        self.update_command_count()
+
+        # Decoded frames panel, shown while a frame decoder is configured
+        self.frames_dock = QDockWidget("Frames", self)
+        self.frames_dock.setObjectName("framesDock")
+        frames_widget = QWidget()
+        frames_layout = QVBoxLayout(frames_widget)
+        frames_layout.setContentsMargins(4, 4, 4, 4)
+        self.frames_view = TerminalView()
+        self.frames_stats_label = QLabel()
+        frames_layout.addWidget(self.frames_view)
+        frames_layout.addWidget(self.frames_stats_label)
+        self.frames_dock.setWidget(frames_widget)
+        self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.frames_dock)
+        self.frames_dock.setVisible(self.framing_settings.get('type', "Off") != "Off")
 
         # Status Bar
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Disconnected")
+        self.log_status_label = QLabel()
+        self.status_bar.addPermanentWidget(self.log_status_label)
+        self.port_stats_label = QLabel()
+        self.status_bar.addPermanentWidget(self.port_stats_label)
         
         # Logging State
         self.log_file = None
         self.log_path = None
+        # Raw .sscap capture, recorded alongside (or instead of) the text log
+        self.capture_writer = None
+        # Whether the terminal currently ends at the start of a line
+        self._term_at_newline = True
 
     def create_menu_bar(self):
         """Create the application menu bar."""
@@ -374,6 +686,14 @@ class MainWindow(QMainWindow):
         export_action.setShortcut("Ctrl+S")
         export_action.triggered.connect(self.export_commands)
         file_menu.addAction(export_action)
+
+        open_capture_action = QAction("Open Capture...", self)
+        open_capture_action.triggered.connect(self.open_capture)
+        file_menu.addAction(open_capture_action)
+
+        export_session_action = QAction("Export Session...", self)
+        export_session_action.triggered.connect(self.export_session)
+        file_menu.addAction(export_session_action)
         
         file_menu.addSeparator()
         
@@ -386,7 +706,64 @@ class MainWindow(QMainWindow):
         show_location_action = QAction("Show Current Location", self)
         show_location_action.triggered.connect(self.show_commands_location)
         file_menu.addAction(show_location_action)
+
+        file_menu.addSeparator()
+
+        framing_action = QAction("Frame Decoder...", self)
+        framing_action.triggered.connect(self.framing_dialog)
+        file_menu.addAction(framing_action)
+
+        log_options_action = QAction("Logging Options...", self)
+        log_options_action.triggered.connect(self.log_options_dialog)
+        file_menu.addAction(log_options_action)
+
+        self.raw_capture_action = QAction("Record Raw Capture (.sscap)...", self)
+        self.raw_capture_action.setCheckable(True)
+        self.raw_capture_action.setToolTip("Record every byte sent and received, losslessly and with timestamps")
+        self.raw_capture_action.toggled.connect(self.toggle_raw_capture)
+        file_menu.addAction(self.raw_capture_action)
+
+        self.auto_reconnect_action = QAction("Auto-Reconnect", self)
+        self.auto_reconnect_action.setCheckable(True)
+        self.auto_reconnect_action.setChecked(self.load_config().get('auto_reconnect', False))
+        self.auto_reconnect_action.setToolTip("Reopen the same adapter after it drops, keeping the session")
+        self.auto_reconnect_action.toggled.connect(self.set_auto_reconnect)
+        file_menu.addAction(self.auto_reconnect_action)
         
+        # View Menu
+        view_menu = menubar.addMenu("View")
+
+        self.virtual_terminal_action = QAction("Virtualized Terminal", self)
+        self.virtual_terminal_action.setCheckable(True)
+        self.virtual_terminal_action.setChecked(True)
+        self.virtual_terminal_action.setToolTip("Render only visible lines, so view changes are instant at any scrollback size")
+        self.virtual_terminal_action.toggled.connect(self.set_virtual_terminal)
+        view_menu.addAction(self.virtual_terminal_action)
+
+        view_menu.addSeparator()
+
+        find_action = QAction("Find...", self)
+        find_action.setShortcut("Ctrl+F")
+        find_action.triggered.connect(self.show_search)
+        view_menu.addAction(find_action)
+
+        find_next_action = QAction("Find Next", self)
+        find_next_action.setShortcut("F3")
+        find_next_action.triggered.connect(self.find_next)
+        view_menu.addAction(find_next_action)
+
+        find_previous_action = QAction("Find Previous", self)
+        find_previous_action.setShortcut("Shift+F3")
+        find_previous_action.triggered.connect(self.find_previous)
+        view_menu.addAction(find_previous_action)
+
+        view_menu.addSeparator()
+
+        stats_action = QAction("Link Statistics...", self)
+        stats_action.setShortcut("Ctrl+I")
+        stats_action.triggered.connect(self.show_stats)
+        view_menu.addAction(stats_action)
+
         # Help Menu
         help_menu = menubar.addMenu("Help")
         
@@ -427,15 +804,13 @@ class MainWindow(QMainWindow):
                     return
                 
                 if reply == QMessageBox.StandardButton.Yes:
-                    self.command_manager.commands = imported_commands
+                    self.command_manager.replace_commands(imported_commands)
                 else:
                     # Merge - add only commands that don't already exist
                     existing_names = {cmd['name'] for cmd in self.command_manager.commands}
-                    for cmd in imported_commands:
-                        if cmd['name'] not in existing_names:
-                            self.command_manager.commands.append(cmd)
-                
-                self.command_manager.save_commands()
+                    self.command_manager.add_commands(
+                        cmd for cmd in imported_commands if cmd['name'] not in existing_names)
+
                 self.refresh_commands_list()
                 self.status_bar.showMessage(f"Imported commands from {os.path.basename(file_path)}")
                 
@@ -462,6 +837,101 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", f"Failed to export commands:\n{str(e)}")
 
+    def open_capture(self):
+        """Opens a saved raw capture or text log in a CaptureViewer."""
+        from PyQt6.QtWidgets import QFileDialog
+        from sparkserial.gui.capture_viewer import CaptureViewer
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Capture",
+            os.getcwd(),
+            "Captures and Logs (*.sscap *.txt *.log);;SparkSerial Captures (*.sscap);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            viewer = CaptureViewer(file_path, self)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open capture: {str(e)}")
+            return
+        viewer.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        viewer.replay_data.connect(self.handle_data)
+        viewer.replay_to_port.connect(self.send_replayed)
+        viewer.show()
+
+    def show_sequence_runner(self):
+        """Opens the sequence runner; it runs against the port shown when Run is pressed."""
+        if self.sequence_dialog is None:
+            from sparkserial.core.sequence import make_step
+            from sparkserial.gui.sequence_dialog import SequenceDialog
+
+            self.sequence_dialog = SequenceDialog(self.command_manager, self.sequence_target, self,
+                                                  self.command_model.search_index)
+            # Start with the shortcuts selected in the list, if any
+            for index in self.commands_list.selectionModel().selectedRows():
+                cmd = self.command_model.command(index.row())
+                self.sequence_dialog.add_step(make_step(name=cmd['name'], command=cmd['command'],
+                                                        is_hex=cmd['is_hex']))
+        self.sequence_dialog.show()
+        self.sequence_dialog.raise_()
+
+    def show_stats(self):
+        if self.stats_dialog is None:
+            from sparkserial.gui.stats_dialog import StatsDialog
+
+            self.stats_dialog = StatsDialog(self.stats_target, self.command_manager, self)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+
+    def stats_target(self):
+        session = self.sessions.get(self.port_combo.currentText()) if self.showing_merged else self.session
+        if not session or not session.worker:
+            return None
+        return session.name, session.worker, self.capture_writer
+
+    def sequence_target(self):
+        session = self.sessions.get(self.port_combo.currentText()) if self.showing_merged else self.session
+        if not session or not session.worker:
+            return None
+        return session.worker, self.line_end()
+
+    def send_replayed(self, data):
+        if self.current_worker:
+            self.current_worker.send_data(data)
+
+    def export_session(self):
+        """Export the received data as text, a hex dump or raw bytes."""
+        from PyQt6.QtWidgets import QFileDialog
+
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Session",
+            os.path.join(os.path.expanduser("~"), "sparkserial_session.txt"),
+            "Text Files (*.txt);;Hex Dump (*.hex);;Raw Binary (*.bin)"
+        )
+
+        if file_path:
+            try:
+                start, end = self.capture.base_offset, self.capture.end_offset
+                if selected_filter.startswith("Raw"):
+                    with open(file_path, 'wb') as f:
+                        f.write(self.capture.slice(start, end))
+                else:
+                    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        # Format block by block so large sessions are never copied whole
+                        for block_start in range(start, end, self.EXPORT_BLOCK_BYTES):
+                            block = self.capture.slice(block_start, min(end, block_start + self.EXPORT_BLOCK_BYTES))
+                            if selected_filter.startswith("Hex"):
+                                f.write(hexdump(block, block_start))
+                            else:
+                                f.write(decoder.decode(block))
+                        f.write(decoder.decode(b'', final=True))
+                self.status_bar.showMessage(f"Exported session to {os.path.basename(file_path)}")
+            except Exception as e:
+                QMessageBox.critical(self, "Export Error", f"Failed to export session:\n{str(e)}")
+
     def set_commands_location(self):
         """Allow user to set a custom location for the commands file."""
         from PyQt6.QtWidgets import QFileDialog
@@ -476,9 +946,8 @@ class MainWindow(QMainWindow):
         if file_path:
             try:
                 # Copy current commands to new location
-                with open(file_path, 'w') as f:
-                    json.dump(self.command_manager.commands, f, indent=4)
-                
+                self.command_manager.move_to(file_path)
+
                 # Save the custom path preference
                 config_file = os.path.join(self.command_manager.app_data_dir, "config.json")
                 config = {}
@@ -489,10 +958,7 @@ class MainWindow(QMainWindow):
                 config['commands_file'] = file_path
                 with open(config_file, 'w') as f:
                     json.dump(config, f, indent=4)
-                
-                # Update the command manager to use new location
-                self.command_manager.filename = file_path
-                
+
                 self.status_bar.showMessage(f"Commands location set to: {file_path}")
                 QMessageBox.information(
                     self, 
@@ -503,6 +969,97 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to set location:\n{str(e)}")
 
+    def _config_path(self):
+        return os.path.join(self.command_manager.app_data_dir, "config.json")
+
+    def load_config(self):
+        config_file = self._config_path()
+        if os.path.exists(config_file):
+            try:
+                with open(config_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading config: {e}")
+        return {}
+
+    def save_config(self, config):
+        with open(self._config_path(), 'w') as f:
+            json.dump(config, f, indent=4)
+
+    def log_options_dialog(self):
+        """Edit log rotation settings; they apply the next time logging starts."""
+        config = self.load_config()
+        dialog = LogOptionsDialog(self, config.get('log_rotation'))
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            config['log_rotation'] = dialog.get_data()
+            try:
+                self.save_config(config)
+                self.status_bar.showMessage("Logging options saved")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save logging options:\n{str(e)}")
+
+    def framing_dialog(self):
+        """Configures the frame decoder; applies to the current connection right away."""
+        dialog = FramingDialog(self, self.framing_settings)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        self.framing_settings = dialog.get_data()
+        config = self.load_config()
+        config['framing'] = self.framing_settings
+        try:
+            self.save_config(config)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save frame decoder settings:\n{str(e)}")
+        for worker in self.serial_manager.workers.values():
+            # The worker picks up the new framer with the next chunk
+            worker.framer = make_framer(self.framing_settings)
+        self.frames_dock.setVisible(self.framing_settings.get('type', "Off") != "Off")
+        self.update_frame_stats()
+
+    def set_auto_reconnect(self, enabled):
+        """Saves the setting; it applies to connections made from now on."""
+        config = self.load_config()
+        config['auto_reconnect'] = enabled
+        try:
+            self.save_config(config)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save settings:\n{str(e)}")
+
+    def drain_frames(self):
+        """Appends frames decoded on the serial threads to the Frames panel."""
+        lines = []
+        limit = self.FRAME_DISPLAY_BYTES
+        tag_ports = len(self.sessions) > 1
+        for session in self.sessions.values():
+            frames = session.worker.frames if session.worker else None
+            while frames:
+                timestamp_ns, frame = frames.popleft()
+                self.frame_count += 1
+                shown = to_hex(frame[:limit]) + (" …" if len(frame) > limit else "")
+                port = f"[{session.name}] " if tag_ports else ""
+                lines.append(f"{format_timestamp(timestamp_ns + session.capture.wall_offset_ns)}{port}"
+                             f"#{self.frame_count:<7} {len(frame):>5} B  {shown}\n")
+        if not lines:
+            return
+        store = self.frames_view.store
+        at_bottom = self.frames_view.verticalScrollBar().value() == self.frames_view.verticalScrollBar().maximum()
+        store.append("".join(lines).encode('ascii'))
+        store.trim(max_lines=self.FRAME_HISTORY_LINES)
+        self.frames_view.refresh()
+        if at_bottom:
+            self.frames_view.verticalScrollBar().setValue(self.frames_view.verticalScrollBar().maximum())
+        self.update_frame_stats()
+
+    def update_frame_stats(self):
+        framer = self.current_worker.framer if self.current_worker else None
+        if not framer:
+            self.frames_stats_label.setText(f"{self.frame_count} frames")
+            return
+        text = f"{framer.frames} frames  |  CRC errors: {framer.crc_errors}  |  Bad frames: {framer.bad_frames}"
+        if self.current_worker.dropped_frames:
+            text += f"  |  Dropped: {self.current_worker.dropped_frames}"
+        self.frames_stats_label.setText(text)
+
     def show_commands_location(self):
         """Show the current location of the commands file."""
         location = self.command_manager.filename
@@ -532,6 +1089,25 @@ class MainWindow(QMainWindow):
     def apply_styles(self):
         self.setStyleSheet(get_stylesheet())
 
+    def closeEvent(self, event):
+        if self.sequence_dialog:
+            self.sequence_dialog.close()
+        for session in list(self.sessions.values()):
+            self.disconnect_serial(session)
+        self.serial_manager.close()
+        self.port_monitor.stop()
+        self.command_manager.close()
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+        if self.capture_writer:
+            self.capture_writer.close()
+            self.capture_writer = None
+        if self.search:
+            self.search.stop()
+            self.search = None
+        super().closeEvent(event)
+
     def eventFilter(self, obj, event):
         """Handle Up/Down arrow keys for command history navigation."""
         from PyQt6.QtCore import QEvent
@@ -557,20 +1133,53 @@ class MainWindow(QMainWindow):
         return super().eventFilter(obj, event)
 
     def refresh_ports(self):
-        current_port = self.port_combo.currentText()
-        self.port_combo.clear()
-        ports = self.serial_manager.get_available_ports()
-        self.port_combo.addItems(ports)
-        if current_port in ports:
-            self.port_combo.setCurrentText(current_port)
-
+        # The list updates through update_ports when the scan finishes
+        self.port_monitor.rescan()
+
+    def update_ports(self, ports, added, removed):
+        """Applies a PortMonitor change to the Port box without disturbing the selection."""
+        for port in removed:
+            index = self.port_combo.findText(port['device'])
+            # A port with an open session stays listed so it can be disconnected
+            if index >= 0 and port['device'] not in self.sessions:
+                self.port_combo.removeItem(index)
+        for port in added:
+            device = port['device']
+            index = self.port_combo.findText(device)
+            if index < 0:
+                index = 0
+                while index < self.port_combo.count() and self.port_combo.itemText(index) < device:
+                    index += 1
+                self.port_combo.insertItem(index, device)
+            tooltip = port['description'] if port['hwid'] in ("", "n/a") else f"{port['description']}\n{port['hwid']}"
+            self.port_combo.setItemData(index, tooltip, Qt.ItemDataRole.ToolTipRole)
+
+
+    @property
+    def current_worker(self):
+        """Worker of the session shown in the terminal, or None."""
+        return self.session.worker
 
     def toggle_connection(self):
-        if self.current_worker:
-            self.disconnect_serial()
+        """Connects or disconnects the port selected in the Port box."""
+        session = self.sessions.get(self.port_combo.currentText())
+        if session and session.worker:
+            self.disconnect_serial(session)
         else:
             self.connect_serial()
 
+    def update_connect_button(self):
+        session = self.sessions.get(self.port_combo.currentText())
+        connected = bool(session and session.worker)
+        self.connect_btn.setText("Disconnect" if connected else "Connect")
+        name = "disconnectButton" if connected else "connectButton"
+        if self.connect_btn.objectName() != name:
+            self.connect_btn.setObjectName(name)
+            # Re-evaluate the stylesheet for this button only; re-applying
+            # the window's stylesheet restyles every widget
+            self.connect_btn.style().unpolish(self.connect_btn)
+            self.connect_btn.style().polish(self.connect_btn)
+
     def toggle_logging(self, enabled):
         if enabled:
             from PyQt6.QtWidgets import QFileDialog
@@ -593,8 +1202,21 @@ class MainWindow(QMainWindow):
             if file_path:
                 try:
                     self.log_path = file_path
-                    self.log_file = open(self.log_path, "a", encoding="utf-8")
-                    self.status_bar.showMessage(f"Logging to: {os.path.basename(self.log_path)}")
+                    rotation = self.load_config().get('log_rotation', {})
+                    compress = rotation.get('compress', "None")
+                    self.log_file = LogWriter(
+                        self.log_path,
+                        max_bytes=rotation.get('max_mb', 0) * 1024 * 1024,
+                        max_seconds=rotation.get('interval_min', 0) * 60,
+                        compress=None if compress == "None" else compress,
+                        retention=rotation.get('retention', 0)
+                    )
+                    for session in self.sessions.values():
+                        session.log_at_newline = True
+                    self.session.log_at_newline = True
+                    self.log_status_timer.start()
+                    rotating = " (rotating segments)" if self.log_file.rotating else ""
+                    self.status_bar.showMessage(f"Logging to: {os.path.basename(self.log_path)}{rotating}")
                 except Exception as e:
                     self.status_bar.showMessage(f"Logging Error: {str(e)}")
                     self.logging_check.setChecked(False)
@@ -605,8 +1227,71 @@ class MainWindow(QMainWindow):
             if self.log_file:
                 self.log_file.close()
                 self.log_file = None
+                if not self.capture_writer:
+                    self.log_status_timer.stop()
+                self.update_log_status()
                 self.status_bar.showMessage("Logging stopped")
 
+    def toggle_raw_capture(self, enabled):
+        if enabled:
+            from PyQt6.QtWidgets import QFileDialog
+            from datetime import datetime
+
+            default_name = f"capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.sscap"
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Select Capture File Location",
+                os.path.join(os.getcwd(), default_name),
+                "SparkSerial Captures (*.sscap);;All Files (*)"
+            )
+            if not file_path:
+                self.raw_capture_action.setChecked(False)
+                return
+            try:
+                self.capture_writer = CaptureWriter(file_path)
+            except Exception as e:
+                self.status_bar.showMessage(f"Capture Error: {str(e)}")
+                self.raw_capture_action.setChecked(False)
+                return
+            for session in self.sessions.values():
+                if session.worker:
+                    self._add_capture_tap(session.worker, session, self.capture_writer)
+            self.log_status_timer.start()
+            self.status_bar.showMessage(f"Recording raw capture to: {os.path.basename(file_path)}")
+        elif self.capture_writer:
+            for worker in self.serial_manager.workers.values():
+                worker.set_tap("capture", None)
+            self.capture_writer.close()
+            records = self.capture_writer.record_count
+            self.capture_writer = None
+            if not self.log_file:
+                self.log_status_timer.stop()
+            self.update_log_status()
+            self.status_bar.showMessage(f"Raw capture stopped ({records} records)")
+
+    @staticmethod
+    def _add_capture_tap(worker, session, writer):
+        worker.set_tap("capture", writer.tap(session.port_id, session.name))
+
+    def update_log_status(self):
+        """Shows log and capture writer backlog and drops in the status bar, if there are any."""
+        parts = []
+        if self.log_file:
+            if self.log_file.backlog_bytes > LogWriter.FLUSH_BYTES:
+                parts.append(f"Log backlog: {self.log_file.backlog_bytes // 1024} KB")
+            if self.log_file.dropped_bytes:
+                parts.append(f"Log dropped: {self.log_file.dropped_bytes} B")
+            if self.log_file.error:
+                parts.append(f"Log error: {self.log_file.error}")
+        capture = self.capture_writer
+        if capture:
+            parts.append(f"Capture: {capture.written_bytes / (1024 * 1024):.1f} MB")
+            if capture.dropped_bytes:
+                parts.append(f"Capture dropped: {capture.dropped_bytes} B")
+            if capture.error:
+                parts.append(f"Capture error: {capture.error}")
+        self.log_status_label.setText("  ".join(parts))
+
     def connect_serial(self):
         port = self.port_combo.currentText()
         if not port:
@@ -626,79 +1311,355 @@ class MainWindow(QMainWindow):
             'flowcontrol': self.flow_combo.currentText()
         }
 
-        self.current_worker = self.serial_manager.connect(settings)
-        if self.current_worker:
-            self.current_worker.data_received.connect(self.handle_data)
-            self.current_worker.error_occurred.connect(self.handle_error)
-            self.current_worker.connection_status.connect(self.update_connection_ui)
-            
-            self.connect_btn.setText("Disconnect")
-            self.connect_btn.setObjectName("disconnectButton")
-            self.apply_styles()
-            self.status_bar.showMessage(f"Connected to {port}")
-
-    def disconnect_serial(self):
-        self.serial_manager.disconnect()
-        self.current_worker = None
-        self.connect_btn.setText("Connect")
-        self.connect_btn.setObjectName("connectButton")
-        self.apply_styles()
-        self.status_bar.showMessage("Disconnected")
-
-    @pyqtSlot(bool)
-    def update_connection_ui(self, connected):
-        if not connected:
-            self.disconnect_serial()
+        if self.serial_manager.is_connected(port):
+            self.status_bar.showMessage(f"Error: {port} is already connected")
+            return
 
-    @pyqtSlot(bytes)
-    def handle_data(self, data):
-        from datetime import datetime
-        now = datetime.now()
-        
-        if self.hex_view_check.isChecked():
-            text = " ".join([f"{b:02X}" for b in data]) + " "
+        session = self.sessions.get(port)
+        if not session:
+            if not self.sessions and not self.session.name:
+                # The first connection adopts whatever the terminal already shows
+                session = self.session
+                session.name = port
+                session.port_id = 0
+            else:
+                session = PortSession(port, CaptureStore(),
+                                      max((s.port_id for s in self.sessions.values()), default=-1) + 1)
+            self.sessions[port] = session
+            self.merged_view.add_source(port, session.capture)
+        session.rx_overflow_reported = 0
+        session.reconnect = self.auto_reconnect_action.isChecked()
+
+        def setup(worker):
+            # Runs before the port opens, so no signal is missed. It runs
+            # again for each new worker when the connection is reopened, on
+            # the reconnect thread, so it only wires up the worker; the
+            # session takes it on the GUI thread (see port_reconnected).
+            writer = self.capture_writer
+            if writer:
+                self._add_capture_tap(worker, session, writer)
+            worker.framer = make_framer(self.framing_settings)
+            self.relay.connect(worker.error_occurred, lambda message: self.handle_error(
+                f"{port}: {message}" if len(self.sessions) > 1 else message, session))
+            self.relay.connect(worker.connection_status, lambda connected, worker=worker:
+                               self.port_status_changed(session, worker, connected))
+            self.relay.connect(worker.data_sent, lambda _data, timestamp_ns, text:
+                               self.log_sent(session, timestamp_ns, text))
+
+        session.worker = self.serial_manager.connect(settings, setup=setup, reconnect=session.reconnect)
+        self.rx_timer.start()
+        self.stats_timer.start()
+
+        self._update_port_tabs()
+        if session is not self.session:
+            self.select_session(session)
+        self.update_connect_button()
+        self.status_bar.showMessage(f"Connected to {port}")
+
+    def disconnect_serial(self, session=None):
+        session = session or self.session
+        if not session.worker:
+            return
+        self.serial_manager.disconnect(session.name)
+        # Show anything received before the port closed
+        self.drain_rx()
+        session.worker = None
+        if not self.serial_manager.connections:
+            self.rx_timer.stop()
+            self.stats_timer.stop()
+        if self.log_file:
+            # Make sure the session so far is on disk
+            self.log_file.sync()
+        self.update_connect_button()
+        self.update_port_stats()
+        self.status_bar.showMessage(f"Disconnected from {session.name}")
+
+    def log_sent(self, session, timestamp_ns, text):
+        """Logs a sent command, stamped with when it was actually written. Replayed data has no text."""
+        if text is None or not self.log_file or not self.log_sent_check.isChecked():
+            return
+        wall_ns = session.capture.wall_offset_ns + timestamp_ns
+        self.log_file.write(f"{self._log_prefix('TX', session, format_timestamp(wall_ns))}{text}\n", wall_ns / 1e9)
+        session.log_at_newline = True
+
+    def port_status_changed(self, session, worker, connected):
+        # Ignore a late report from a worker the session has since replaced,
+        # and drops the manager is reconnecting (see port_reconnecting)
+        if not connected and session.worker is worker and not self.serial_manager.is_reconnecting(session.name):
+            self.disconnect_serial(session)
+
+    def _mark_gap(self, session, note):
+        """Records a reconnect marker in the raw capture and the log; the terminal data stays continuous."""
+        if self.capture_writer:
+            self.capture_writer.record(time.monotonic_ns(), EVENT, session.port_id, note.encode('utf-8'))
+        if self.log_file:
+            wall_ns = time.time_ns()
+            line = f"{self._log_prefix('--', session, format_timestamp(wall_ns))}{note}\n"
+            # Finish a partial RX line first
+            self.log_file.write(line if session.log_at_newline else "\n" + line, wall_ns / 1e9)
+            session.log_at_newline = True
+
+    def port_reconnecting(self, name, attempt):
+        session = self.sessions.get(name)
+        if not session:
+            return
+        if attempt == 0:
+            # Show what arrived before the drop; the new worker continues the same buffer
+            self.drain_rx()
+            self._mark_gap(session, "Connection lost; reconnecting")
+            self.status_bar.showMessage(f"{name}: connection lost, reconnecting...")
         else:
-            try:
-                text = data.decode('utf-8', errors='replace')
-            except:
-                text = str(data)
+            self.status_bar.showMessage(f"{name}: reconnecting (attempt {attempt})...")
+
+    def port_reconnected(self, name, worker, gap_seconds):
+        session = self.sessions.get(name)
+        if not session or not session.worker:
+            return  # Disconnected since
+        session.worker = worker
+        moved = f" as {worker.port_name}" if worker.port_name != name else ""
+        self._mark_gap(session, f"Reconnected{moved} after {gap_seconds:.2f} s")
+        self.update_connect_button()
+        self.update_port_stats()
+        self.status_bar.showMessage(f"Reconnected to {name}{moved} after {gap_seconds:.2f} s")
+
+    # Port sessions and tabs
+
+    def _update_port_tabs(self):
+        """Rebuilds the tab bar: "All Ports" then one tab per session, shown from two sessions."""
+        self.port_tabs.blockSignals(True)
+        while self.port_tabs.count():
+            self.port_tabs.removeTab(0)
+        if len(self.sessions) > 1:
+            self.port_tabs.addTab("All Ports")
+            # The merged view cannot be closed
+            self.port_tabs.setTabButton(0, QTabBar.ButtonPosition.RightSide, None)
+            for name in self.sessions:
+                self.port_tabs.addTab(name)
+            names = list(self.sessions)
+            self.port_tabs.setCurrentIndex(0 if self.showing_merged else names.index(self.session.name) + 1)
+        self.port_tabs.blockSignals(False)
+        self.port_tabs.setVisible(len(self.sessions) > 1)
+
+    def select_port_tab(self, index):
+        if index == 0:
+            self.show_merged_view()
+        elif index > 0:
+            self.select_session(list(self.sessions.values())[index - 1])
+
+    def select_session(self, session):
+        """Shows session in the terminal; search, export and send then apply to it."""
+        self.session = session
+        self.capture = session.capture
+        self.capture_view = session.capture_view
+        self.showing_merged = False
+        if isinstance(self.terminal, TerminalView):
+            self.terminal.set_source(self.capture_view)
+        self.rerender_terminal()
+        self._update_port_tabs()
+        if self.search:
+            self.start_search()
+        self.update_frame_stats()
+        self.update_port_stats()
+
+    def show_merged_view(self):
+        """Shows every port's lines interleaved by arrival time (virtualized terminal only)."""
+        self.showing_merged = True
+        self.virtual_terminal_action.setChecked(True)
+        self.merged_view.update()
+        self.terminal.set_source(self.merged_view)
+        self.rerender_terminal()
+        self._update_port_tabs()
+
+    def close_port_tab(self, index):
+        """Disconnects the tab's port and discards its data."""
+        if index <= 0:
+            return
+        session = list(self.sessions.values())[index - 1]
+        self.disconnect_serial(session)
+        del self.sessions[session.name]
+        self.merged_view.remove_source(session.name)
+        if session is self.session:
+            self.select_session(next(iter(self.sessions.values())))
+        else:
+            self._update_port_tabs()
+        if len(self.sessions) < 2 and self.showing_merged:
+            self.select_session(self.session)
+        self.update_connect_button()
+
+    def update_port_stats(self):
+        """Shows RX/TX totals of the shown port, and of every port in the tab tooltips."""
+        for index, session in enumerate(self.sessions.values()):
+            worker = session.worker
+            tip = f"RX {worker.rx_bytes} B, TX {worker.tx_bytes} B" if worker else "Disconnected"
+            self.port_tabs.setTabToolTip(index + 1, tip)
+        worker = self.session.worker
+        if worker and not self.showing_merged:
+            stats = f"RX: {worker.rx_bytes / 1024:.1f} KB  TX: {worker.tx_bytes / 1024:.1f} KB"
+            if worker.tx_queue_bytes:
+                stats += f"  TX queue: {worker.tx_queue_bytes} B"
+            self.port_stats_label.setText(stats)
+        elif self.showing_merged:
+            connected = [s.worker for s in self.sessions.values() if s.worker]
+            self.port_stats_label.setText(f"{len(connected)} ports  RX: {sum(w.rx_bytes for w in connected) / 1024:.1f} KB")
+        else:
+            self.port_stats_label.clear()
+
+    def drain_rx(self):
+        """Hands everything buffered by each worker to handle_chunks in one batch."""
+        for session in list(self.sessions.values()):
+            if not session.worker:
+                continue
+            rx_buffer = session.worker.rx_buffer
+            chunks = rx_buffer.read_chunks()
+            if chunks:
+                stats = session.worker.stats
+                stats.render_backlog.add(sum(len(data) for _timestamp_ns, data in chunks))
+                if chunks[0][0] is not None:
+                    stats.render_delay.add((time.monotonic_ns() - chunks[0][0]) // 1000)
+                self.handle_chunks(chunks, session)
+            if rx_buffer.overflow_bytes != session.rx_overflow_reported:
+                session.rx_overflow_reported = rx_buffer.overflow_bytes
+                self.status_bar.showMessage(f"{session.name}: RX buffer overflow: {rx_buffer.overflow_bytes} bytes dropped")
+        self.drain_frames()
+        if len(self.sessions) > 1 and self.merged_view.update() and self.showing_merged:
+            self.terminal.refresh()
+            if self.autoscroll_check.isChecked():
+                self.terminal.verticalScrollBar().setValue(self.terminal.verticalScrollBar().maximum())
+
+    def handle_data(self, data, timestamp_ns=None):
+        self.handle_chunks([(timestamp_ns, data)])
+
+    def handle_chunks(self, chunks, session=None):
+        """
+        Appends received (timestamp_ns, bytes) chunks, stamped by the serial
+        thread when they were read (None means now). Lines that start in a
+        chunk are prefixed with that chunk's time, so every line shows when
+        its first byte arrived however late the GUI gets to it.
+
+        session defaults to the one shown; other sessions' data is only
+        stored and logged.
+        """
+        session = session or self.session
+        if session is not self.session or self.showing_merged:
+            self._store_chunks(chunks, session)
+            return
+
+        classic = not isinstance(self.terminal, TerminalView)
+        hex_view = self.hex_view_check.isChecked()
+        timestamps = self.timestamp_check.isChecked()
+        display_parts = []
+
+        for timestamp_ns, data in chunks:
+            start = self.capture.end_offset
+            self.capture.append(data, timestamp_ns)
+            if not (classic or self.log_file):
+                continue
+            wall_ns = self.capture.wall_time_at(start)
+            timestamp_str = format_timestamp(wall_ns)
+            # The incremental decoder holds back a character split across chunks
+            text = hex_rows(data, start) if hex_view else session.decoder.decode(data)
+            if not text:
+                continue
+
+            if classic:
+                if timestamps:
+                    display_parts.append(self._prefix_lines(text, timestamp_str, self._term_at_newline))
+                else:
+                    display_parts.append(text)
+                self._term_at_newline = text.endswith('\n')
+
+            if self.log_file:
+                # Always timestamp logs for better utility; stamped per chunk for the rotation manifest
+                self.log_file.write(self._prefix_lines(text, self._log_prefix("RX", session, timestamp_str),
+                                                       session.log_at_newline), wall_ns / 1e9)
+                session.log_at_newline = text.endswith('\n')
 
-        timestamp_str = now.strftime("[%H:%M:%S.%f] ")[:-4] + "] "
-        
         # Display logic
-        display_text = text
-        if self.timestamp_check.isChecked():
-            if not self.terminal.toPlainText() or self.terminal.toPlainText().endswith('\n'):
-                display_text = timestamp_str + display_text
-            display_text = display_text.replace('\n', f'\n{timestamp_str}')
+        if not classic:
+            # Renders straight from the capture store; nothing to format here
+            vbar = self.terminal.verticalScrollBar()
+            top_offset = self.capture_view.row_offset(min(vbar.value(), len(self.capture_view) - 1))
+            if self._trim_capture():
+                # Keep the rows being read in place as older ones are dropped
+                vbar.setValue(self.capture_view.row_index(max(top_offset, self.capture.base_offset)))
+            self.terminal.refresh()
+        elif display_parts:
+            self.terminal.moveCursor(QTextCursor.MoveOperation.End)
+            self.terminal.insertPlainText("".join(display_parts))
+            if self._scrollback_chars:
+                self._trim_terminal_chars()
+            self._trim_capture()
 
-        self.terminal.moveCursor(QTextCursor.MoveOperation.End)
-        self.terminal.insertPlainText(display_text)
-        
         if self.autoscroll_check.isChecked():
             self.terminal.verticalScrollBar().setValue(self.terminal.verticalScrollBar().maximum())
 
-        # Logging logic
-        if self.log_file:
-            log_entry = text
-            if self.timestamp_check.isChecked() or True: # Always timestamp logs for better utility
-                if not hasattr(self, '_log_at_newline') or self._log_at_newline:
-                    log_entry = f"RX {timestamp_str}{log_entry}"
-                log_entry = log_entry.replace('\n', f'\nRX {timestamp_str}')
-                self._log_at_newline = text.endswith('\n')
-            
-            self.log_file.write(log_entry)
-            self.log_file.flush()
+        if self.search:
+            self.search.notify()
+
+    def _store_chunks(self, chunks, session):
+        """Stores (and logs) chunks for a session that is not being displayed."""
+        capture = session.capture
+        for timestamp_ns, data in chunks:
+            start = capture.end_offset
+            capture.append(data, timestamp_ns)
+            if self.log_file:
+                text = session.decoder.decode(data)
+                if text:
+                    wall_ns = capture.wall_time_at(start)
+                    prefix = self._log_prefix("RX", session, format_timestamp(wall_ns))
+                    self.log_file.write(self._prefix_lines(text, prefix, session.log_at_newline), wall_ns / 1e9)
+                    session.log_at_newline = text.endswith('\n')
+        self._trim_capture(capture)
+        if session is self.session and self.search:
+            self.search.notify()
+
+    def _log_prefix(self, direction, session, timestamp_str):
+        """Log line prefix; names the port once several are connected."""
+        if len(self.sessions) > 1:
+            return f"{direction} [{session.name}] {timestamp_str}"
+        return f"{direction} {timestamp_str}"
+
+    @staticmethod
+    def _prefix_lines(text, prefix, at_line_start):
+        """
+        Inserts prefix at the start of every line that begins inside text.
+        at_line_start tells whether the previous chunk ended with a newline,
+        so the state is carried incrementally instead of re-reading the
+        terminal contents.
+        """
+        prefixed = text.replace('\n', '\n' + prefix)
+        if text.endswith('\n'):
+            # The next line has not started yet; it gets its prefix when it arrives
+            prefixed = prefixed[:-len(prefix)]
+        if at_line_start:
+            prefixed = prefix + prefixed
+        return prefixed
 
     @pyqtSlot(str)
-    def handle_error(self, message):
+    def handle_error(self, message, session=None):
+        worker = session.worker if session else None
+        if session and session.reconnect and worker and (worker.opened or self.serial_manager.is_reconnecting(session.name)):
+            # A drop the manager reopens, or a failed reopen attempt; a
+            # failed first open is reported and disconnected as usual
+            self.status_bar.showMessage(f"Error: {message}")
+            return
+        self.disconnect_serial(session)
+        # After disconnecting, so the error is what stays in the status bar
         self.status_bar.showMessage(f"Error: {message}")
-        self.disconnect_serial()
+
+    def line_end(self):
+        """The line ending chosen in the EOL box, as bytes."""
+        return {"CR": b'\r', "LF": b'\n', "CR+LF": b'\r\n'}.get(self.line_ending_combo.currentText(), b'')
 
     def send_command(self):
-        if not self.current_worker:
+        # From the All Ports view, send to the port selected in the Port box
+        session = self.sessions.get(self.port_combo.currentText()) if self.showing_merged else self.session
+        if not session or not session.worker:
             self.status_bar.showMessage("Error: Not connected")
             return
+        if self.serial_manager.is_reconnecting(session.name):
+            self.status_bar.showMessage(f"Error: {session.name} is reconnecting")
+            return
 
         command = self.command_input.currentText().strip()
         if not command:
@@ -726,47 +1687,224 @@ class MainWindow(QMainWindow):
             else:
                 data = command.encode('utf-8')
                 
-            # Add line ending
-            ending = self.line_ending_combo.currentText()
-            line_end = b''
-            if ending == "CR":
-                line_end = b'\r'
-            elif ending == "LF":
-                line_end = b'\n'
-            elif ending == "CR+LF":
-                line_end = b'\r\n'
-            
-            full_data = data + line_end
+            full_data = data + self.line_end()
 
-            self.current_worker.send_data(full_data)
-            
-            # Log sent command
-            if self.log_file and self.log_sent_check.isChecked():
-                from datetime import datetime
-                ts = datetime.now().strftime("[%H:%M:%S.%f] ")[:-4] + "] "
-                sent_text = command
-                if self.send_hex_check.isChecked():
-                    sent_text = f"HEX({command})"
-                self.log_file.write(f"TX {ts}{sent_text}\n")
-                self.log_file.flush()
-                self._log_at_newline = True
+            # Logged by log_sent() once the serial thread has written it
+            session.worker.send_data(full_data, command_label(command, self.send_hex_check.isChecked()))
 
             # Input is already cleared above
         except Exception as e:
             self.status_bar.showMessage(f"Send Error: {str(e)}")
 
+    def set_virtual_terminal(self, enabled):
+        """Swaps the terminal widget between QPlainTextEdit and TerminalView."""
+        if enabled == isinstance(self.terminal, TerminalView):
+            return
+        new_terminal = TerminalView() if enabled else QPlainTextEdit()
+        new_terminal.setReadOnly(True)
+        if enabled:
+            new_terminal.set_source(self.merged_view if self.showing_merged else self.capture_view)
+        elif self.showing_merged:
+            # The classic view can only show a single port
+            self.showing_merged = False
+            self._update_port_tabs()
+        self.right_layout.replaceWidget(self.terminal, new_terminal)
+        self.terminal.deleteLater()
+        self.terminal = new_terminal
+
+        self.set_scrollback(self.scrollback_combo.currentIndex())
+        self.rerender_terminal()
+
+    def rerender_terminal(self):
+        """Re-renders the captured data with the current Hex View / Timestamps settings."""
+        self.capture_view.hex_view = self.merged_view.hex_view = self.hex_view_check.isChecked()
+        self.capture_view.timestamps = self.merged_view.timestamps = self.timestamp_check.isChecked()
+        for session in self.sessions.values():
+            session.capture_view.hex_view = self.capture_view.hex_view
+            session.capture_view.timestamps = self.capture_view.timestamps
+        if isinstance(self.terminal, TerminalView):
+            self.terminal.refresh()
+        else:
+            # Only render what the classic view could hold anyway
+            kind, limit = self.scrollback_combo.currentData()
+            max_lines = limit if kind == "lines" else self.CLASSIC_RENDER_LINES
+            self.terminal.setPlainText(self.capture_view.tail_text(min(max_lines, self.CLASSIC_RENDER_LINES)))
+        self._term_at_newline = self.capture_view.at_line_start()
+        self.terminal.verticalScrollBar().setValue(self.terminal.verticalScrollBar().maximum())
+
+    def set_scrollback(self, index):
+        """Applies the scrollback cap selected in the terminal settings row."""
+        kind, limit = self.scrollback_combo.itemData(index)
+        if isinstance(self.terminal, TerminalView):
+            kind = None
+        # QPlainTextEdit evicts the oldest blocks itself once a block limit is set
+        self.terminal.setMaximumBlockCount(limit if kind == "lines" else 0)
+        self._scrollback_chars = limit if kind == "chars" else 0
+        if self._scrollback_chars:
+            self._trim_terminal_chars()
+        for session in self.sessions.values():
+            self._trim_capture(session.capture)
+        self._trim_capture()
+
+    def _trim_capture(self, capture=None):
+        """
+        Keeps a raw capture (default: the shown one) within the scrollback
+        cap, in either terminal view. Returns the number of lines dropped.
+        """
+        capture = capture or self.capture
+        kind, limit = self.scrollback_combo.currentData()
+        if kind == "lines":
+            return capture.trim(max_lines=limit)
+        if kind == "chars":
+            return capture.trim(max_bytes=limit)
+        return 0
+
+    def _trim_terminal_chars(self):
+        """Drops whole lines from the top once the terminal exceeds its size cap."""
+        document = self.terminal.document()
+        excess = document.characterCount() - self._scrollback_chars
+        if excess <= 0:
+            return
+        # Trim an extra 10% so the removal cost is amortised over many chunks
+        excess += self._scrollback_chars // 10
+        cursor = QTextCursor(document)
+        cursor.setPosition(min(excess, document.characterCount() - 1), QTextCursor.MoveMode.KeepAnchor)
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+
     def clear_terminal(self):
+        """Clears the shown port, or every port in the All Ports view."""
+        sessions = list(self.sessions.values()) if self.showing_merged else [self.session]
+        for session in sessions:
+            session.capture.clear()
+            session.decoder.reset()
+        # Their merged rows refer to lines that no longer exist
+        merged = [session for session in sessions if session.name in self.sessions]
+        self.merged_view.remove_sources(session.name for session in merged)
+        for session in merged:
+            self.merged_view.add_source(session.name, session.capture)
         self.terminal.clear()
+        self._term_at_newline = True
+        if self.search:
+            self.start_search()
+
+    # Session Search
+
+    def show_search(self):
+        self.search_bar.show()
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+
+    def close_search(self):
+        self.search_bar.hide()
+        self.search_input.clear()
+        self.start_search()
+
+    def start_search(self):
+        """(Re)starts the background search for the current query."""
+        self.search_debounce.stop()
+        if self.search:
+            self.search.stop()
+            self.search = None
+        self._search_match = None
+        query = self.search_input.text()
+        if not query:
+            self.search_status_timer.stop()
+            self.search_count_label.clear()
+            return
+        try:
+            pattern = compile_pattern(query, self.search_mode_combo.currentText(),
+                                      ignore_case=not self.search_case_check.isChecked())
+        except ValueError as e:
+            self.search_status_timer.stop()
+            self.search_count_label.setText(str(e))
+            return
+        self.search = SessionSearch(self.capture, pattern)
+        self.search_status_timer.start()
+        self.update_search_status()
+
+    def update_search_status(self):
+        search = self.search
+        if not search:
+            return
+        text = f"{search.count} matches"
+        if self._search_match:
+            text = f"{search.match_number(self._search_match[0])} of {search.count}"
+        if not search.caught_up:
+            scanned = search.searched_end - self.capture.base_offset
+            text += f" (searching {scanned * 100 // max(1, self.capture.size)}%)"
+        self.search_count_label.setText(text)
+
+    def find_next(self):
+        self._go_to_match(forward=True)
+
+    def find_previous(self):
+        self._go_to_match(forward=False)
+
+    def _go_to_match(self, forward):
+        if not self.search:
+            self.show_search()
+            return
+        if self._search_match:
+            position = self._search_match[0]
+        else:
+            # Start from the top of the visible rows
+            position = self.capture_view.row_offset(self.terminal.verticalScrollBar().value()) \
+                if isinstance(self.terminal, TerminalView) else self.capture.end_offset
+            position += -1 if forward else 1
+        match = self.search.next_match(position) if forward else self.search.prev_match(position)
+        if not match:
+            return
+        self._search_match = match
+        # Matches are located by capture offset, which only the virtualized view can address
+        self.virtual_terminal_action.setChecked(True)
+        self.autoscroll_check.setChecked(False)
+        first = self.capture_view.row_index(match[0])
+        self.terminal.scroll_to_line(first)
+        self.terminal.select_lines(first, self.capture_view.row_index(match[1] - 1))
+        self.update_search_status()
 
     # Saved Commands Methods
     def refresh_commands_list(self):
-        self.commands_list.clear()
-        for cmd in self.command_manager.get_commands():
-            display_text = f"{cmd['name']} : {cmd['command']}"
-            item = QListWidgetItem(display_text)
-            tooltip = f"Command: {cmd['command']}\nType: {'Hex' if cmd['is_hex'] else 'Text'}"
-            item.setToolTip(tooltip)
-            self.commands_list.addItem(item)
+        """Re-reads the whole library; single edits update the model in place instead."""
+        self.command_model.reload()
+        self.refresh_command_tags()
+
+    def refresh_command_tags(self):
+        current = self.command_tag_combo.currentText()
+        tags = self.command_model.tags()
+        self.command_tag_combo.blockSignals(True)
+        self.command_tag_combo.clear()
+        self.command_tag_combo.addItem("All Tags")
+        self.command_tag_combo.addItems(tags)
+        if current in tags:
+            self.command_tag_combo.setCurrentText(current)
+        self.command_tag_combo.blockSignals(False)
+        if current != self.command_tag_combo.currentText():
+            self.filter_commands()
+
+    def filter_commands(self):
+        tag = self.command_tag_combo.currentText() if self.command_tag_combo.currentIndex() > 0 else None
+        self.command_model.set_filter(self.command_search_input.text(), tag)
+        self.update_command_count()
+
+    def update_command_count(self):
+        total = len(self.command_manager.get_commands())
+        shown = self.command_model.rowCount()
+        if not self.command_model.query and not self.command_model.tag:
+            self.command_count_label.setText(f"{total} commands")
+        elif self.command_model.searching:
+            self.command_count_label.setText(f"{shown}+ of {total} commands")
+        else:
+            self.command_count_label.setText(f"{shown} of {total} commands")
+
+    def selected_command_index(self):
+        """Library position of the current command, or -1."""
+        index = self.commands_list.currentIndex()
+        if not index.isValid():
+            return -1
+        return self.command_model.command_index(index.row())
     
     def bulk_replace_dialog(self):
         dialog = BulkReplaceDialog(self)
@@ -784,13 +1922,14 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             data = dialog.get_data()
             if data['name'] and data['command']:
-                self.command_manager.add_command(data['name'], data['command'], data['is_hex'])
-                self.refresh_commands_list()
+                self.command_model.add_command(data['name'], data['command'], data['is_hex'], data['tags'])
+                self.refresh_command_tags()
+                self.update_command_count()
             else:
                 QMessageBox.warning(self, "Invalid Input", "Name and Command cannot be empty.")
 
     def edit_command_dialog(self):
-        index = self.commands_list.currentRow()
+        index = self.selected_command_index()
         if index < 0:
             QMessageBox.information(self, "Selection Required", "Please select a command to edit.")
             return
@@ -800,11 +1939,13 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.DialogCode.Accepted:
             data = dialog.get_data()
             if data['name'] and data['command']:
-                self.command_manager.update_command(index, data['name'], data['command'], data['is_hex'])
-                self.refresh_commands_list()
+                self.command_model.update_command(index, data['name'], data['command'], data['is_hex'],
+                                                  data['tags'])
+                self.refresh_command_tags()
+                self.update_command_count()
 
     def delete_command(self):
-        index = self.commands_list.currentRow()
+        index = self.selected_command_index()
         if index < 0:
             return
             
@@ -815,12 +1956,12 @@ class MainWindow(QMainWindow):
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            self.command_manager.delete_command(index)
-            self.refresh_commands_list()
+            self.command_model.delete_command(index)
+            self.refresh_command_tags()
+            self.update_command_count()
 
-    def load_saved_command(self, item):
-        index = self.commands_list.row(item)
-        cmd_info = self.command_manager.get_commands()[index]
+    def load_saved_command(self, index):
+        cmd_info = self.command_model.command(index.row())
         self.command_input.setCurrentText(cmd_info['command'])
         self.send_hex_check.setChecked(cmd_info['is_hex'])
 
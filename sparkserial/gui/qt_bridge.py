@@ -0,0 +1,21 @@
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+
+class QtRelay(QObject):
+    """
+    Delivers core signals (core.events.Signal), which fire on serial and
+    runner threads, to callbacks on the thread this object lives in, i.e.
+    the GUI thread, through a queued Qt connection.
+    """
+
+    _fired = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fired.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    def connect(self, signal, callback):
+        signal.connect(lambda *args: self._fired.emit(callback, args))
+
+    def _deliver(self, callback, args):
+        callback(*args)
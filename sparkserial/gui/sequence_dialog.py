@@ -0,0 +1,239 @@
+import os
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+                             QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit,
+                             QAbstractItemView, QDialogButtonBox)
+from PyQt6.QtCore import Qt
+from sparkserial.core.search import SEARCH_MODES
+from sparkserial.core.sequence import SequenceRunner, make_step, load_sequence, save_sequence
+from sparkserial.gui.command_model import CommandListModel
+from sparkserial.gui.qt_bridge import QtRelay
+from sparkserial.gui.styles import get_stylesheet
+from sparkserial.gui.widgets import CommandListView
+
+
+class ShortcutPicker(QDialog):
+    """
+    Picks saved commands with the command panel's fuzzy search. Modal, so
+    it can share the panel's search index while the library cannot change.
+    """
+
+    def __init__(self, command_manager, search_index=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Add Shortcuts")
+        self.setMinimumSize(400, 400)
+        self.setStyleSheet(get_stylesheet())
+
+        layout = QVBoxLayout(self)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search commands")
+        self.search_input.setClearButtonEnabled(True)
+        layout.addWidget(self.search_input)
+
+        self.model = CommandListModel(command_manager, self, search_index)
+        self.search_input.textChanged.connect(self.model.set_filter)
+        self.list_view = CommandListView()
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.list_view.setModel(self.model)
+        self.list_view.doubleClicked.connect(self.accept)
+        layout.addWidget(self.list_view)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def selected_commands(self):
+        """Selected command dicts, in list order."""
+        rows = sorted(index.row() for index in self.list_view.selectionModel().selectedRows())
+        return [self.model.command(row) for row in rows]
+
+
+class SequenceDialog(QDialog):
+    """
+    Edits and runs a sequence of commands with expected responses.
+
+    Steps run on a SequenceRunner thread against the worker returned by
+    get_target(), which returns (worker, line_end) or None when not
+    connected. Results are summarised per step row.
+    """
+
+    COLUMNS = ["Name", "Command", "Hex", "Delay ms", "Expect", "Mode", "Timeout ms", "Repeat", "Result"]
+    RESULT_COLUMN = 8
+
+    def __init__(self, command_manager, get_target, parent=None, search_index=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sequence Runner")
+        self.setMinimumSize(900, 400)
+        self.setStyleSheet(get_stylesheet())
+        self.command_manager = command_manager
+        self.search_index = search_index  # Shared with the command panel, if given
+        self.get_target = get_target
+        self.runner = None
+        self.relay = QtRelay(self)
+        self.step_stats = {}  # row -> [passed, failed, latency sum, latency count, max latency]
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.add_btn = QPushButton("Add Step")
+        self.add_btn.clicked.connect(lambda: self.add_step(make_step()))
+        self.add_saved_btn = QPushButton("Add Shortcut")
+        self.add_saved_btn.clicked.connect(self.pick_shortcuts)
+        self.remove_btn = QPushButton("Remove")
+        self.remove_btn.clicked.connect(self.remove_steps)
+        self.load_btn = QPushButton("Load...")
+        self.load_btn.clicked.connect(self.load)
+        self.save_btn = QPushButton("Save...")
+        self.save_btn.clicked.connect(self.save)
+        self.run_btn = QPushButton("Run")
+        self.run_btn.clicked.connect(self.toggle_run)
+        for btn in [self.add_btn, self.add_saved_btn, self.remove_btn, self.load_btn, self.save_btn, self.run_btn]:
+            btn.setMinimumHeight(32)
+            buttons.addWidget(btn)
+        layout.addLayout(buttons)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+    def add_step(self, step):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        for column, key in enumerate(["name", "command", None, "delay_ms", "expect", None, "timeout_ms", "repeat"]):
+            if key:
+                self.table.setItem(row, column, QTableWidgetItem(str(step[key])))
+        hex_item = QTableWidgetItem()
+        hex_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
+        hex_item.setCheckState(Qt.CheckState.Checked if step['is_hex'] else Qt.CheckState.Unchecked)
+        self.table.setItem(row, 2, hex_item)
+        mode_combo = QComboBox()
+        mode_combo.addItems(SEARCH_MODES)
+        mode_combo.setCurrentText(step['expect_mode'])
+        self.table.setCellWidget(row, 5, mode_combo)
+        result_item = QTableWidgetItem("")
+        result_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+        self.table.setItem(row, self.RESULT_COLUMN, result_item)
+
+    def pick_shortcuts(self):
+        picker = ShortcutPicker(self.command_manager, self.search_index, self)
+        if picker.exec() == QDialog.DialogCode.Accepted:
+            for cmd in picker.selected_commands():
+                self.add_step(make_step(name=cmd['name'], command=cmd['command'], is_hex=cmd['is_hex']))
+        picker.deleteLater()
+
+    def remove_steps(self):
+        for row in sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True):
+            self.table.removeRow(row)
+
+    def get_steps(self):
+        """Reads the table back into step dicts. Raises ValueError for a bad number."""
+        steps = []
+        for row in range(self.table.rowCount()):
+            def text(column):
+                item = self.table.item(row, column)
+                return item.text().strip() if item else ""
+            try:
+                steps.append(make_step(
+                    name=text(0),
+                    command=text(1),
+                    is_hex=self.table.item(row, 2).checkState() == Qt.CheckState.Checked,
+                    delay_ms=int(text(3) or 0),
+                    expect=text(4),
+                    expect_mode=self.table.cellWidget(row, 5).currentText(),
+                    timeout_ms=int(text(6) or 1000),
+                    repeat=int(text(7) or 1),
+                ))
+            except ValueError:
+                raise ValueError(f"Step {row + 1}: delay, timeout and repeat must be whole numbers")
+        return steps
+
+    def load(self):
+        from PyQt6.QtWidgets import QFileDialog
+
+        file_path, _ = QFileDialog.getOpenFileName(self, "Load Sequence", os.getcwd(), "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            steps = load_sequence(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load sequence: {str(e)}")
+            return
+        self.table.setRowCount(0)
+        for step in steps:
+            self.add_step(step)
+
+    def save(self):
+        from PyQt6.QtWidgets import QFileDialog
+
+        try:
+            steps = self.get_steps()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Step", str(e))
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Sequence", "sequence.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            save_sequence(file_path, steps)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save sequence: {str(e)}")
+
+    def toggle_run(self):
+        if self.runner:
+            self.runner.stop()
+            return
+        target = self.get_target()
+        if not target:
+            QMessageBox.warning(self, "Not Connected", "Connect a port before running a sequence.")
+            return
+        worker, line_end = target
+        try:
+            self.runner = SequenceRunner(worker, self.get_steps(), line_end)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Step", str(e))
+            return
+        self.step_stats = {}
+        for row in range(self.table.rowCount()):
+            self.table.item(row, self.RESULT_COLUMN).setText("")
+        self.relay.connect(self.runner.step_finished, self.show_result)
+        self.relay.connect(self.runner.finished, self.run_finished)
+        self.run_btn.setText("Stop")
+        self.summary_label.setText("Running...")
+        self.runner.start()
+
+    def show_result(self, result):
+        stats = self.step_stats.setdefault(result['step'], [0, 0, 0.0, 0, 0.0])
+        stats[0 if result['passed'] else 1] += 1
+        if result['latency_ms'] is not None:
+            stats[2] += result['latency_ms']
+            stats[3] += 1
+            stats[4] = max(stats[4], result['latency_ms'])
+        text = f"{stats[0]} passed, {stats[1]} failed"
+        if stats[3]:
+            text += f", avg {stats[2] / stats[3]:.2f} ms, max {stats[4]:.2f} ms"
+        item = self.table.item(result['step'], self.RESULT_COLUMN)
+        if item:
+            item.setText(text)
+            if not result['passed']:
+                item.setToolTip(f"{result['error']}: {result['response']!r}")
+
+    def run_finished(self, results):
+        passed = sum(1 for result in results if result['passed'])
+        latencies = [result['latency_ms'] for result in results if result['latency_ms'] is not None]
+        summary = f"{passed} of {len(results)} steps passed"
+        if latencies:
+            summary += f", mean round trip {sum(latencies) / len(latencies):.2f} ms"
+        self.summary_label.setText(summary)
+        self.run_btn.setText("Run")
+        self.runner = None
+
+    def closeEvent(self, event):
+        if self.runner:
+            self.runner.stop()
+        super().closeEvent(event)
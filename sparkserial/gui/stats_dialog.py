@@ -0,0 +1,130 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import QTimer
+from sparkserial.core.stats import RateMeter, LinkStats, command_label
+from sparkserial.gui.styles import get_stylesheet
+
+
+class StatsDialog(QDialog):
+    """
+    Live link statistics for one port: rates, read chunk sizes, how far
+    the GUI lags behind the serial thread, dropped data, and per-command
+    response latency. get_target() returns (name, worker, capture_writer)
+    or None.
+    """
+
+    REFRESH_MS = 500
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, get_target, command_manager, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Link Statistics")
+        self.setMinimumSize(560, 480)
+        self.setStyleSheet(get_stylesheet())
+        self.get_target = get_target
+        self.command_manager = command_manager
+        self._names = {}  # Command label -> name, rebuilt when the library changes
+        self._names_revision = None
+        self.worker = None
+        self.meters = {}
+
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+        self.labels = {}
+        for key, title in [("port", "Port:"), ("rx", "RX:"), ("tx", "TX:"), ("frames", "Frames:"),
+                           ("chunks", "Read size:"), ("backlog", "Render backlog:"),
+                           ("delay", "Render delay:"), ("dropped", "Dropped:"), ("reconnects", "Reconnect time:")]:
+            self.labels[key] = QLabel("-")
+            form_layout.addRow(title, self.labels[key])
+        layout.addLayout(form_layout)
+
+        layout.addWidget(QLabel("Command to first response (ms):"))
+        self.latency_table = QTableWidget(0, 6)
+        self.latency_table.setHorizontalHeaderLabels(["Command", "Count", "p50", "p95", "p99", "Max"])
+        self.latency_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.latency_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.latency_table)
+
+        buttons = QHBoxLayout()
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addStretch()
+        buttons.addWidget(reset_btn)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        if self.worker:
+            self.worker.stats = LinkStats()
+        self.refresh()
+
+    def _command_names(self):
+        """Label -> name of the saved commands, re-read only after the library has changed."""
+        if self._names_revision != self.command_manager.revision:
+            self._names = {}
+            for cmd in self.command_manager.get_commands():
+                self._names.setdefault(command_label(cmd['command'], cmd['is_hex']), cmd['name'])
+            self._names_revision = self.command_manager.revision
+        return self._names
+
+    @staticmethod
+    def _summary(histogram, scale=1, unit=""):
+        if not histogram.count:
+            return "-"
+        parts = [f"p{pct} {histogram.percentile(pct) / scale:.4g}" for pct in StatsDialog.PERCENTILES]
+        return f"{'  '.join(parts)}  max {histogram.max / scale:.4g} {unit}  ({histogram.count})"
+
+    def refresh(self):
+        target = self.get_target()
+        if not target:
+            self.worker = None
+            self.labels["port"].setText("Not connected")
+            return
+        name, worker, capture_writer = target
+        if worker is not self.worker:
+            self.worker = worker
+            self.meters = {key: RateMeter() for key in ("rx", "tx", "frames")}
+        framer = worker.framer
+        rx_rate = self.meters["rx"].update(worker.rx_bytes)
+        tx_rate = self.meters["tx"].update(worker.tx_bytes)
+        stats = worker.stats
+
+        self.labels["port"].setText(name)
+        self.labels["rx"].setText(f"{rx_rate:,.0f} B/s  ({worker.rx_bytes:,} B total)")
+        self.labels["tx"].setText(f"{tx_rate:,.0f} B/s  ({worker.tx_bytes:,} B total, {worker.tx_queue_bytes:,} B queued)")
+        if framer:
+            frame_rate = self.meters["frames"].update(framer.frames)
+            self.labels["frames"].setText(f"{frame_rate:,.1f} /s  ({framer.frames:,} total, "
+                                          f"{framer.crc_errors} CRC errors, {framer.bad_frames} bad)")
+        else:
+            self.labels["frames"].setText("Frame decoder off")
+        self.labels["chunks"].setText(self._summary(stats.chunk_sizes, unit="B"))
+        self.labels["backlog"].setText(self._summary(stats.render_backlog, unit="B"))
+        self.labels["delay"].setText(self._summary(stats.render_delay, 1000, "ms"))
+        dropped = f"RX buffer {worker.rx_buffer.overflow_bytes:,} B, frames {worker.dropped_frames:,}"
+        if capture_writer:
+            dropped += f", capture {capture_writer.dropped_bytes:,} B"
+        self.labels["dropped"].setText(dropped)
+        self.labels["reconnects"].setText(self._summary(stats.reconnect_time, 1e6, "s"))
+
+        names = self._command_names()
+        latencies = sorted(list(stats.response_latency.items()), key=lambda item: -item[1].count)
+        self.latency_table.setRowCount(len(latencies))
+        for row, (label, histogram) in enumerate(latencies):
+            cells = [f"{names[label]} ({label})" if label in names else label, str(histogram.count)]
+            cells += [f"{histogram.percentile(pct) / 1000:.3f}" for pct in self.PERCENTILES]
+            cells.append(f"{histogram.max / 1000:.3f}")
+            for column, text in enumerate(cells):
+                self.latency_table.setItem(row, column, QTableWidgetItem(text))
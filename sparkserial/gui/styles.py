@@ -120,6 +120,18 @@ def get_stylesheet():
         selection-color: #ffffff;
     }
 
+    QAbstractScrollArea#terminalView {
+        font-family: 'Menlo', 'Monaco', 'Courier New', monospace;
+        font-size: 12px;
+        background-color: #1e1e1e;
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+    }
+
+    QAbstractScrollArea#terminalView:focus {
+        border: 1px solid #007acc;
+    }
+
     QStatusBar {
         background-color: #007acc;
         color: #ffffff;
@@ -146,7 +158,7 @@ def get_stylesheet():
         height: 0px;
     }
 
-    QListWidget {
+    QListWidget, QTableView#commandsList {
         background-color: #252526;
         border: 1px solid #3c3c3c;
         border-radius: 4px;
@@ -155,18 +167,18 @@ def get_stylesheet():
         outline: none;
     }
 
-    QListWidget::item {
+    QListWidget::item, QTableView#commandsList::item {
         padding: 5px;
         border-bottom: 1px solid #3c3c3c;
     }
 
-    QListWidget::item:selected {
+    QListWidget::item:selected, QTableView#commandsList::item:selected {
         background-color: #04395e;
         color: #ffffff;
         border-radius: 3px;
     }
 
-    QListWidget::item:hover {
+    QListWidget::item:hover, QTableView#commandsList::item:hover {
         background-color: #2a2d2e;
     }
 
@@ -0,0 +1,171 @@
+from PyQt6.QtWidgets import QAbstractScrollArea, QApplication
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPainter, QColor, QKeySequence
+from sparkserial.core.line_store import LineStore
+
+
+class TerminalView(QAbstractScrollArea):
+    """
+    Read-only terminal that only lays out the lines in the viewport.
+
+    Rows come from a source with len(), text(index) and max_line_length:
+    by default the widget's own LineStore, fed through insertPlainText,
+    or any other row provider set with set_source() (e.g. a CaptureView).
+    Appending costs O(chunk) and painting costs O(visible lines) no matter
+    how long the session gets. The parts of the QPlainTextEdit API that
+    MainWindow uses are mirrored so this widget can replace self.terminal.
+    """
+
+    MARGIN = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("terminalView")
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+        self.store = LineStore()
+        self.source = self.store
+        # Selected line range as (anchor, current), or None
+        self._selection = None
+
+    # QPlainTextEdit compatibility
+
+    def setReadOnly(self, read_only):
+        pass  # Always read-only
+
+    def moveCursor(self, operation):
+        pass  # Text is always appended at the end
+
+    def setMaximumBlockCount(self, count):
+        pass  # MainWindow evicts by trimming the source capture
+
+    def insertPlainText(self, text):
+        self.store.append(text.encode('utf-8'))
+        self.refresh()
+
+    def setPlainText(self, text):
+        self.clear()
+        self.insertPlainText(text)
+
+    def toPlainText(self):
+        return self.tail_text(len(self.source))
+
+    def tail_text(self, max_lines):
+        """Returns the last max_lines lines as one string."""
+        first = max(0, len(self.source) - max_lines)
+        return "\n".join(self.source.text(i) for i in range(first, len(self.source)))
+
+    def clear(self):
+        self.store.clear()
+        self._selection = None
+        self.refresh()
+
+    def set_source(self, source):
+        """Displays rows from source instead of the widget's own LineStore."""
+        self.source = source
+        self._selection = None
+        self.refresh()
+
+    def refresh(self):
+        """Picks up rows added to (or re-rendered by) the source."""
+        self._update_scrollbars()
+        self.viewport().update()
+
+    # Layout
+
+    def _line_height(self):
+        return self.fontMetrics().lineSpacing()
+
+    def _visible_lines(self):
+        return max(1, self.viewport().height() // self._line_height())
+
+    def _update_scrollbars(self):
+        vbar = self.verticalScrollBar()
+        # Stay pinned to the bottom when the view is resized
+        at_bottom = vbar.value() == vbar.maximum()
+        vbar.setRange(0, max(0, len(self.source) - self._visible_lines()))
+        vbar.setPageStep(self._visible_lines())
+        if at_bottom:
+            vbar.setValue(vbar.maximum())
+
+        hbar = self.horizontalScrollBar()
+        content_width = self.source.max_line_length * self.fontMetrics().horizontalAdvance('M') + 2 * self.MARGIN
+        hbar.setRange(0, max(0, content_width - self.viewport().width()))
+        hbar.setPageStep(self.viewport().width())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def scroll_to_line(self, index):
+        """Scrolls so that line index is roughly in the middle of the view."""
+        self.verticalScrollBar().setValue(index - self._visible_lines() // 2)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), QColor("#1e1e1e"))
+        painter.setFont(self.font())
+
+        metrics = self.fontMetrics()
+        line_height = metrics.lineSpacing()
+        first = self.verticalScrollBar().value()
+        last = min(len(self.source), first + self._visible_lines() + 1)
+        x = self.MARGIN - self.horizontalScrollBar().value()
+        width = self.viewport().width()
+
+        selected = self.selected_range()
+        for row, index in enumerate(range(first, last)):
+            top = row * line_height
+            if selected and selected[0] <= index <= selected[1]:
+                painter.fillRect(0, top, width, line_height, QColor("#264f78"))
+                painter.setPen(QColor("#ffffff"))
+            else:
+                painter.setPen(QColor("#d4d4d4"))
+            painter.drawText(x, top + metrics.ascent(), self.source.text(index))
+        painter.end()
+
+    # Line selection and copy
+
+    def _line_at(self, y):
+        index = self.verticalScrollBar().value() + int(y) // self._line_height()
+        return max(0, min(index, len(self.source) - 1))
+
+    def selected_range(self):
+        """(first, last) selected line, or None."""
+        if not self._selection:
+            return None
+        anchor, current = self._selection
+        return min(anchor, current), max(anchor, current)
+
+    def select_lines(self, first, last=None):
+        self._selection = (first, first if last is None else last)
+        self.viewport().update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            line = self._line_at(event.position().y())
+            self._selection = (line, line)
+            self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        if self._selection and event.buttons() & Qt.MouseButton.LeftButton:
+            self._selection = (self._selection[0], self._line_at(event.position().y()))
+            self.viewport().update()
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            self.copy()
+        elif event.matches(QKeySequence.StandardKey.SelectAll):
+            self._selection = (0, len(self.source) - 1)
+            self.viewport().update()
+        else:
+            super().keyPressEvent(event)
+
+    def copy(self):
+        selected = self.selected_range()
+        if selected:
+            text = "\n".join(self.source.text(i) for i in range(selected[0], selected[1] + 1))
+            QApplication.clipboard().setText(text)
@@ -1,7 +1,6 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from sparkserial.gui.main_window import MainWindow
+from sparkserial import cli
 
 def set_macos_app_details():
     if sys.platform == "darwin":
@@ -26,6 +25,13 @@ def set_macos_app_details():
             print(f"macOS specific setup failed: {e}")
 
 def main():
+    # Headless commands (sparkserial capture, run-sequence, ...) never load Qt
+    if cli.is_cli(sys.argv[1:]):
+        sys.exit(cli.main(sys.argv[1:]))
+
+    from PyQt6.QtWidgets import QApplication
+    from sparkserial.gui.main_window import MainWindow
+
     # Set the application ID for better process management
     # No-op on macOS for name but helps overall
     import ctypes
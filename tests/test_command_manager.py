@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sparkserial.core.command_manager import CommandManager, _atomic_write
+
+
+class CommandJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp(prefix="sparkserial-test-")
+        patcher = mock.patch.dict(os.environ, {"HOME": self.home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, self.home)
+        # Load errors are reported with print()
+        quiet = mock.patch('builtins.print')
+        quiet.start()
+        self.addCleanup(quiet.stop)
+
+    def edited_library(self):
+        """
+        A library whose last three edits are only in the journal; returns
+        the manager (journal still open) and the commands it holds.
+        """
+        manager = CommandManager()
+        manager.add_command("One", "AT+ONE")
+        manager.update_command(0, "Check", "AT+CHECK")
+        manager.delete_command(1)
+        self.assertEqual(manager._journal_records, 3)
+        return manager, [dict(cmd) for cmd in manager.commands]
+
+    def reload(self, manager):
+        manager._close_journal()
+        return CommandManager()
+
+    def bad_journals(self):
+        return sorted(name for name in os.listdir(os.path.join(self.home, ".sparkserial")) if ".bad" in name)
+
+    def test_journaled_edits_survive_a_reload(self):
+        manager, commands = self.edited_library()
+        self.assertEqual(self.reload(manager).commands, commands)
+        self.assertEqual(self.bad_journals(), [])
+
+    def test_torn_last_line_is_ignored(self):
+        manager, commands = self.edited_library()
+        with open(manager.journal_path, 'a') as f:
+            f.write('{"op": "add", "comma')
+        reloaded = self.reload(manager)
+        self.assertEqual(reloaded.commands, commands)
+        self.assertEqual(self.bad_journals(), [])
+        # The torn append is gone from the compacted journal
+        self.assertEqual(reloaded._journal_records, 0)
+        self.assertEqual(self.reload(reloaded).commands, commands)
+
+    def test_stale_journal_after_snapshot_rename_is_not_replayed(self):
+        # A crash between compaction's snapshot rename and journal rename
+        manager, commands = self.edited_library()
+        _atomic_write(manager.filename, json.dumps(commands).encode('utf-8'))
+        self.assertEqual(self.reload(manager).commands, commands)
+        # Its edits cannot be told from hand-edited ones, so it is kept
+        self.assertEqual(self.bad_journals(), ["saved_commands.json.journal.bad"])
+
+    def test_corrupt_record_keeps_earlier_edits_and_the_journal(self):
+        manager, _commands = self.edited_library()
+        with open(manager.journal_path) as f:
+            lines = f.read().split("\n")
+        # Header, the add, then a corrupt record ahead of the update and delete
+        lines.insert(2, '{"op": "rename"}')
+        with open(manager.journal_path, 'w') as f:
+            f.write("\n".join(lines))
+
+        reloaded = self.reload(manager)
+        self.assertEqual([cmd['name'] for cmd in reloaded.commands][-1], "One")
+        self.assertEqual(self.bad_journals(), ["saved_commands.json.journal.bad"])
+        with open(reloaded.journal_path + ".bad") as f:
+            self.assertEqual(f.read(), "\n".join(lines))
+        # A later bad journal does not overwrite the first
+        with open(reloaded.journal_path, 'w') as f:
+            f.write("not json\n")
+        self.reload(reloaded)
+        self.assertEqual(self.bad_journals(), ["saved_commands.json.journal.bad", "saved_commands.json.journal.bad.1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
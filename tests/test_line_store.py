@@ -0,0 +1,27 @@
+import unittest
+
+from sparkserial.core.line_store import LineStore
+
+
+class WrapTest(unittest.TestCase):
+    def lines(self, *chunks):
+        store = LineStore(wrap_bytes=8)
+        for chunk in chunks:
+            store.append(chunk)
+        return [store.text(i) for i in range(len(store))]
+
+    def test_newline_at_the_wrap_point_ends_the_line(self):
+        self.assertEqual(self.lines(b"x" * 8 + b"\nnext\n"), ["xxxxxxxx", "next", ""])
+        # The same when the newline arrives in the next chunk
+        self.assertEqual(self.lines(b"x" * 8, b"\nnext\n"), ["xxxxxxxx", "next", ""])
+
+    def test_longer_lines_are_wrapped(self):
+        self.assertEqual(self.lines(b"x" * 9 + b"\n"), ["xxxxxxxx", "x", ""])
+        self.assertEqual(self.lines(b"x" * 16 + b"\nend"), ["xxxxxxxx", "xxxxxxxx", "end"])
+
+    def test_wrap_does_not_split_utf8(self):
+        self.assertEqual(self.lines("xxxxxxxéyy\n".encode('utf-8')), ["xxxxxxx", "éyy", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from sparkserial.core.log_writer import LogWriter, find_segment, load_manifest
+
+
+class FindSegmentTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="sparkserial-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def log_lines(self, count, per_batch):
+        """
+        Logs count lines, per_batch at a time, each stamped with its own
+        arrival time, into segments of about four lines. Returns the
+        manifest path and the (timestamp, line) pairs.
+        """
+        path = os.path.join(self.directory, f"log{per_batch}.txt")
+        writer = LogWriter(path, max_bytes=200)
+        base = time.time() - 3600  # Arrival times well before the writer thread's clock
+        lines = []
+        for i in range(count):
+            timestamp = base + i * 0.5
+            line = f"RX line {i:03d} {'x' * 40}\n"
+            writer.write(line, timestamp)
+            lines.append((timestamp, line))
+            if i % per_batch == per_batch - 1:
+                writer.sync()
+                time.sleep(0.01)  # Let the batch reach the writer thread on its own
+        writer.close()
+        self.assertIsNone(writer.error)
+        return writer.manifest_path, lines
+
+    def test_every_line_found_by_its_timestamp(self):
+        for per_batch in (1, 3):
+            with self.subTest(per_batch=per_batch):
+                manifest_path, lines = self.log_lines(40, per_batch)
+                self.assertGreater(len(load_manifest(manifest_path)["segments"]), 5)
+                for timestamp, line in lines:
+                    segment = find_segment(manifest_path, timestamp)
+                    self.assertIsNotNone(segment, line)
+                    with open(segment) as f:
+                        self.assertIn(line, f.read())
+
+    def test_lookup_between_and_outside_segments(self):
+        manifest_path, lines = self.log_lines(12, 1)
+        segments = load_manifest(manifest_path)["segments"]
+        first, second = segments[0], segments[1]
+        self.assertLess(first["end"], second["start"])
+        # Between two segments: the one logged next
+        gap = (first["end"] + second["start"]) / 2
+        self.assertEqual(os.path.basename(find_segment(manifest_path, gap)), second["file"])
+        self.assertIsNone(find_segment(manifest_path, lines[0][0] - 1))
+        self.assertIsNone(find_segment(manifest_path, lines[-1][0] + 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
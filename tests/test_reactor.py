@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+import unittest
+
+from sparkserial.core.reactor import SerialReactor
+
+try:
+    import pty
+    from sparkserial.core.serial_manager import SerialManager
+except ImportError:  # pyserial, or pty on Windows
+    SerialManager = None
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@unittest.skipUnless(SerialManager and SerialReactor.supported(), "needs pyserial and the Linux reactor")
+class ReactorErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.pairs = [pty.openpty() for _ in range(2)]
+        self.manager = SerialManager(backend="reactor")
+        self.errors = {}
+
+    def tearDown(self):
+        closer = threading.Thread(target=self.manager.close, daemon=True)
+        closer.start()
+        closer.join(5)
+        self.assertFalse(closer.is_alive(), "SerialManager.close() blocked")
+        for master, slave in self.pairs:
+            os.close(master)
+            os.close(slave)
+
+    def connect(self, index, tap=None):
+        name = f"port{index}"
+
+        def setup(worker):
+            worker.error_occurred.connect(lambda message: self.errors.setdefault(name, message))
+            if tap:
+                worker.set_tap("test", tap)
+
+        settings = {'port': os.ttyname(self.pairs[index][1]), 'baudrate': 115200, 'bytesize': 8,
+                    'parity': 'N', 'stopbits': 1, 'flowcontrol': "None"}
+        worker = self.manager.connect(settings, name=name, setup=setup)
+        self.assertTrue(wait_for(lambda: worker.running))
+        return worker
+
+    def test_raising_tap_closes_only_its_port(self):
+        def tap(timestamp_ns, direction, data):
+            raise RuntimeError("tap failed")
+
+        failing = self.connect(0, tap)
+        healthy = self.connect(1)
+        os.write(self.pairs[0][0], b"boom\n")
+        self.assertTrue(wait_for(lambda: not failing.running))
+        self.assertEqual(self.errors.get("port0"), "tap failed")
+        self.assertFalse(self.manager.is_connected("port0"))
+
+        # The shared thread keeps serving the other port
+        os.write(self.pairs[1][0], b"still here\n")
+        self.assertTrue(wait_for(lambda: len(healthy.rx_buffer) >= 11))
+        self.assertEqual(healthy.rx_buffer.read(), b"still here\n")
+        self.assertNotIn("port1", self.errors)
+
+
+if __name__ == "__main__":
+    unittest.main()